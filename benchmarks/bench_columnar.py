@@ -0,0 +1,71 @@
+"""
+Сравнение колоночного представления с обработкой записей по одной:
+полный пересчет сумм по периодам (`PeriodTotals.rebuild`) и баланса.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_columnar --sizes 100000 1000000 10000000
+"""
+import argparse
+import time
+from typing import Callable, List
+
+from benchmarks.synthetic import generate_records
+from src.balance.period_totals import UNITS, PeriodTotals
+from src.transactions.columnar import ColumnarLedger
+from src.transactions.transaction import Transaction
+from src.utils.file_manager import FileManager
+
+DEFAULT_SIZES = (10**5, 10**6, 10**7)
+
+
+def timed(func: Callable) -> float:
+    """Возвращает время выполнения функции в секундах."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def record_balance(records: List[Transaction]) -> int:
+    income = sum(r.minor or 0 for r in records if r.category == "доход")
+    expense = sum(r.minor or 0 for r in records if r.category == "расход")
+    return income - expense
+
+
+def record_periods(records: List[Transaction]) -> PeriodTotals:
+    periods = PeriodTotals(FileManager("bench.json"))
+    for record in records:
+        periods._apply(record, 1)
+    return periods
+
+
+def columnar_periods(records: List[Transaction]) -> list:
+    ledger = ColumnarLedger.from_records(records)
+    return [ledger.period_rollups(unit) for unit in UNITS]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'op':>8} {'records, s':>11} {'columnar, s':>12} {'speedup':>8}")
+    for size in args.sizes:
+        records = [Transaction.from_dict(record) for record in generate_records(size)]
+        ledger = ColumnarLedger.from_records(records)
+
+        cases = (
+            # Пересчет сумм по периодам включает построение колонок.
+            ("periods", lambda: record_periods(records), lambda: columnar_periods(records)),
+            ("balance", lambda: record_balance(records), ledger.balance),
+        )
+        for name, record_path, columnar_path in cases:
+            record_time = timed(record_path)
+            columnar_time = timed(columnar_path)
+            print(
+                f"{size:>10} {name:>8} {record_time:>11.4f} {columnar_time:>12.4f}"
+                f" {record_time / columnar_time:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
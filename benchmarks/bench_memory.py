@@ -0,0 +1,49 @@
+"""
+Сравнение памяти, занимаемой строками-словарями и объектами Transaction.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_memory --size 1000000
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+from typing import Callable, List
+
+from benchmarks.synthetic import generate_records
+from src.transactions.transaction import Transaction
+
+
+def measure(build: Callable[[], List]) -> int:
+    """Возвращает объем памяти в байтах, удерживаемый результатом build()."""
+    gc.collect()
+    tracemalloc.start()
+    rows = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+    return current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=10**6)
+    args = parser.parse_args()
+
+    # Строки JSON разбираются заново для каждого варианта, чтобы строки
+    # в записях были отдельными объектами, как после json.load.
+    lines = [json.dumps(record) for record in generate_records(args.size)]
+
+    dict_bytes = measure(lambda: [json.loads(line) for line in lines])
+    slot_bytes = measure(
+        lambda: [Transaction.from_dict(json.loads(line)) for line in lines]
+    )
+
+    print(f"rows:        {args.size}")
+    print(f"dict:        {dict_bytes / args.size:8.1f} B/row")
+    print(f"Transaction: {slot_bytes / args.size:8.1f} B/row")
+    print(f"reduction:   {dict_bytes / slot_bytes:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
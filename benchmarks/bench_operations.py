@@ -0,0 +1,277 @@
+"""
+Измерение стоимости операций TransactionManager и BalanceManager
+на всех форматах хранения.
+
+Для каждого размера журнала и формата хранения создается синтетический
+журнал, после чего каждая операция выполняется --repeat раз. Для операций
+считаются пропускная способность, перцентили задержки и пиковая память
+(tracemalloc, отдельным прогоном, чтобы трассировка не искажала время).
+Результаты сохраняются в JSON; файл предыдущего прогона, переданный
+через --baseline, сравнивается с текущим по медиане задержки.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_operations --sizes 1000 100000 \
+        --output bench_results.json --baseline bench_results_old.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from benchmarks.synthetic import DESCRIPTIONS, START_DATE, generate_records
+from src.balance.balance_manager import BalanceManager
+from src.transactions.transaction_manager import TransactionManager
+from src.utils.journal_manager import JournalFileManager
+from src.utils.renderers import Renderer
+from src.utils.storage import get_file_manager
+
+DEFAULT_SIZES = (10**3, 10**4, 10**5)
+DEFAULT_REPEAT = 20
+# Формат хранения и имя файла журнала, по расширению которого
+# get_file_manager выбирает менеджер хранения.
+BACKENDS = {
+    "json": "ledger.json",
+    "jsonl": "ledger.jsonl",
+    "journal": "ledger.journal",
+    "sqlite": "ledger.sqlite",
+    "mmap": "ledger.wallet",
+    "sharded": "ledger.shards",
+}
+# Критерии поиска перебираются по кругу: индекс даты, интервал дат
+# с категорией, интервал сумм и подстрока описания.
+SEARCHES = (
+    {"date": "2018-06-15"},
+    {"category": "расход", "date_from": "2020-01-01", "date_to": "2020-01-31"},
+    {"amount_min": 1000.0, "amount_max": 1010.0},
+    {"description": "такси", "date_from": "2016-03-01", "date_to": "2016-03-07"},
+)
+PERCENTILES = (50, 95, 99)
+
+Operation = Callable[[int], Any]
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Перцентиль q (0-100) по методу ближайшего ранга."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def timed(func: Callable[[], Any]) -> float:
+    """Возвращает время выполнения функции в секундах."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def peak_memory(func: Callable[[], Any]) -> int:
+    """Возвращает пиковый объем памяти в байтах, выделенной при вызове func()."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    """Сводка задержек в миллисекундах и пропускная способность."""
+    total = sum(latencies)
+    summary = {
+        "throughput": len(latencies) / total if total else float("inf"),
+        "mean_ms": total / len(latencies) * 1000,
+        "min_ms": min(latencies) * 1000,
+        "max_ms": max(latencies) * 1000,
+    }
+    for q in PERCENTILES:
+        summary[f"p{q}_ms"] = percentile(latencies, q) * 1000
+    return summary
+
+
+def create_ledger(path: str, size: int, seed: int) -> None:
+    """Создает файл журнала с синтетическими записями."""
+    file_manager = get_file_manager(path)
+    file_manager.write_to_file(list(generate_records(size, seed)))
+    if isinstance(file_manager, JournalFileManager):
+        file_manager.wait_for_compaction()
+    close = getattr(file_manager, "close", None)
+    if close is not None:
+        close()
+
+
+def open_managers(path: str) -> Tuple[TransactionManager, BalanceManager]:
+    """Открывает менеджеры транзакций и баланса на общем хранилище."""
+    manager = TransactionManager(path, renderer=Renderer())
+    balance = BalanceManager(path, store=manager.store, renderer=Renderer())
+    return manager, balance
+
+
+def operations(
+    manager: TransactionManager,
+    balance: BalanceManager,
+    size: int,
+    repeat: int,
+    rng: random.Random,
+) -> Iterator[Tuple[str, Operation]]:
+    """
+    Перечисляет измеряемые операции. Операция получает номер вызова;
+    чтения идут раньше изменений, чтобы измерять их на исходном журнале.
+    """
+    # Прогон памяти вызывает каждую операцию еще раз, поэтому выборка
+    # id на один вызов больше числа повторов.
+    ids = rng.sample(range(1, size + 1), min(size, 2 * (repeat + 1)))
+    edited, deleted = ids[: len(ids) // 2], ids[len(ids) // 2:]
+
+    yield "check", lambda i: manager.check_transactions(edited[i % len(edited)])
+    yield "search", lambda i: manager.search_transactions(**SEARCHES[i % len(SEARCHES)])
+    yield "show_all", lambda i: manager.show_all()
+    yield "balance", lambda i: balance.current_balance()
+    yield "add", lambda i: manager.add_transaction(
+        str(START_DATE), "расход", 100.0 + i, DESCRIPTIONS[i % len(DESCRIPTIONS)]
+    )
+    yield "edit", lambda i: manager.edit_transaction(
+        edited[i % len(edited)], amount=200.0 + i
+    )
+    yield "delete", lambda i: manager.delete_transaction(deleted[i % len(deleted)])
+
+
+def run_case(backend: str, size: int, repeat: int, seed: int) -> List[Dict[str, Any]]:
+    """
+    Измеряет все операции на одном формате хранения и размере журнала.
+
+    Returns:
+        List[Dict[str, Any]]: Результаты по операциям, включая открытие
+        журнала ("open") и его начальную запись ("create").
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, BACKENDS[backend])
+
+        def record(operation: str, latencies: List[float], peak: Optional[int]) -> None:
+            results.append(
+                {
+                    "backend": backend,
+                    "size": size,
+                    "operation": operation,
+                    "repeat": len(latencies),
+                    "peak_memory_bytes": peak,
+                    **summarize(latencies),
+                }
+            )
+
+        create = timed(lambda: create_ledger(path, size, seed))
+        record("create", [create], None)
+        opened: Dict[str, Any] = {}
+        load = timed(lambda: opened.update(zip(("manager", "balance"), open_managers(path))))
+        record("open", [load], peak_memory(lambda: open_managers(path)))
+
+        manager, balance = opened["manager"], opened["balance"]
+        for name, operation in operations(manager, balance, size, repeat, random.Random(seed)):
+            latencies = [timed(lambda: operation(i)) for i in range(repeat)]
+            record(name, latencies, peak_memory(lambda: operation(repeat)))
+
+        close = getattr(manager.file_manager, "close", None)
+        if close is not None:
+            close()
+    return results
+
+
+def git_commit() -> Optional[str]:
+    """Возвращает хеш текущего коммита или None вне git."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str) -> None:
+    """Выводит изменение медианы задержки относительно прошлого прогона."""
+    with open(baseline_path, "r", encoding="utf-8") as file:
+        baseline = {
+            (row["backend"], row["size"], row["operation"]): row
+            for row in json.load(file)["results"]
+        }
+    print()
+    print(f"{'backend':>8} {'rows':>10} {'op':>9} {'old p50':>10} {'new p50':>10} {'change':>8}")
+    for row in results:
+        old = baseline.get((row["backend"], row["size"], row["operation"]))
+        if old is None:
+            continue
+        change = row["p50_ms"] / old["p50_ms"] if old["p50_ms"] else float("inf")
+        print(
+            f"{row['backend']:>8} {row['size']:>10} {row['operation']:>9}"
+            f" {old['p50_ms']:>10.3f} {row['p50_ms']:>10.3f} {change:>7.2f}x"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument(
+        "--backends", nargs="+", choices=tuple(BACKENDS), default=tuple(BACKENDS)
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline")
+    args = parser.parse_args()
+
+    results: List[Dict[str, Any]] = []
+    print(
+        f"{'backend':>8} {'rows':>10} {'op':>9} {'ops/s':>10} "
+        + " ".join(f"{f'p{q}, ms':>9}" for q in PERCENTILES)
+        + f" {'peak, KiB':>10}"
+    )
+    for size in args.sizes:
+        for backend in args.backends:
+            for row in run_case(backend, size, args.repeat, args.seed):
+                results.append(row)
+                print(
+                    f"{backend:>8} {size:>10} {row['operation']:>9}"
+                    f" {row['throughput']:>10.1f} "
+                    + " ".join(f"{row[f'p{q}_ms']:>9.3f}" for q in PERCENTILES)
+                    + (
+                        f" {row['peak_memory_bytes'] / 1024:>10.1f}"
+                        if row["peak_memory_bytes"] is not None
+                        else f" {'-':>10}"
+                    )
+                )
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    print(f"\nРезультаты сохранены в {args.output}")
+
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
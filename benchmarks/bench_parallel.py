@@ -0,0 +1,84 @@
+"""
+Масштабирование параллельного просмотра по числу процессов.
+
+Для каждого размера журнала полный пересчет сумм по категориям
+и поиск подстроки описания (запрос без индексных критериев)
+выполняются последовательно и пулом из 1, 2, 4 и 8 процессов.
+Время публикации записей в разделяемую память выводится отдельно:
+она выполняется один раз и затем обновляется инкрементально.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_parallel --sizes 100000 1000000 --workers 1 2 4 8
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from typing import Callable, List
+
+from benchmarks.synthetic import generate_records
+from src.transactions.transaction_store import TransactionStore
+from src.utils.file_manager import FileManager
+
+DEFAULT_SIZES = (10**5, 10**6)
+DEFAULT_WORKERS = (1, 2, 4, 8)
+DEFAULT_REPEAT = 5
+
+
+def timed(func: Callable, repeat: int) -> float:
+    """Возвращает медиану времени выполнения функции в секундах."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def operations(store: TransactionStore) -> List[tuple]:
+    """Измеряемые операции: имя и функция."""
+    return [
+        ("totals", store.category_totals),
+        ("search", lambda: list(store.find(description="такси"))),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--workers", type=int, nargs="+", default=DEFAULT_WORKERS)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    args = parser.parse_args()
+
+    print(f"cpu: {os.cpu_count()}")
+    print(f"{'rows':>10} {'op':>8} {'workers':>8} {'time, s':>10} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            path = os.path.join(directory, f"ledger-{size}.json")
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(list(generate_records(size)), file, ensure_ascii=False)
+            store = TransactionStore(FileManager(path))
+
+            serial = {name: timed(func, args.repeat) for name, func in operations(store)}
+            for name, elapsed in serial.items():
+                print(f"{size:>10} {name:>8} {'serial':>8} {elapsed:>10.4f} {1:>7.1f}x")
+
+            for workers in args.workers:
+                scanner = store.enable_parallel(workers, threshold=0)
+                publish = time.perf_counter()
+                scanner.category_totals()
+                publish = time.perf_counter() - publish
+                for name, func in operations(store):
+                    elapsed = timed(func, args.repeat)
+                    print(
+                        f"{size:>10} {name:>8} {workers:>8} {elapsed:>10.4f}"
+                        f" {serial[name] / elapsed:>7.1f}x"
+                    )
+                print(f"{size:>10} {'publish':>8} {workers:>8} {publish:>10.4f}")
+                store.disable_parallel()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import random
+from datetime import date, timedelta
+from typing import Iterator
+
+CATEGORIES = ("доход", "расход")
+DESCRIPTIONS = (
+    "Зарплата",
+    "кешбек",
+    "Покупка продуктов",
+    "Такси",
+    "Кафе",
+    "Коммунальные платежи",
+    "Аптека",
+    "Перевод",
+)
+START_DATE = date(2014, 1, 1)
+DAYS = 3650
+
+
+def generate_records(size: int, seed: int = 0) -> Iterator[dict]:
+    """
+    Генерирует синтетические записи транзакций.
+
+    Args:
+        size (int): Количество записей.
+        seed (int, optional): Зерно генератора случайных чисел.
+        По умолчанию 0.
+
+    Returns:
+        Iterator[dict]: Записи с id от 1 до size.
+    """
+    rng = random.Random(seed)
+    for transaction_id in range(1, size + 1):
+        yield {
+            "id": transaction_id,
+            "date": str(START_DATE + timedelta(days=rng.randrange(DAYS))),
+            "category": CATEGORIES[rng.random() < 0.7],
+            "amount": rng.randrange(1, 10_000_000) / 100,
+            "description": rng.choice(DESCRIPTIONS),
+        }
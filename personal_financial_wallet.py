@@ -1,11 +1,17 @@
-from src.transactions.transaction_manager import TransactionManager
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional, Tuple
+
 from src.utils.validators import (
     get_description,
     get_valid_amount,
     get_valid_category,
     get_valid_date,
 )
-from src.balance.balance_manager import BalanceManager
+
+if TYPE_CHECKING:
+    from src.balance.balance_manager import BalanceManager
+    from src.transactions.transaction_manager import TransactionManager
 
 
 PATH_TO_DATABASE = "data/transactions.json"
@@ -17,9 +23,17 @@ CHOICE_EDIT_TRANSACTION = "4"
 CHOICE_SEARCH_TRANSACTION = "5"
 CHOICE_SHOW_ALL = "6"
 CHOICE_EXIT = "7"
+MENU_CHOICES = (
+    CHOICE_BALANCE_INFO,
+    CHOICE_ADD_TRANSACTION,
+    CHOICE_DELETE_TRANSACTION,
+    CHOICE_EDIT_TRANSACTION,
+    CHOICE_SEARCH_TRANSACTION,
+    CHOICE_SHOW_ALL,
+)
 
 
-def balance_submenu(balance_manager: BalanceManager) -> None:
+def balance_submenu(balance_manager: "BalanceManager") -> None:
     """
     Подменю для управления балансом.
 
@@ -57,7 +71,7 @@ def balance_submenu(balance_manager: BalanceManager) -> None:
             continue
 
 
-def add_transactions_submenu(transaction_manager: TransactionManager) -> None:
+def add_transactions_submenu(transaction_manager: "TransactionManager") -> None:
     """
     Подменю для добавления транзакций.
 
@@ -92,7 +106,7 @@ def add_transactions_submenu(transaction_manager: TransactionManager) -> None:
             print("Некорректный ввод. Попробуйте снова.")
 
 
-def delete_transactions_submenu(transaction_manager: TransactionManager) -> None:
+def delete_transactions_submenu(transaction_manager: "TransactionManager") -> None:
     """
     Подменю для удаления транзакций.
 
@@ -128,7 +142,7 @@ def delete_transactions_submenu(transaction_manager: TransactionManager) -> None
             print("Некорректный ввод. Попробуйте снова.")
 
 
-def edit_transactions_submenu(transaction_manager: TransactionManager) -> None:
+def edit_transactions_submenu(transaction_manager: "TransactionManager") -> None:
     """
     Подменю для редактирования транзакций.
 
@@ -198,7 +212,7 @@ def edit_transactions_submenu(transaction_manager: TransactionManager) -> None:
             print()
 
 
-def search_transactions_submenu(transaction_manager: TransactionManager) -> None:
+def search_transactions_submenu(transaction_manager: "TransactionManager") -> None:
     """
     Подменю для поиска транзакций.
 
@@ -229,11 +243,16 @@ def search_transactions_submenu(transaction_manager: TransactionManager) -> None
                     "Введите сумму для поиска: ",
                     skip_allowed=True,
                 )
+                text: str = get_description(
+                    "Введите слова описания для поиска: ",
+                    skip_allowed=True,
+                )
 
                 transaction_manager.search_transactions(
                     category if category else None,
                     date if date else None,
                     amount if amount else None,
+                    text=text,
                 )
                 break
         elif sub_choice == BACK:
@@ -242,9 +261,30 @@ def search_transactions_submenu(transaction_manager: TransactionManager) -> None
             print("Некорректный ввод. Попробуйте снова.")
 
 
-def main():
+def open_managers() -> Tuple["TransactionManager", "BalanceManager"]:
+    """
+    Загружает файл транзакций и создает менеджеры.
+
+    Returns:
+        Tuple[TransactionManager, BalanceManager]: Менеджеры транзакций
+        и баланса на общем хранилище.
+    """
+    from src.balance.balance_manager import BalanceManager
+    from src.transactions.transaction_manager import TransactionManager
+
     transaction_manager = TransactionManager(PATH_TO_DATABASE)
-    balance_manager = BalanceManager(PATH_TO_DATABASE)
+    balance_manager = BalanceManager(
+        PATH_TO_DATABASE,
+        store=transaction_manager.store,
+    )
+    return transaction_manager, balance_manager
+
+
+def main():
+    # Меню выводится сразу, а файл транзакций загружается в фоне,
+    # пока пользователь выбирает действие.
+    executor = ThreadPoolExecutor(max_workers=1)
+    loading: Optional[Future] = None
 
     while True:
         print("1. Информация о балансе")
@@ -256,8 +296,17 @@ def main():
         print("7. Выйти")
         print()
 
+        if loading is None:
+            loading = executor.submit(open_managers)
         choice = input("Выберите действие: ")
 
+        if choice == CHOICE_EXIT:
+            break
+        if choice not in MENU_CHOICES:
+            print("Некорректный ввод. Попробуйте снова.")
+            continue
+
+        transaction_manager, balance_manager = loading.result()
         if choice == CHOICE_BALANCE_INFO:
             balance_submenu(balance_manager)
 
@@ -276,11 +325,12 @@ def main():
         elif choice == CHOICE_SHOW_ALL:
             transaction_manager.show_all()
 
-        elif choice == CHOICE_EXIT:
-            break
-        else:
-            print("Некорректный ввод. Попробуйте снова.")
+    executor.shutdown()
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        from src import cli
+
+        sys.exit(cli.main())
     main()
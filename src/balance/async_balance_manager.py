@@ -0,0 +1,97 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, TypeVar
+
+from ..transactions.async_manager import AsyncTransactionManager
+from ..utils.renderers import BufferedRenderer, ConsoleRenderer, Renderer
+from .balance_manager import BalanceManager
+from .reports import BalanceReport, PeriodBalance
+
+T = TypeVar("T")
+
+
+@dataclass
+class AsyncBalanceManager:
+    """
+    Асинхронный интерфейс к BalanceManager для работы внутри asyncio.
+
+    Использует хранилище и очередь доступа AsyncTransactionManager,
+    поэтому расчеты баланса выполняются в потоках и не пересекаются
+    с записью изменений.
+
+    Args:
+        filename (str): Имя файла, в котором хранятся транзакции.
+        transactions (AsyncTransactionManager, optional): Общий
+        асинхронный менеджер транзакций. По умолчанию создается
+        собственный.
+        renderer (Renderer, optional): Вывод результатов. По умолчанию
+        вывод в консоль; `Renderer()` отключает вывод.
+    """
+
+    filename: str
+    transactions: Optional[AsyncTransactionManager] = field(
+        default=None, repr=False
+    )
+    renderer: Renderer = field(default_factory=ConsoleRenderer, repr=False)
+
+    def __post_init__(self):
+        """
+        Пост-инициализация объекта AsyncBalanceManager.
+
+        Файл не читается до первого обращения.
+        """
+        if self.transactions is None:
+            self.transactions = AsyncTransactionManager(self.filename, self.renderer)
+        self._opening: Optional[asyncio.Task] = None
+        self._output = BufferedRenderer(self.renderer)
+
+    async def _open(self) -> BalanceManager:
+        """
+        Создает синхронный менеджер баланса на общем хранилище.
+        Менеджер подписывается на изменения хранилища, поэтому
+        создается без одновременных чтений и записей.
+        """
+        store = await self.transactions.store()
+        return await self.transactions.exclusive(
+            BalanceManager, self.filename, store=store, renderer=self._output
+        )
+
+    async def _read(self, function: Callable[..., T], *args: Any) -> T:
+        """Выполняет чтение и выводит его результаты одной группой."""
+        return await self.transactions.read(self._output.call, function, *args)
+
+    async def manager(self) -> BalanceManager:
+        """
+        Возвращает синхронный менеджер баланса, создавая его один раз.
+        Одновременные вызовы ожидают одно и то же создание.
+
+        Returns:
+            BalanceManager: Менеджер баланса.
+        """
+        if self._opening is None:
+            self._opening = asyncio.ensure_future(self._open())
+        return await asyncio.shield(self._opening)
+
+    async def current_balance(
+        self,
+        show_income: Optional[bool] = False,
+        show_expense: Optional[bool] = False,
+    ) -> BalanceReport:
+        """Асинхронный вариант `BalanceManager.current_balance`."""
+        manager = await self.manager()
+        return await self._read(manager.current_balance, show_income, show_expense)
+
+    async def verify_totals(self) -> bool:
+        """Асинхронный вариант `BalanceManager.verify_totals`."""
+        manager = await self.manager()
+        return await self._read(manager.verify_totals)
+
+    async def period_report(
+        self,
+        unit: str = "month",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> List[PeriodBalance]:
+        """Асинхронный вариант `BalanceManager.period_report`."""
+        manager = await self.manager()
+        return await self._read(manager.period_report, unit, start, end)
@@ -1,7 +1,13 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import List, Optional
 
-from ..utils.file_manager import FileManager
+from ..transactions.transaction_store import TransactionStore
+from ..utils.instrumentation import instrumented
+from ..utils.renderers import ConsoleRenderer, Renderer
+from ..utils.storage import get_file_manager, open_store
+from .period_totals import EXPENSE, INCOME, PeriodTotals
+from .reports import BalanceReport, PeriodBalance
+from .running_totals import RunningTotals
 
 
 @dataclass
@@ -9,19 +15,37 @@ class BalanceManager:
     """
     Управление балансом на основе транзакций.
 
+    Суммы по категориям и по периодам поддерживаются инкрементально,
+    поэтому запрос баланса не обращается к диску.
+
     Args:
         filename (str): Имя файла, в котором хранятся транзакции.
+        store (TransactionStore, optional): Общее хранилище транзакций,
+        например, `TransactionManager.store`. По умолчанию создается
+        собственное.
+        renderer (Renderer, optional): Вывод результатов. По умолчанию
+        вывод в консоль; `Renderer()` отключает вывод.
     """
 
     filename: str
+    store: Optional[TransactionStore] = field(default=None, repr=False)
+    renderer: Renderer = field(default_factory=ConsoleRenderer, repr=False)
 
     def __post_init__(self):
         """
         Пост-инициализация объекта BalanceManager.
 
-        Создает экземпляр FileManager для работы с файлом транзакций.
+        Создает менеджер хранения для работы с файлом транзакций
+        и подписывает суммы по категориям и периодам на изменения
+        хранилища.
         """
-        self.file_manager = FileManager(self.filename)
+        if self.store is None:
+            self.store = open_store(get_file_manager(self.filename))
+        self.file_manager = self.store.file_manager
+        self.totals = RunningTotals(self.file_manager)
+        self.store.subscribe(self.totals)
+        self.periods = PeriodTotals(self.file_manager)
+        self.store.subscribe(self.periods)
 
     def _calculate(self, category: str) -> float:
         """
@@ -34,22 +58,28 @@ class BalanceManager:
             float: Сумма всех операций выбранной категории.
         """
 
-        transactions = self.file_manager.read_from_file()
+        return self.totals.get(category)
 
-        return sum(
-            transaction["amount"]
-            for transaction in transactions
-            if transaction["category"] == category
-        )
+    @instrumented("balance.verify")
+    def verify_totals(self) -> bool:
+        """
+        Сверяет поддерживаемые суммы с полным пересчетом по записям.
+        При расхождении суммы исправляются.
 
+        Returns:
+            bool: True, если суммы совпали, иначе False.
+        """
+        return self.totals.verify(self.store)
+
+    @instrumented("balance.current")
     def current_balance(
         self,
         show_income: Optional[bool] = False,
         show_expense: Optional[bool] = False,
-    ) -> None:
+    ) -> BalanceReport:
         """
-        Вывод текущего баланса или суммы доходов/расходов
-        в зависимости от переданных параметров.
+        Расчет текущего баланса и его вывод (баланса или суммы
+        доходов/расходов в зависимости от переданных параметров).
 
         Args:
             show_income (bool, optional): Флаг для вывода суммы доходов.
@@ -60,6 +90,9 @@ class BalanceManager:
         Raises:
             ValueError: Вызывается, если оба флага show_income и show_expense
             установлены в True.
+
+        Returns:
+            BalanceReport: Суммы доходов и расходов и баланс.
         """
         if show_income is True and show_expense is True:
             raise ValueError(
@@ -67,17 +100,46 @@ class BalanceManager:
                 " как False.",
             )
 
-        total_income = self._calculate("доход")
-        total_expense = self._calculate("расход")
-
-        if show_income or show_expense:
-            if show_income:
-                print(f"Доходы: {total_income}")
-                print()
-            if show_expense:
-                print(f"Расходы: {total_expense}")
-                print()
-        else:
-            balance = total_income - total_expense
-            print(f"Текущий баланс: {balance}")
-            print()
+        self.store.refresh()
+        report = BalanceReport(
+            income=self._calculate("доход"),
+            expense=self._calculate("расход"),
+        )
+        self.renderer.balance(report, bool(show_income), bool(show_expense))
+        return report
+
+    @instrumented("balance.period_report")
+    def period_report(
+        self,
+        unit: str = "month",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> List[PeriodBalance]:
+        """
+        Расчет и вывод доходов, расходов и баланса на конец
+        каждого периода.
+
+        Args:
+            unit (str, optional): Единица периода: "week", "month"
+            или "year". По умолчанию "month".
+            start (str, optional): Начальная дата (гггг-мм-дд).
+            По умолчанию первый период с записями.
+            end (str, optional): Конечная дата (гггг-мм-дд).
+            По умолчанию последний период с записями.
+
+        Returns:
+            List[PeriodBalance]: Итоги периодов.
+        """
+        self.store.refresh()
+        totals = self.periods.totals(unit, start, end)
+        periods = [
+            PeriodBalance(
+                period=period,
+                income=totals[period].get(INCOME, 0.0),
+                expense=totals[period].get(EXPENSE, 0.0),
+                balance=balance,
+            )
+            for period, balance in self.periods.balance_history(unit, start, end)
+        ]
+        self.renderer.period_report(periods)
+        return periods
@@ -0,0 +1,325 @@
+import json
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..transactions.columnar import COLUMNAR_THRESHOLD, HAS_NUMPY, ColumnarLedger
+from ..transactions.transaction import Transaction
+from ..utils.file_manager import FileManager, atomic_write
+from ..utils.money import from_minor_units
+
+INCOME = "доход"
+EXPENSE = "расход"
+
+
+def _month(day: date) -> str:
+    """Ключ месяца: 2024-05."""
+    return f"{day.year:04d}-{day.month:02d}"
+
+
+def _week(day: date) -> str:
+    """Ключ ISO-недели: 2024-W18."""
+    year, week, _ = day.isocalendar()
+    return f"{year:04d}-W{week:02d}"
+
+
+def _year(day: date) -> str:
+    """Ключ года: 2024."""
+    return f"{day.year:04d}"
+
+
+def _next_month(key: str) -> str:
+    """Ключ следующего месяца."""
+    year, month = int(key[:4]), int(key[5:7])
+    return f"{year + month // 12:04d}-{month % 12 + 1:02d}"
+
+
+def _next_week(key: str) -> str:
+    """Ключ следующей ISO-недели."""
+    monday = date.fromisocalendar(int(key[:4]), int(key[6:8]), 1)
+    return _week(monday + timedelta(weeks=1))
+
+
+def _next_year(key: str) -> str:
+    """Ключ следующего года."""
+    return f"{int(key) + 1:04d}"
+
+
+# Единица периода: функция ключа периода по дате и следующий период.
+UNITS: Dict[str, Tuple[Callable[[date], str], Callable[[str], str]]] = {
+    "week": (_week, _next_week),
+    "month": (_month, _next_month),
+    "year": (_year, _next_year),
+}
+
+
+def period_key(day: Any, unit: str = "month") -> str:
+    """
+    Возвращает ключ периода, в который попадает дата.
+
+    Args:
+        day (str | date): Дата (гггг-мм-дд).
+        unit (str, optional): Единица периода: "week" (ISO-неделя,
+        например 2024-W18), "month" (2024-05) или "year" (2024).
+        По умолчанию "month".
+
+    Raises:
+        ValueError: Вызывается, если единица периода неизвестна.
+
+    Returns:
+        str: Ключ периода.
+    """
+    if unit not in UNITS:
+        raise ValueError(f"Неизвестная единица периода: {unit}")
+    return UNITS[unit][0](date.fromisoformat(str(day)))
+
+
+@dataclass
+class PeriodTotals:
+    """
+    Материализованные суммы по периодам и категориям.
+
+    Подписывается на хранилище транзакций и поддерживает суммы
+    по неделям, месяцам и годам инкрементально: каждое изменение
+    обновляет по одной ячейке каждой единицы периода. Запросы
+    временных рядов (суммы за периоды, баланс на конец периода)
+    обходят только периоды, а не записи. Суммы хранятся в копейках
+    и сохраняются рядом с файлом транзакций вместе с его отпечатком.
+
+    Attributes:
+        file_manager (FileManager): Менеджер хранения транзакций.
+    """
+
+    file_manager: FileManager
+
+    def __post_init__(self):
+        """
+        Пост-инициализация объекта PeriodTotals.
+
+        Определяет путь к файлу сохраненных сумм.
+        """
+        self.filename = f"{self.file_manager.filename}.periods.json"
+        self._reset()
+
+    def _reset(self) -> None:
+        """Очищает суммы всех периодов."""
+        self.rollups: Dict[str, Dict[str, Dict[str, int]]] = {
+            unit: defaultdict(dict) for unit in UNITS
+        }
+        self._periods: Dict[str, List[str]] = {unit: [] for unit in UNITS}
+
+    def _apply(self, record: Transaction, sign: int) -> None:
+        """Добавляет сумму записи во все периоды со знаком sign."""
+        if record.minor is None:
+            return
+        amount = sign * record.minor
+        day = date.fromisoformat(str(record.date))
+        for unit, (key_of, _) in UNITS.items():
+            key = key_of(day)
+            rollup = self.rollups[unit]
+            if key not in rollup:
+                insort(self._periods[unit], key)
+            cell = rollup[key]
+            total = cell.get(record.category, 0) + amount
+            if total:
+                cell[record.category] = total
+            else:
+                cell.pop(record.category, None)
+            if not cell:
+                del rollup[key]
+                periods = self._periods[unit]
+                del periods[bisect_left(periods, key)]
+
+    def rebuild(self, store: Any) -> None:
+        """
+        Загружает сохраненные суммы или пересчитывает их по хранилищу.
+        Большие хранилища при установленном numpy пересчитываются
+        по колонкам (см. `ColumnarLedger`).
+
+        Args:
+            store (TransactionStore): Хранилище транзакций.
+        """
+        if self._load(store.fingerprint):
+            return
+        self._reset()
+        if HAS_NUMPY and len(store) >= COLUMNAR_THRESHOLD:
+            ledger = ColumnarLedger.from_records(store)
+            for unit in UNITS:
+                rollup = ledger.period_rollups(unit)
+                self.rollups[unit].update(rollup)
+                self._periods[unit] = sorted(rollup)
+            return
+        for record in store:
+            self._apply(record, 1)
+
+    def on_add(self, record: Transaction) -> None:
+        """Учитывает добавленную запись."""
+        self._apply(record, 1)
+
+    def on_delete(self, record: Transaction) -> None:
+        """Исключает удаленную запись."""
+        self._apply(record, -1)
+
+    def on_commit(self, fingerprint: Optional[List[int]]) -> None:
+        """
+        Атомарно сохраняет суммы после записи изменений в файл транзакций.
+
+        Args:
+            fingerprint (List[int], optional): Отпечаток файла транзакций,
+            снятый хранилищем под блокировкой сразу после записи.
+        """
+        payload = {"ledger": fingerprint, "rollups": self.rollups}
+        atomic_write(
+            self.filename,
+            lambda file: json.dump(
+                payload, file, ensure_ascii=False, separators=(",", ":")
+            ),
+            sync=False,
+        )
+
+    def _load(self, fingerprint: Optional[List[int]] = None) -> bool:
+        """
+        Загружает сохраненные суммы, если файл транзакций не менялся.
+
+        Args:
+            fingerprint (List[int], optional): Отпечаток загруженного
+            состояния файла. По умолчанию текущий отпечаток файла.
+
+        Returns:
+            bool: True, если суммы загружены.
+        """
+        try:
+            with open(self.filename, "r", encoding="utf-8") as file:
+                saved = json.load(file)
+        except (FileNotFoundError, json.decoder.JSONDecodeError):
+            return False
+
+        if fingerprint is None:
+            fingerprint = self.file_manager.fingerprint()
+        if fingerprint is None or saved.get("ledger") != fingerprint:
+            return False
+        if set(saved.get("rollups", ())) != set(UNITS):
+            return False
+
+        self._reset()
+        for unit, rollup in saved["rollups"].items():
+            self.rollups[unit].update(rollup)
+            self._periods[unit] = sorted(rollup)
+        return True
+
+    def _range(
+        self,
+        unit: str,
+        start: Optional[str],
+        end: Optional[str],
+    ) -> Iterator[str]:
+        """
+        Перебирает все периоды интервала, включая периоды без записей.
+        Без границ интервал определяется первым и последним периодом
+        с записями.
+        """
+        periods = self._periods[unit]
+        first = period_key(start, unit) if start is not None else None
+        last = period_key(end, unit) if end is not None else None
+        if first is None:
+            if not periods:
+                return
+            first = periods[0]
+        if last is None:
+            if not periods:
+                return
+            last = periods[-1]
+
+        next_of = UNITS[unit][1]
+        key = first
+        while key <= last:
+            yield key
+            key = next_of(key)
+
+    def totals(
+        self,
+        unit: str = "month",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Возвращает суммы по категориям за каждый период интервала.
+
+        Args:
+            unit (str, optional): Единица периода: "week", "month"
+            или "year". По умолчанию "month".
+            start (str, optional): Дата (гггг-мм-дд), период которой
+            открывает интервал. По умолчанию первый период с записями.
+            end (str, optional): Дата (гггг-мм-дд), период которой
+            закрывает интервал. По умолчанию последний период с записями.
+
+        Raises:
+            ValueError: Вызывается, если единица периода неизвестна.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Суммы категорий по периодам.
+        """
+        if unit not in UNITS:
+            raise ValueError(f"Неизвестная единица периода: {unit}")
+        rollup = self.rollups[unit]
+        return {
+            key: {
+                category: from_minor_units(amount)
+                for category, amount in rollup.get(key, {}).items()
+                if amount
+            }
+            for key in self._range(unit, start, end)
+        }
+
+    def _net(self, unit: str, key: str) -> int:
+        """Возвращает доходы минус расходы за период в копейках."""
+        cell = self.rollups[unit].get(key, {})
+        return cell.get(INCOME, 0) - cell.get(EXPENSE, 0)
+
+    def balance_history(
+        self,
+        unit: str = "month",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Возвращает баланс на конец каждого периода интервала.
+
+        Баланс накопительный: учитываются и все периоды до начала
+        интервала.
+
+        Args:
+            unit (str, optional): Единица периода: "week", "month"
+            или "year". По умолчанию "month".
+            start (str, optional): Дата (гггг-мм-дд), период которой
+            открывает интервал. По умолчанию первый период с записями.
+            end (str, optional): Дата (гггг-мм-дд), период которой
+            закрывает интервал. По умолчанию последний период с записями.
+
+        Raises:
+            ValueError: Вызывается, если единица периода неизвестна.
+
+        Returns:
+            List[Tuple[str, float]]: Пары (период, баланс на его конец).
+        """
+        if unit not in UNITS:
+            raise ValueError(f"Неизвестная единица периода: {unit}")
+        periods = self._periods[unit]
+        keys = list(self._range(unit, start, end))
+        if not keys:
+            return []
+
+        before = bisect_left(periods, keys[0])
+        balance = sum(self._net(unit, key) for key in periods[:before])
+        history = []
+        position = before
+        for key in keys:
+            end_position = bisect_right(periods, key)
+            balance += sum(
+                self._net(unit, period) for period in periods[position:end_position]
+            )
+            position = end_position
+            history.append((key, from_minor_units(balance)))
+        return history
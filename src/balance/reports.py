@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+
+from ..utils.money import from_minor_units, to_minor_units
+
+
+@dataclass(frozen=True)
+class BalanceReport:
+    """
+    Суммы доходов и расходов.
+
+    Attributes:
+        income (float): Сумма доходов.
+        expense (float): Сумма расходов.
+    """
+
+    income: float
+    expense: float
+
+    @property
+    def balance(self) -> float:
+        """Баланс: доходы минус расходы (разность считается в копейках)."""
+        return from_minor_units(to_minor_units(self.income) - to_minor_units(self.expense))
+
+
+@dataclass(frozen=True)
+class PeriodBalance:
+    """
+    Итоги одного периода.
+
+    Attributes:
+        period (str): Ключ периода (например, 2024-05).
+        income (float): Доходы за период.
+        expense (float): Расходы за период.
+        balance (float): Баланс на конец периода с учетом
+        всех предыдущих периодов.
+    """
+
+    period: str
+    income: float
+    expense: float
+    balance: float
@@ -0,0 +1,141 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from ..transactions.transaction import Transaction
+from ..utils.file_manager import FileManager, atomic_write
+from ..utils.money import from_minor_units, to_minor_units
+
+# Версия формата сохраненных сумм: с версии 2 суммы хранятся в копейках.
+TOTALS_FORMAT = 2
+
+
+def _non_zero(totals: Dict[str, int]) -> Dict[str, int]:
+    """Отбрасывает категории с нулевой суммой."""
+    return {category: total for category, total in totals.items() if total}
+
+
+def _to_units(totals: Dict[str, float]) -> Dict[str, int]:
+    """Переводит суммы по категориям в копейки."""
+    return {category: to_minor_units(total) for category, total in totals.items()}
+
+
+@dataclass
+class RunningTotals:
+    """
+    Суммы транзакций по категориям, обновляемые инкрементально.
+
+    Подписывается на хранилище транзакций и применяет изменения
+    как дельты в целых копейках, поэтому итоги не накапливают ошибку
+    округления. Суммы сохраняются рядом с файлом транзакций вместе
+    с отпечатком этого файла и при следующем открытии берутся
+    из него без пересчета, если файл не менялся.
+
+    Attributes:
+        file_manager (FileManager): Менеджер хранения транзакций.
+    """
+
+    file_manager: FileManager
+
+    def __post_init__(self):
+        """
+        Пост-инициализация объекта RunningTotals.
+
+        Определяет путь к файлу сохраненных сумм.
+        """
+        self.filename = f"{self.file_manager.filename}.totals.json"
+        self.totals: Dict[str, int] = {}
+
+    def get(self, category: str) -> float:
+        """
+        Возвращает сумму транзакций категории за O(1).
+
+        Args:
+            category (str): Категория транзакций (доход или расход).
+
+        Returns:
+            float: Сумма всех операций выбранной категории.
+        """
+        return from_minor_units(self.totals.get(category, 0))
+
+    def verify(self, store: Any) -> bool:
+        """
+        Сверяет суммы с полным пересчетом и исправляет расхождения.
+
+        Args:
+            store (TransactionStore): Хранилище транзакций.
+
+        Returns:
+            bool: True, если суммы совпали с пересчетом, иначе False.
+        """
+        expected = _to_units(store.category_totals())
+        if _non_zero(self.totals) == _non_zero(expected):
+            return True
+
+        self.totals = expected
+        self.on_commit(store.fingerprint)
+        return False
+
+    def rebuild(self, store: Any) -> None:
+        """
+        Загружает сохраненные суммы или пересчитывает их по хранилищу.
+
+        Args:
+            store (TransactionStore): Хранилище транзакций.
+        """
+        if not self._load(store.fingerprint):
+            self.totals = _to_units(store.category_totals())
+
+    def on_add(self, record: Transaction) -> None:
+        """Учитывает добавленную запись."""
+        category = record.category
+        self.totals[category] = self.totals.get(category, 0) + (record.minor or 0)
+
+    def on_delete(self, record: Transaction) -> None:
+        """Исключает удаленную запись."""
+        category = record.category
+        self.totals[category] = self.totals.get(category, 0) - (record.minor or 0)
+
+    def on_commit(self, fingerprint: Optional[List[int]]) -> None:
+        """
+        Атомарно сохраняет суммы после записи изменений в файл транзакций.
+
+        Args:
+            fingerprint (List[int], optional): Отпечаток файла транзакций,
+            снятый хранилищем под блокировкой сразу после записи. Отпечаток,
+            снятый позже, мог бы уже включать изменения другого процесса,
+            которых нет в суммах.
+        """
+        payload = {"format": TOTALS_FORMAT, "ledger": fingerprint, "totals": self.totals}
+        atomic_write(
+            self.filename,
+            lambda file: json.dump(payload, file, ensure_ascii=False),
+            sync=False,
+        )
+
+    def _load(self, fingerprint: Optional[List[int]] = None) -> bool:
+        """
+        Загружает сохраненные суммы, если файл транзакций не менялся.
+        Суммы старого формата (в рублях) не загружаются и пересчитываются.
+
+        Args:
+            fingerprint (List[int], optional): Отпечаток загруженного
+            состояния файла. По умолчанию текущий отпечаток файла.
+
+        Returns:
+            bool: True, если суммы загружены.
+        """
+        try:
+            with open(self.filename, "r") as file:
+                saved = json.load(file)
+        except (FileNotFoundError, json.decoder.JSONDecodeError):
+            return False
+
+        if fingerprint is None:
+            fingerprint = self.file_manager.fingerprint()
+        if saved.get("format") != TOTALS_FORMAT:
+            return False
+        if fingerprint is None or saved.get("ledger") != fingerprint:
+            return False
+        self.totals = saved["totals"]
+        return True
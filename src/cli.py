@@ -0,0 +1,340 @@
+import argparse
+import shlex
+import sys
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional, TextIO
+
+from .registry import Wallet
+from .utils.renderers import (
+    BufferedRenderer,
+    ConsoleRenderer,
+    JsonLinesRenderer,
+    Renderer,
+    TableRenderer,
+)
+from .utils.validators import (
+    validate_amount,
+    validate_category,
+    validate_date,
+    validate_description,
+)
+
+DEFAULT_PATH = "data/transactions.json"
+RENDERERS = {
+    "text": ConsoleRenderer,
+    "table": TableRenderer,
+    "jsonl": JsonLinesRenderer,
+}
+PERIOD_UNITS = ("week", "month", "year")
+EXIT_OK = 0
+EXIT_ERROR = 1
+
+
+class CommandError(ValueError):
+    """Некорректная команда в пакетном режиме."""
+
+
+class _CommandParser(argparse.ArgumentParser):
+    """Разбор команд пакетного режима: ошибка не завершает процесс."""
+
+    def error(self, message: str) -> None:
+        raise CommandError(message)
+
+
+def _checked(validator: Callable[[Any], Any]) -> Callable[[str], Any]:
+    """Тип аргумента argparse с сообщением об ошибке из валидатора."""
+
+    def convert(value: str) -> Any:
+        try:
+            return validator(value)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e)) from e
+
+    convert.__name__ = validator.__name__
+    return convert
+
+
+def _add(wallet: Wallet, args: argparse.Namespace) -> int:
+    wallet.transactions.add_transaction(
+        args.date, args.category, args.amount, args.description
+    )
+    return EXIT_OK
+
+
+def _edit(wallet: Wallet, args: argparse.Namespace) -> int:
+    transaction = wallet.transactions.edit_transaction(
+        args.id, args.date, args.category, args.amount, args.description
+    )
+    return EXIT_OK if transaction is not None else EXIT_ERROR
+
+
+def _delete(wallet: Wallet, args: argparse.Namespace) -> int:
+    transaction = wallet.transactions.delete_transaction(args.id)
+    return EXIT_OK if transaction is not None else EXIT_ERROR
+
+
+def _show(wallet: Wallet, args: argparse.Namespace) -> int:
+    if args.id is None:
+        wallet.transactions.show_all()
+        return EXIT_OK
+    if wallet.transactions.check_transactions(args.id, show=True):
+        return EXIT_OK
+    print(f"Запись с ID {args.id} не найдена.", file=sys.stderr)
+    return EXIT_ERROR
+
+
+def _search(wallet: Wallet, args: argparse.Namespace) -> int:
+    wallet.transactions.search_transactions(
+        category=args.category,
+        date=args.date,
+        amount=args.amount,
+        date_from=args.date_from,
+        date_to=args.date_to,
+        amount_min=args.amount_min,
+        amount_max=args.amount_max,
+        description=args.description,
+        text=args.text,
+    )
+    return EXIT_OK
+
+
+def _balance(wallet: Wallet, args: argparse.Namespace) -> int:
+    if args.period is not None:
+        wallet.balance.period_report(args.period, args.start, args.end)
+    else:
+        wallet.balance.current_balance(args.income, args.expense)
+    return EXIT_OK
+
+
+def _import(wallet: Wallet, args: argparse.Namespace) -> int:
+    report = wallet.transactions.import_transactions(args.path, args.batch_size)
+    return EXIT_OK if not report.rejected else EXIT_ERROR
+
+
+def _export(wallet: Wallet, args: argparse.Namespace) -> int:
+    wallet.transactions.export_transactions(args.path)
+    return EXIT_OK
+
+
+@contextmanager
+def _held_output(wallet: Wallet) -> Iterator[BufferedRenderer]:
+    """Придерживает вывод менеджеров кошелька до конца блока."""
+    output = BufferedRenderer(wallet.renderer)
+    managers = (wallet.transactions, wallet.balance)
+    for manager in managers:
+        manager.renderer = output
+    try:
+        yield output
+    finally:
+        for manager in managers:
+            manager.renderer = wallet.renderer
+
+
+def _batch(wallet: Wallet, args: argparse.Namespace) -> int:
+    """
+    Выполняет команды из потока (по одной на строку) на одном
+    загруженном файле и сохраняет изменения одной записью в конце.
+
+    На время пакета захватывается исключительная блокировка файла,
+    поэтому другие процессы не меняют его между командами. Без
+    --keep-going первая ошибка отменяет все изменения пакета.
+    Вывод команд придерживается и выводится только после сохранения
+    пакета, поэтому отмененные команды не сообщают об успехе.
+    """
+    parser = build_command_parser()
+    status = EXIT_OK
+    file_lock = wallet.transactions.file_manager.file_lock
+    with _held_output(wallet) as output:
+        with file_lock.exclusive(), wallet.transactions.batch():
+            for number, line in enumerate(args.input, start=1):
+                try:
+                    words = shlex.split(line, comments=True)
+                    if not words:
+                        continue
+                    command = parser.parse_args(words)
+                    status = command.handler(wallet, command) or status
+                except (ValueError, OSError) as e:
+                    if not args.keep_going:
+                        raise CommandError(f"строка {number}: {e}") from e
+                    print(f"Ошибка: строка {number}: {e}", file=sys.stderr)
+                    status = EXIT_ERROR
+        output.commit()
+    return status
+
+
+def _add_commands(subparsers: Any) -> None:
+    """Добавляет команды работы с транзакциями и балансом."""
+    date = _checked(validate_date)
+    category = _checked(validate_category)
+    amount = _checked(validate_amount)
+
+    add = subparsers.add_parser("add", help="добавить транзакцию")
+    add.add_argument("date", type=date, help="дата (гггг-мм-дд)")
+    add.add_argument("category", type=category, help="доход или расход")
+    add.add_argument("amount", type=amount, help="сумма")
+    add.add_argument(
+        "description",
+        nargs="?",
+        default="",
+        type=validate_description,
+        help="описание",
+    )
+    add.set_defaults(handler=_add)
+
+    edit = subparsers.add_parser("edit", help="изменить транзакцию")
+    edit.add_argument("id", type=int, help="ID транзакции")
+    edit.add_argument("--date", type=date)
+    edit.add_argument("--category", type=category)
+    edit.add_argument("--amount", type=amount)
+    edit.add_argument("--description")
+    edit.set_defaults(handler=_edit)
+
+    delete = subparsers.add_parser("delete", help="удалить транзакцию")
+    delete.add_argument("id", type=int, help="ID транзакции")
+    delete.set_defaults(handler=_delete)
+
+    show = subparsers.add_parser("show", help="показать транзакцию или все записи")
+    show.add_argument("id", type=int, nargs="?", help="ID транзакции")
+    show.set_defaults(handler=_show)
+
+    search = subparsers.add_parser("search", help="найти транзакции")
+    search.add_argument("--category", type=category)
+    search.add_argument("--date", type=date)
+    search.add_argument("--amount", type=amount)
+    search.add_argument("--date-from", type=date)
+    search.add_argument("--date-to", type=date)
+    search.add_argument("--amount-min", type=amount)
+    search.add_argument("--amount-max", type=amount)
+    search.add_argument("--description", help="подстрока описания")
+    search.add_argument(
+        "--text", help="слова описания (поиск по началу слов, без учета регистра)"
+    )
+    search.set_defaults(handler=_search)
+
+    balance = subparsers.add_parser("balance", help="баланс, доходы или расходы")
+    flags = balance.add_mutually_exclusive_group()
+    flags.add_argument("--income", action="store_true", help="сумма доходов")
+    flags.add_argument("--expense", action="store_true", help="сумма расходов")
+    flags.add_argument(
+        "--period", choices=PERIOD_UNITS, help="итоги по неделям, месяцам или годам"
+    )
+    balance.add_argument("--start", type=date, help="начальная дата для --period")
+    balance.add_argument("--end", type=date, help="конечная дата для --period")
+    balance.set_defaults(handler=_balance)
+
+    import_ = subparsers.add_parser("import", help="импорт выписки CSV или JSONL")
+    import_.add_argument("path", help="путь к файлу выписки")
+    import_.add_argument("--batch-size", type=int, default=10000)
+    import_.set_defaults(handler=_import)
+
+    export = subparsers.add_parser("export", help="выгрузка всех транзакций")
+    export.add_argument(
+        "path",
+        help="путь к файлу; формат по расширению (.json, .jsonl, .sqlite, .wallet, .shards)",
+    )
+    export.set_defaults(handler=_export)
+
+
+def build_command_parser() -> argparse.ArgumentParser:
+    """
+    Создает разбор одной команды пакетного режима.
+
+    Returns:
+        argparse.ArgumentParser: Разбор команды.
+    """
+    parser = _CommandParser(prog="batch", add_help=False)
+    _add_commands(parser.add_subparsers(dest="command", required=True))
+    return parser
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Создает разбор аргументов командной строки.
+
+    Returns:
+        argparse.ArgumentParser: Разбор аргументов.
+    """
+    parser = argparse.ArgumentParser(
+        prog="personal_financial_wallet.py",
+        description="Личный финансовый кошелек: неинтерактивные команды.",
+    )
+    parser.add_argument(
+        "-f",
+        "--file",
+        default=DEFAULT_PATH,
+        help=f"файл транзакций (по умолчанию {DEFAULT_PATH})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="число процессов для поиска и пересчета сумм в больших журналах"
+        " (по умолчанию 0 - без параллельного просмотра)",
+    )
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument(
+        "--format", choices=tuple(RENDERERS), default="text", help="формат вывода"
+    )
+    output.add_argument("-q", "--quiet", action="store_true", help="без вывода")
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    _add_commands(subparsers)
+
+    batch = subparsers.add_parser(
+        "batch",
+        help="выполнить команды из stdin с одной записью в конце",
+        description=(
+            "Читает команды (по одной на строку, как аргументы этой программы"
+            " без глобальных параметров) и выполняет их на одном загруженном"
+            " файле; изменения сохраняются один раз в конце."
+        ),
+    )
+    batch.add_argument(
+        "--input",
+        type=argparse.FileType("r", encoding="utf-8"),
+        default="-",
+        help="файл команд (по умолчанию stdin)",
+    )
+    batch.add_argument(
+        "--keep-going",
+        action="store_true",
+        help="пропускать ошибочные команды вместо отмены всего пакета",
+    )
+    batch.set_defaults(handler=_batch)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None, stdin: Optional[TextIO] = None) -> int:
+    """
+    Выполняет команду командной строки.
+
+    Args:
+        argv (List[str], optional): Аргументы. По умолчанию sys.argv[1:].
+        stdin (TextIO, optional): Поток команд пакетного режима
+        вместо stdin.
+
+    Returns:
+        int: Код завершения: 0 - успех, 1 - ошибка или запись
+        не найдена, 2 - некорректные аргументы.
+    """
+    args = build_parser().parse_args(argv)
+    if stdin is not None and args.command == "batch" and args.input is sys.stdin:
+        args.input = stdin
+    renderer = Renderer() if args.quiet else RENDERERS[args.format]()
+
+    try:
+        wallet = Wallet(args.file, renderer, workers=args.workers)
+    except (ValueError, OSError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    try:
+        return args.handler(wallet, args)
+    except (ValueError, OSError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    finally:
+        wallet.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,355 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+from .balance.balance_manager import BalanceManager
+from .transactions.transaction_manager import TransactionManager
+from .utils.renderers import Renderer
+from .utils.sqlite_manager import SQLiteFileManager
+from .utils.storage import get_file_manager, open_store
+
+WALLET_ID = re.compile(r"[\w-][\w.-]*")
+
+
+@dataclass
+class Wallet:
+    """
+    Менеджеры транзакций и баланса одного файла на общем
+    загруженном хранилище.
+
+    Attributes:
+        filename (str): Имя файла, в котором хранятся транзакции.
+        renderer (Renderer): Вывод результатов команд.
+        write_behind (bool): Откладывать запись изменений до `flush()`
+        (см. `TransactionStore`). База SQLite фиксирует изменения сразу,
+        поэтому для нее параметр не действует. По умолчанию False.
+        workers (int): Число процессов параллельного просмотра больших
+        журналов (см. `TransactionStore.enable_parallel`); 0 - без него.
+        По умолчанию 0.
+    """
+
+    filename: str
+    renderer: Renderer
+    write_behind: bool = False
+    workers: int = 0
+
+    def __post_init__(self):
+        """
+        Пост-инициализация объекта Wallet.
+
+        Загружает файл транзакций один раз.
+        """
+        self.lock = threading.RLock()
+        file_manager = get_file_manager(self.filename)
+        write_behind = self.write_behind and not isinstance(file_manager, SQLiteFileManager)
+        store = open_store(file_manager, write_behind=write_behind)
+        if self.workers:
+            store.enable_parallel(self.workers)
+        self.transactions = TransactionManager(
+            self.filename, store=store, renderer=self.renderer
+        )
+        self.balance = BalanceManager(self.filename, store=store, renderer=self.renderer)
+
+    @property
+    def dirty(self) -> bool:
+        """Есть ли несохраненные изменения."""
+        return self.transactions.store.dirty
+
+    def memory_usage(self) -> int:
+        """Возвращает примерный объем памяти загруженных записей в байтах."""
+        return self.transactions.store.memory_usage()
+
+    def flush(self) -> bool:
+        """
+        Сохраняет отложенные изменения.
+
+        Returns:
+            bool: True, если изменения были сохранены.
+        """
+        with self.lock:
+            return self.transactions.store.flush()
+
+    def close(self) -> None:
+        """
+        Сохраняет изменения, дожидается фонового сжатия журнала,
+        останавливает пул процессов и закрывает базу.
+        """
+        with self.lock:
+            self.flush()
+            self.transactions.store.disable_parallel()
+            file_manager = self.transactions.file_manager
+            wait_for_compaction = getattr(file_manager, "wait_for_compaction", None)
+            if wait_for_compaction is not None:
+                wait_for_compaction()
+            close = getattr(file_manager, "close", None)
+            if close is not None:
+                close()
+
+
+@dataclass
+class WalletRegistry:
+    """
+    Реестр кошельков: открывает кошельки по требованию и держит
+    часто используемые в памяти.
+
+    Кошелек `<id>` хранится в файле `<directory>/<id><extension>`.
+    Открытые кошельки упорядочены по времени последнего обращения;
+    при превышении числа кошельков или оценки занятой ими памяти
+    давно не использованные кошельки сохраняются и закрываются.
+    Изменения записываются отложенно (`write_behind`): фоновый поток
+    раз в `flush_interval` секунд сохраняет измененные кошельки.
+
+    Пример:
+        with WalletRegistry("data/wallets") as registry:
+            with registry.wallet("alice") as wallet:
+                wallet.transactions.add_transaction(...)
+
+    Attributes:
+        directory (str): Каталог файлов кошельков.
+        extension (str): Расширение файлов, по которому выбирается
+        формат хранения. По умолчанию ".json".
+        max_wallets (int): Наибольшее число открытых кошельков.
+        По умолчанию 128.
+        max_memory (int, optional): Наибольший объем памяти открытых
+        кошельков в байтах (по оценке `TransactionStore.memory_usage`).
+        По умолчанию None - без ограничения.
+        flush_interval (float, optional): Период фонового сохранения
+        в секундах; None - без фонового потока, изменения сохраняются
+        при вытеснении, `flush()` и `close()`. По умолчанию 1.0.
+        renderer (Renderer): Вывод результатов. По умолчанию без вывода.
+    """
+
+    directory: str
+    extension: str = ".json"
+    max_wallets: int = 128
+    max_memory: Optional[int] = None
+    flush_interval: Optional[float] = 1.0
+    renderer: Renderer = field(default_factory=Renderer, repr=False)
+
+    def __post_init__(self):
+        """
+        Пост-инициализация объекта WalletRegistry.
+
+        Создает каталог кошельков и запускает фоновое сохранение.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._wallets: "OrderedDict[str, Wallet]" = OrderedDict()
+        self._pins: Dict[str, int] = {}
+        self._opening: Dict[str, threading.Event] = {}
+        self._closing: Dict[str, threading.Event] = {}
+        self.flush_errors: Dict[str, BaseException] = {}
+        self._stopped = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if self.flush_interval is not None:
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="wallet-flusher", daemon=True
+            )
+            self._flusher.start()
+
+    def __enter__(self) -> "WalletRegistry":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._wallets)
+
+    def __contains__(self, wallet_id: str) -> bool:
+        return wallet_id in self._wallets
+
+    def path(self, wallet_id: str) -> str:
+        """
+        Возвращает путь к файлу кошелька.
+
+        Args:
+            wallet_id (str): Идентификатор кошелька.
+
+        Raises:
+            ValueError: Вызывается, если идентификатор содержит
+            недопустимые символы (например, разделители пути).
+
+        Returns:
+            str: Путь к файлу кошелька.
+        """
+        if not WALLET_ID.fullmatch(wallet_id):
+            raise ValueError(f"Некорректный идентификатор кошелька: {wallet_id!r}")
+        return os.path.join(self.directory, f"{wallet_id}{self.extension}")
+
+    @contextmanager
+    def wallet(self, wallet_id: str) -> Iterator[Wallet]:
+        """
+        Открывает кошелек (или берет уже открытый) и захватывает его
+        на время блока: кошелек не вытесняется, а другие потоки
+        и фоновое сохранение ждут завершения блока.
+
+        Args:
+            wallet_id (str): Идентификатор кошелька.
+
+        Returns:
+            Iterator[Wallet]: Кошелек.
+        """
+        wallet = self._acquire(wallet_id)
+        try:
+            with wallet.lock:
+                yield wallet
+        finally:
+            with self._lock:
+                self._pins[wallet_id] -= 1
+                if not self._pins[wallet_id]:
+                    del self._pins[wallet_id]
+            self._evict()
+
+    def _acquire(self, wallet_id: str) -> Wallet:
+        """Возвращает открытый кошелек, закрепляя его от вытеснения."""
+        path = self.path(wallet_id)
+        while True:
+            with self._lock:
+                wallet = self._wallets.get(wallet_id)
+                if wallet is not None:
+                    self._wallets.move_to_end(wallet_id)
+                    self._pins[wallet_id] = self._pins.get(wallet_id, 0) + 1
+                    return wallet
+                # Кошелек загружает или закрывает другой поток: ждем его,
+                # а не читаем файл второй раз или до сохранения изменений.
+                waiting = self._closing.get(wallet_id) or self._opening.get(wallet_id)
+                if waiting is None:
+                    opening = self._opening[wallet_id] = threading.Event()
+                    break
+            waiting.wait()
+
+        try:
+            wallet = Wallet(path, self.renderer, write_behind=True)
+        except BaseException:
+            with self._lock:
+                del self._opening[wallet_id]
+            opening.set()
+            raise
+        with self._lock:
+            del self._opening[wallet_id]
+            self._wallets[wallet_id] = wallet
+            self._pins[wallet_id] = self._pins.get(wallet_id, 0) + 1
+        opening.set()
+        return wallet
+
+    def memory_usage(self) -> int:
+        """
+        Возвращает оценку памяти открытых кошельков.
+
+        Returns:
+            int: Примерный объем в байтах.
+        """
+        with self._lock:
+            wallets = list(self._wallets.values())
+        return sum(wallet.memory_usage() for wallet in wallets)
+
+    def _over_limit(self) -> bool:
+        """Превышены ли ограничения числа кошельков или памяти."""
+        if len(self._wallets) > self.max_wallets:
+            return True
+        return self.max_memory is not None and self.memory_usage() > self.max_memory
+
+    def _evict(self) -> None:
+        """Закрывает давно не использованные кошельки сверх ограничений."""
+        while self._over_limit():
+            with self._lock:
+                wallet_id = next(
+                    (key for key in self._wallets if key not in self._pins), None
+                )
+                if wallet_id is None:
+                    return
+                wallet = self._take(wallet_id)
+            if not self._close_wallet(wallet_id, wallet):
+                return
+
+    def evict(self, wallet_id: str) -> bool:
+        """
+        Сохраняет и закрывает кошелек, если он открыт и не используется.
+
+        Args:
+            wallet_id (str): Идентификатор кошелька.
+
+        Returns:
+            bool: True, если кошелек был закрыт.
+        """
+        with self._lock:
+            if wallet_id not in self._wallets or wallet_id in self._pins:
+                return False
+            wallet = self._take(wallet_id)
+        return self._close_wallet(wallet_id, wallet)
+
+    def _take(self, wallet_id: str) -> Wallet:
+        """
+        Вынимает кошелек из реестра для закрытия. Вызывается под
+        блокировкой реестра; до окончания `_close_wallet` кошелек
+        не открывается заново.
+        """
+        self._closing[wallet_id] = threading.Event()
+        return self._wallets.pop(wallet_id)
+
+    def _close_wallet(self, wallet_id: str, wallet: Wallet) -> bool:
+        """
+        Сохраняет и закрывает вынутый из реестра кошелек. Если сохранить
+        изменения не удалось, ошибка запоминается в `flush_errors`,
+        а кошелек возвращается в реестр, чтобы изменения не потерялись.
+        """
+        try:
+            try:
+                wallet.flush()
+            except Exception as e:
+                self.flush_errors[wallet_id] = e
+                with self._lock:
+                    self._wallets[wallet_id] = wallet
+                    self._wallets.move_to_end(wallet_id, last=False)
+                return False
+            self.flush_errors.pop(wallet_id, None)
+            wallet.close()
+            return True
+        finally:
+            with self._lock:
+                closing = self._closing.pop(wallet_id)
+            closing.set()
+
+    def flush(self) -> List[str]:
+        """
+        Сохраняет изменения всех открытых кошельков. Ошибки сохранения
+        запоминаются в `flush_errors`, а кошелек остается измененным
+        до следующей попытки.
+
+        Returns:
+            List[str]: Идентификаторы сохраненных кошельков.
+        """
+        with self._lock:
+            wallets = list(self._wallets.items())
+        flushed = []
+        for wallet_id, wallet in wallets:
+            if not wallet.dirty:
+                continue
+            try:
+                if wallet.flush():
+                    flushed.append(wallet_id)
+                self.flush_errors.pop(wallet_id, None)
+            except Exception as e:
+                self.flush_errors[wallet_id] = e
+        return flushed
+
+    def _flush_loop(self) -> None:
+        """Периодически сохраняет измененные кошельки."""
+        while not self._stopped.wait(self.flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        """Останавливает фоновое сохранение, сохраняет и закрывает все кошельки."""
+        self._stopped.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        with self._lock:
+            wallets = [(wallet_id, self._take(wallet_id)) for wallet_id in list(self._wallets)]
+        for wallet_id, wallet in wallets:
+            self._close_wallet(wallet_id, wallet)
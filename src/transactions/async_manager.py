@@ -0,0 +1,362 @@
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+from ..utils.renderers import BufferedRenderer, ConsoleRenderer, Renderer
+from ..utils.storage import get_file_manager, open_store
+from .bulk_import import ImportReport
+from .transaction import Transaction, date
+from .transaction_manager import TransactionManager
+from .transaction_store import TransactionStore
+
+T = TypeVar("T")
+
+# Операция записи, будущий результат ее выполнения и признак того,
+# что операцию можно сохранять в одной пачке с другими.
+Job = Tuple[Callable[[], Any], asyncio.Future, bool]
+
+
+@dataclass
+class SharedLock:
+    """
+    Блокировка чтения и записи для корутин одного цикла событий.
+
+    Общую блокировку (`shared()`) одновременно держат несколько
+    корутин, исключительную (`exclusive()`) - только одна и только
+    без общих. Ожидающая исключительная блокировка не пропускает
+    новые общие, поэтому поток чтений не задерживает запись.
+    """
+
+    _condition: asyncio.Condition = field(
+        default_factory=asyncio.Condition, init=False, repr=False
+    )
+    _readers: int = field(default=0, init=False)
+    _writing: bool = field(default=False, init=False)
+    _waiting: int = field(default=0, init=False)
+
+    @asynccontextmanager
+    async def shared(self) -> AsyncIterator[None]:
+        """Общая блокировка: `async with lock.shared(): ...`."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: not self._writing and not self._waiting)
+            self._readers += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._readers -= 1
+                self._condition.notify_all()
+
+    @asynccontextmanager
+    async def exclusive(self) -> AsyncIterator[None]:
+        """Исключительная блокировка: `async with lock.exclusive(): ...`."""
+        async with self._condition:
+            self._waiting += 1
+            try:
+                await self._condition.wait_for(lambda: not self._writing and not self._readers)
+            finally:
+                self._waiting -= 1
+                self._condition.notify_all()
+            self._writing = True
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+@dataclass
+class AsyncTransactionManager:
+    """
+    Асинхронный интерфейс к TransactionManager для работы внутри asyncio.
+
+    Работа с диском и хранилищем выполняется в потоках
+    (`asyncio.to_thread`), а не в цикле событий. Записи загружаются
+    потоково, поэтому разбор большого файла не держит GIL целиком
+    и не останавливает другие корутины. Одновременные запросы
+    на загрузку и обновление хранилища объединяются в один.
+    Чтения выполняются одновременно на закрепленном состоянии
+    хранилища (см. `TransactionStore.frozen`); обновление хранилища
+    и изменения ждут их окончания. Изменения выполняются по очереди
+    единственной задачей-писателем, которая сохраняет накопившиеся
+    в очереди изменения одной записью в файл.
+
+    Вывод каждой операции придерживается (см. `BufferedRenderer`)
+    и выводится одной группой после ее окончания, а вывод изменения -
+    только после его сохранения, поэтому повтор изменения
+    не дублирует вывод.
+
+    Поддерживает `async with`: при выходе дожидается записи
+    всех изменений.
+
+    Attributes:
+        filename (str): Имя файла, в котором хранятся транзакции.
+        renderer (Renderer): Вывод результатов. По умолчанию вывод
+        в консоль; `Renderer()` отключает вывод.
+    """
+
+    filename: str
+    renderer: Renderer = field(default_factory=ConsoleRenderer, repr=False)
+
+    def __post_init__(self):
+        """
+        Пост-инициализация объекта AsyncTransactionManager.
+
+        Файл не читается до первого обращения.
+        """
+        self._opening: Optional[asyncio.Task] = None
+        self._refreshing: Optional[asyncio.Task] = None
+        self._lock = SharedLock()
+        self._output = BufferedRenderer(self.renderer)
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "AsyncTransactionManager":
+        await self.manager()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def _open(self) -> TransactionManager:
+        """Создает синхронный менеджер с потоковой загрузкой записей."""
+        store = open_store(get_file_manager(self.filename), streaming=True)
+        return TransactionManager(self.filename, store=store, renderer=self._output)
+
+    async def manager(self) -> TransactionManager:
+        """
+        Возвращает синхронный менеджер, загружая хранилище один раз.
+        Одновременные вызовы ожидают одну и ту же загрузку.
+
+        Returns:
+            TransactionManager: Менеджер транзакций.
+        """
+        if self._opening is None:
+            self._opening = asyncio.ensure_future(asyncio.to_thread(self._open))
+        return await asyncio.shield(self._opening)
+
+    async def store(self) -> TransactionStore:
+        """
+        Возвращает хранилище транзакций.
+
+        Returns:
+            TransactionStore: Хранилище транзакций.
+        """
+        return (await self.manager()).store
+
+    async def _refresh(self, store: TransactionStore) -> None:
+        """Перечитывает хранилище, если файл изменен другим процессом."""
+        try:
+            async with self._lock.exclusive():
+                await asyncio.to_thread(store.refresh)
+        finally:
+            self._refreshing = None
+
+    async def read(self, function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Выполняет чтение в потоке, не пересекаясь с записями.
+
+        Перед чтением хранилище обновляется, если файл изменил другой
+        процесс; одновременные чтения ожидают одно общее обновление,
+        а затем выполняются параллельно на закрепленном состоянии.
+        Исключительная блокировка для обновления берется, только если
+        хранилище устарело (см. `TransactionStore.stale`).
+
+        Args:
+            function (Callable): Функция чтения.
+            *args: Позиционные аргументы функции.
+            **kwargs: Именованные аргументы функции.
+
+        Returns:
+            T: Результат функции.
+        """
+        store = await self.store()
+        if self._refreshing is None and await asyncio.to_thread(store.stale):
+            if self._refreshing is None:
+                self._refreshing = asyncio.ensure_future(self._refresh(store))
+        if self._refreshing is not None:
+            await asyncio.shield(self._refreshing)
+        async with self._lock.shared():
+            with store.frozen():
+                return await asyncio.to_thread(self._output.call, function, *args, **kwargs)
+
+    async def exclusive(self, function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Выполняет функцию в потоке, когда нет ни чтений, ни записей,
+        например, подписку на изменения хранилища.
+
+        Args:
+            function (Callable): Функция.
+            *args: Позиционные аргументы функции.
+            **kwargs: Именованные аргументы функции.
+
+        Returns:
+            T: Результат функции.
+        """
+        await self.store()
+        async with self._lock.exclusive():
+            return await asyncio.to_thread(function, *args, **kwargs)
+
+    def write(self, operation: Callable[[], T], batch: bool = True) -> Awaitable[T]:
+        """
+        Ставит изменение в очередь задачи-писателя.
+
+        Args:
+            operation (Callable): Функция, изменяющая хранилище.
+            batch (bool, optional): Можно ли сохранять изменение в одной
+            пачке с другими. Крупные операции, которые сами сохраняют
+            данные частями (импорт), выполняются отдельно.
+            По умолчанию True.
+
+        Returns:
+            Awaitable[T]: Результат операции после ее сохранения.
+        """
+        if self._writer is None:
+            self._queue = asyncio.Queue()
+            self._writer = asyncio.ensure_future(self._write_loop())
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((operation, future, batch))
+        return future
+
+    async def _write_loop(self) -> None:
+        """Выполняет изменения из очереди пачками, по одной пачке за раз."""
+        while True:
+            jobs: List[Job] = [await self._queue.get()]
+            while not self._queue.empty():
+                jobs.append(self._queue.get_nowait())
+
+            try:
+                manager = await self.manager()
+                async with self._lock.exclusive():
+                    outcomes = await asyncio.to_thread(
+                        self._run,
+                        manager.store,
+                        self._output,
+                        [operation for operation, _, _ in jobs],
+                        all(batch for _, _, batch in jobs),
+                    )
+            except Exception as e:
+                outcomes = [(None, e)] * len(jobs)
+
+            for (_, future, _), (result, error) in zip(jobs, outcomes):
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+            for _ in jobs:
+                self._queue.task_done()
+
+    @staticmethod
+    def _run(
+        store: TransactionStore,
+        output: BufferedRenderer,
+        operations: List[Callable[[], Any]],
+        batch: bool,
+    ) -> List[Tuple[Any, Optional[Exception]]]:
+        """
+        Выполняет пачку изменений одним сохранением. Если одно из них
+        завершилось ошибкой, пачка откатывается, и изменения
+        выполняются по отдельности, чтобы ошибка досталась только ему.
+        Вывод выполняется только после сохранения: вывод откаченных
+        и повторенных попыток отбрасывается.
+        """
+
+        def attempt(operations: List[Callable[[], Any]]) -> List[Any]:
+            output.discard()
+            return [operation() for operation in operations]
+
+        if batch and len(operations) > 1:
+            try:
+                results = store.transact(lambda _: attempt(operations))
+                output.commit()
+                return [(result, None) for result in results]
+            except Exception:
+                output.discard()
+
+        outcomes: List[Tuple[Any, Optional[Exception]]] = []
+        for operation in operations:
+            try:
+                [result] = store.transact(lambda _: attempt([operation]))
+                output.commit()
+                outcomes.append((result, None))
+            except Exception as e:
+                output.discard()
+                outcomes.append((None, e))
+        return outcomes
+
+    async def close(self) -> None:
+        """Дожидается записи всех изменений и останавливает писателя."""
+        if self._writer is None:
+            return
+        await self._queue.join()
+        self._writer.cancel()
+        try:
+            await self._writer
+        except asyncio.CancelledError:
+            pass
+        self._writer = None
+        self._queue = None
+
+    async def check_transactions(
+        self,
+        transaction_id: int,
+        show: Optional[bool] = False,
+    ) -> bool:
+        """Асинхронный вариант `TransactionManager.check_transactions`."""
+        manager = await self.manager()
+        return await self.read(manager.check_transactions, transaction_id, show)
+
+    async def add_transaction(
+        self,
+        date: date,
+        category: str,
+        amount: float,
+        description: str,
+    ) -> Transaction:
+        """Асинхронный вариант `TransactionManager.add_transaction`."""
+        manager = await self.manager()
+        return await self.write(
+            lambda: manager.add_transaction(date, category, amount, description)
+        )
+
+    async def delete_transaction(self, transaction_id: int) -> Optional[Transaction]:
+        """Асинхронный вариант `TransactionManager.delete_transaction`."""
+        manager = await self.manager()
+        return await self.write(lambda: manager.delete_transaction(transaction_id))
+
+    async def edit_transaction(
+        self, transaction_id: int, **changes: Any
+    ) -> Optional[Transaction]:
+        """Асинхронный вариант `TransactionManager.edit_transaction`."""
+        manager = await self.manager()
+        return await self.write(
+            lambda: manager.edit_transaction(transaction_id, **changes)
+        )
+
+    async def search_transactions(self, **criteria: Any) -> List[Transaction]:
+        """Асинхронный вариант `TransactionManager.search_transactions`."""
+        manager = await self.manager()
+        return await self.read(manager.search_transactions, **criteria)
+
+    async def import_transactions(
+        self, path: str, batch_size: int = 10000
+    ) -> ImportReport:
+        """Асинхронный вариант `TransactionManager.import_transactions`."""
+        manager = await self.manager()
+        return await self.write(
+            lambda: manager.import_transactions(path, batch_size), batch=False
+        )
+
+    async def export_transactions(self, path: str) -> int:
+        """Асинхронный вариант `TransactionManager.export_transactions`."""
+        manager = await self.manager()
+        return await self.read(manager.export_transactions, path)
+
+    async def show_all(self) -> int:
+        """Асинхронный вариант `TransactionManager.show_all`."""
+        manager = await self.manager()
+        return await self.read(manager.show_all)
@@ -0,0 +1,160 @@
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+from ..utils.validators import (
+    validate_amount,
+    validate_category,
+    validate_date,
+    validate_description,
+)
+from .transaction import Transaction
+from .transaction_store import TransactionStore
+
+MAX_REPORTED_ERRORS = 100
+
+
+@dataclass
+class ImportReport:
+    """
+    Итоги пакетного импорта.
+
+    Attributes:
+        imported (int): Количество загруженных записей.
+        rejected (int): Количество отклоненных строк.
+        seconds (float): Время импорта в секундах.
+        errors (List[str]): Первые ошибки проверки строк.
+    """
+
+    imported: int = 0
+    rejected: int = 0
+    seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        """Скорость импорта в строках в секунду."""
+        if not self.seconds:
+            return 0.0
+        return (self.imported + self.rejected) / self.seconds
+
+    def __str__(self) -> str:
+        """
+        Возвращает строковое представление итогов импорта.
+
+        Returns:
+            str: Строковое представление итогов.
+        """
+        lines = [
+            f"Загружено записей: {self.imported}",
+            f"Отклонено строк: {self.rejected}",
+            f"Скорость: {self.rows_per_second:.0f} строк/с",
+        ]
+        lines.extend(self.errors)
+        return "\n".join(lines) + "\n"
+
+
+def _read_rows(path: str) -> Iterator[Tuple[int, Union[str, Dict[str, Any]]]]:
+    """
+    Потоково читает строки выписки в формате CSV или JSONL.
+
+    Строки JSONL возвращаются неразобранными, чтобы ошибка
+    в одной строке отклоняла только ее.
+
+    Args:
+        path (str): Путь к файлу выписки.
+
+    Returns:
+        Iterator[Tuple[int, str | dict]]: Номер строки и ее содержимое.
+    """
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        if path.endswith(".csv"):
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_number, line in enumerate(file, start=1):
+                if line.strip():
+                    yield line_number, line
+
+
+@dataclass
+class BulkImporter:
+    """
+    Потоковый пакетный импорт транзакций.
+
+    Читает выписку кусками по `batch_size` строк, проверяет каждую
+    строку правилами из `validators`, выдает id блоком на весь кусок
+    и сохраняет его одной записью в хранилище в блоке `transact()`:
+    если файл успел изменить другой процесс, кусок повторяется
+    на свежих данных. Выписка читается потоково, но загруженные
+    записи остаются в хранилище, а файл JSON перезаписывается
+    целиком на каждый кусок, поэтому для больших выписок лучше
+    подходят журнал, mmap или SQLite.
+
+    Attributes:
+        store (TransactionStore): Хранилище транзакций.
+        batch_size (int): Размер куска в строках.
+    """
+
+    store: TransactionStore
+    batch_size: int = 10000
+
+    def _validate(self, row: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Проверяет строку выписки и возвращает поля транзакции без id."""
+        if isinstance(row, str):
+            row = json.loads(row)
+            if not isinstance(row, dict):
+                raise ValueError("Строка JSONL должна быть объектом.")
+        return {
+            "date": validate_date(row.get("date")),
+            "category": validate_category(row.get("category")),
+            "amount": validate_amount(row.get("amount")),
+            "description": validate_description(row.get("description")),
+        }
+
+    def _add_chunk(self, store: TransactionStore, rows: List[Dict[str, Any]]) -> None:
+        """Выдает id проверенным строкам куска и сохраняет их одной записью."""
+        next_id = store.next_id()
+        store.add_many([
+            Transaction(id=next_id + offset, **fields) for offset, fields in enumerate(rows)
+        ])
+
+    def import_file(self, path: str) -> ImportReport:
+        """
+        Импортирует выписку в формате CSV (с заголовком
+        date,category,amount,description) или JSONL.
+
+        Args:
+            path (str): Путь к файлу выписки.
+
+        Returns:
+            ImportReport: Итоги импорта.
+        """
+        report = ImportReport()
+        start = time.perf_counter()
+        rows = _read_rows(path)
+
+        while True:
+            chunk = list(islice(rows, self.batch_size))
+            if not chunk:
+                break
+
+            valid = []
+            for line_number, row in chunk:
+                try:
+                    valid.append(self._validate(row))
+                except ValueError as e:
+                    report.rejected += 1
+                    if len(report.errors) < MAX_REPORTED_ERRORS:
+                        report.errors.append(f"Строка {line_number}: {e}")
+
+            if valid:
+                self.store.transact(lambda store: self._add_chunk(store, valid))
+            report.imported += len(valid)
+
+        report.seconds = time.perf_counter() - start
+        return report
@@ -0,0 +1,195 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy - необязательная зависимость
+    np = None
+
+from ..utils.money import from_minor_units
+from .transaction import Transaction
+
+HAS_NUMPY = np is not None
+INCOME = "доход"
+EXPENSE = "расход"
+# Количество записей, начиная с которого суммы по периодам
+# пересчитываются по колонкам, а не обходом записей.
+COLUMNAR_THRESHOLD = 10_000
+
+
+@dataclass
+class ColumnarLedger:
+    """
+    Колоночное представление транзакций на массивах NumPy.
+
+    Каждое поле хранится отдельным массивом, поэтому суммы считаются
+    векторными масками и редукциями без создания объекта на каждую
+    строку. Используется для полного пересчета сумм по периодам
+    (см. `PeriodTotals.rebuild`). Требует установленного numpy.
+
+    Attributes:
+        ids (np.ndarray): ID транзакций (int64).
+        dates (np.ndarray): Даты транзакций (datetime64[D]).
+        categories (np.ndarray): Коды категорий (int32).
+        amounts (np.ndarray): Суммы в копейках (int64); 0 для записей
+        без числовой суммы.
+        has_amount (np.ndarray): Есть ли у записи числовая сумма (bool).
+        Записи без суммы не учитываются в итогах.
+        category_names (List[str]): Таблица категорий по коду.
+    """
+
+    ids: "np.ndarray"
+    dates: "np.ndarray"
+    categories: "np.ndarray"
+    amounts: "np.ndarray"
+    has_amount: "np.ndarray"
+    category_names: List[str]
+
+    @classmethod
+    def from_records(cls, records: Iterable[Transaction]) -> "ColumnarLedger":
+        """
+        Строит колоночное представление из записей транзакций.
+
+        Args:
+            records (Iterable[Transaction]): Транзакции.
+
+        Raises:
+            ImportError: Вызывается, если numpy не установлен.
+
+        Returns:
+            ColumnarLedger: Колоночное представление.
+        """
+        if np is None:
+            raise ImportError("Для колоночного представления требуется numpy.")
+
+        category_codes: Dict[str, int] = {}
+        ids, dates, categories, amounts = [], [], [], []
+        has_amount: List[bool] = []
+
+        for record in records:
+            ids.append(record.id)
+            dates.append(str(record.date))
+            categories.append(
+                category_codes.setdefault(record.category, len(category_codes))
+            )
+            minor = record.minor
+            amounts.append(0 if minor is None else minor)
+            has_amount.append(minor is not None)
+
+        return cls(
+            ids=np.array(ids, dtype=np.int64),
+            dates=np.array(dates, dtype="datetime64[D]"),
+            categories=np.array(categories, dtype=np.int32),
+            amounts=np.array(amounts, dtype=np.int64),
+            has_amount=np.array(has_amount, dtype=bool),
+            category_names=list(category_codes),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _category_code(self, category: str) -> int:
+        """Возвращает код категории или -1, если такой категории нет."""
+        try:
+            return self.category_names.index(category)
+        except ValueError:
+            return -1
+
+    def total(self, category: str) -> float:
+        """
+        Возвращает сумму транзакций категории.
+
+        Args:
+            category (str): Категория транзакций (доход или расход).
+
+        Returns:
+            float: Сумма в рублях.
+        """
+        selected = (self.categories == self._category_code(category)) & self.has_amount
+        return from_minor_units(int(self.amounts[selected].sum()))
+
+    def balance(self) -> float:
+        """
+        Возвращает баланс: доходы минус расходы.
+
+        Returns:
+            float: Баланс в рублях.
+        """
+        income = (self.categories == self._category_code(INCOME)) & self.has_amount
+        expense = (self.categories == self._category_code(EXPENSE)) & self.has_amount
+        return from_minor_units(
+            int(self.amounts[income].sum()) - int(self.amounts[expense].sum())
+        )
+
+    def _period_keys(self, dates: "np.ndarray", unit: str) -> Tuple[List[str], "np.ndarray"]:
+        """
+        Возвращает ключи периодов дат в формате `period_key`
+        и номер ключа для каждой даты.
+        """
+        if unit == "month":
+            periods, inverse = np.unique(dates.astype("datetime64[M]"), return_inverse=True)
+            return [str(period) for period in periods], inverse
+        if unit == "year":
+            periods, inverse = np.unique(dates.astype("datetime64[Y]"), return_inverse=True)
+            return [str(period) for period in periods], inverse
+        if unit == "week":
+            # ISO-неделя и ее год определяются четвергом той же недели
+            # (1970-01-01 - четверг).
+            days = dates.astype(np.int64)
+            thursdays = days - (days + 3) % 7 + 3
+            years = thursdays.astype("datetime64[D]").astype("datetime64[Y]")
+            weeks = (thursdays - years.astype("datetime64[D]").astype(np.int64)) // 7 + 1
+            codes = (years.astype(np.int64) + 1970) * 100 + weeks
+            periods, inverse = np.unique(codes, return_inverse=True)
+            return [f"{code // 100:04d}-W{code % 100:02d}" for code in periods.tolist()], inverse
+        raise ValueError(f"Неизвестная единица периода: {unit}")
+
+    def period_rollups(self, unit: str = "month") -> Dict[str, Dict[str, int]]:
+        """
+        Считает суммы в копейках по периодам и категориям.
+        Периоды и категории с нулевой суммой пропускаются.
+
+        Args:
+            unit (str, optional): Единица периода: "week" (ISO-неделя),
+            "month" или "year". По умолчанию "month".
+
+        Raises:
+            ValueError: Вызывается, если единица периода неизвестна.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Суммы категорий по периодам
+            с ключами периодов, как у `period_key`.
+        """
+        keys, inverse = self._period_keys(self.dates[self.has_amount], unit)
+        # Суммы считаются в int64 (bincount с весами перешел бы во float64):
+        # строки сортируются по ячейке (период, категория), и каждая
+        # ячейка сворачивается одной редукцией.
+        cells = inverse * len(self.category_names) + self.categories[self.has_amount]
+        result: Dict[str, Dict[str, int]] = {}
+        if not len(cells):
+            return result
+        order = np.argsort(cells, kind="stable")
+        cells = cells[order]
+        starts = np.flatnonzero(np.concatenate(([True], cells[1:] != cells[:-1])))
+        sums = np.add.reduceat(self.amounts[self.has_amount][order], starts)
+        for cell, total in zip(cells[starts].tolist(), sums.tolist()):
+            if total:
+                period, code = divmod(cell, len(self.category_names))
+                result.setdefault(keys[period], {})[self.category_names[code]] = total
+        return result
+
+    def period_sums(self, unit: str = "month") -> Dict[str, Dict[str, float]]:
+        """
+        Считает суммы по периодам и категориям.
+
+        Args:
+            unit (str, optional): Единица периода: "week" (ISO-неделя),
+            "month" или "year". По умолчанию "month".
+
+        Returns:
+            Dict[str, Dict[str, float]]: Суммы категорий по периодам.
+        """
+        return {
+            period: {category: from_minor_units(total) for category, total in cell.items()}
+            for period, cell in self.period_rollups(unit).items()
+        }
@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+
+from ..utils.mmap_manager import MmapFileManager
+from .overlay_store import OverlayTransactionStore
+
+
+@dataclass
+class MmapTransactionStore(OverlayTransactionStore):
+    """
+    Хранилище транзакций поверх отображенного в память файла записей
+    фиксированной длины (см. `MmapFileManager`).
+
+    Запись по id читается из своего слота за O(1), а суммы
+    по категориям и фильтры поиска считаются прямо по буферу файла.
+
+    Attributes:
+        file_manager (MmapFileManager): Менеджер файла записей.
+    """
+
+    file_manager: MmapFileManager
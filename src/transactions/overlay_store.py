@@ -0,0 +1,199 @@
+from dataclasses import dataclass
+from heapq import merge
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..utils.file_manager import FileManager
+from ..utils.instrumentation import stats
+from ..utils.money import from_minor_units, minor_units, to_minor_units
+from .transaction import Transaction
+from .transaction_store import RECORD_MEMORY, TransactionStore, _amount_key, _predicate
+
+
+@dataclass
+class OverlayTransactionStore(TransactionStore):
+    """
+    Хранилище транзакций, читающее записи из менеджера хранения
+    по требованию.
+
+    Записи не загружаются в память: чтения по id, суммы по категориям
+    и поиск выполняет менеджер хранения (методы `open`, `count`,
+    `contains`, `get`, `last_id`, `iter_records`, `category_totals`
+    и `search`). Несохраненные изменения (внутри `batch()` или
+    в режиме `write_behind`) хранятся в небольшом наложении поверх
+    файла, поэтому чтения видят их, а откат блока не трогает файл.
+
+    Attributes:
+        file_manager (FileManager): Менеджер хранения с произвольным
+        доступом к записям.
+    """
+
+    file_manager: FileManager
+
+    def load(self) -> None:
+        """
+        Заново открывает файл и уведомляет подписчиков о загрузке;
+        сами записи остаются в файле.
+        """
+        self._overlay: Dict[int, Optional[Transaction]] = {}
+        file_lock = self.file_manager.file_lock
+        with stats.timer("store.load"), file_lock.shared():
+            self._version = file_lock.version()
+            self.file_manager.open()
+            self._fingerprint = self.file_manager.fingerprint()
+        for listener in self._listeners:
+            listener.rebuild(self)
+
+    def _index(self, record: Transaction) -> None:
+        """Добавляет запись в наложение несохраненных изменений."""
+        self._overlay[record.id] = record
+
+    def _index_many(self, records: List[Transaction]) -> None:
+        """Добавляет записи в наложение несохраненных изменений."""
+        for record in records:
+            self._overlay[record.id] = record
+
+    def _reindex(self, record: Transaction, updated: Transaction) -> None:
+        """Заменяет запись в наложении несохраненных изменений."""
+        self._overlay[updated.id] = updated
+
+    def _unindex(self, record: Transaction) -> None:
+        """Отмечает запись удаленной в наложении несохраненных изменений."""
+        self._overlay[record.id] = None
+
+    def _write(self, events: List[Dict[str, Any]]) -> None:
+        """Сохраняет события в файле и очищает наложение."""
+        super()._write(events)
+        self._overlay.clear()
+
+    def memory_usage(self) -> int:
+        """В памяти хранится только наложение несохраненных изменений."""
+        return len(self._overlay) * RECORD_MEMORY
+
+    def __len__(self) -> int:
+        count = self.file_manager.count()
+        for transaction_id, record in self._overlay.items():
+            count += (record is not None) - self.file_manager.contains(transaction_id)
+        return count
+
+    def __iter__(self) -> Iterator[Transaction]:
+        saved = map(Transaction.from_dict, self.file_manager.iter_records())
+        if not self._overlay:
+            return saved
+        overlay = dict(self._overlay)
+        return merge(
+            (record for record in saved if record.id not in overlay),
+            (overlay[i] for i in sorted(overlay) if overlay[i] is not None),
+            key=lambda record: record.id,
+        )
+
+    def __contains__(self, transaction_id: int) -> bool:
+        if transaction_id in self._overlay:
+            return self._overlay[transaction_id] is not None
+        return self.file_manager.contains(transaction_id)
+
+    def get(self, transaction_id: int) -> Optional[Transaction]:
+        if transaction_id in self._overlay:
+            return self._overlay[transaction_id]
+        record = self.file_manager.get(transaction_id)
+        return None if record is None else Transaction.from_dict(record)
+
+    def next_id(self) -> int:
+        last_id = self.file_manager.last_id() or 0
+        # Удаленные в блоке последние записи не занимают id, как
+        # и в резидентном хранилище.
+        while last_id and last_id not in self:
+            last_id -= 1
+        added = [i for i, record in self._overlay.items() if record is not None]
+        return max([last_id, *added]) + 1
+
+    def category_totals(self) -> Dict[str, float]:
+        totals = self.file_manager.category_totals()
+        if not self._overlay:
+            return totals
+        units = {category: to_minor_units(total) for category, total in totals.items()}
+        for transaction_id, record in self._overlay.items():
+            saved = self.file_manager.get(transaction_id)
+            if saved is not None:
+                category = saved["category"]
+                units[category] -= minor_units(saved["amount"]) or 0
+            if record is not None:
+                category = record.category
+                units[category] = units.get(category, 0) + (record.minor or 0)
+        return {category: from_minor_units(total) for category, total in units.items()}
+
+    def by_category(self, category: str) -> Iterator[Transaction]:
+        return self.find(category=category)
+
+    def date_range(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> Iterator[Transaction]:
+        records = self.find(date_from=start, date_to=end)
+        return iter(sorted(records, key=lambda record: (str(record.date), record.id)))
+
+    def amount_range(
+        self,
+        minimum: Optional[float] = None,
+        maximum: Optional[float] = None,
+    ) -> Iterator[Transaction]:
+        records = (
+            record
+            for record in self.find(amount_min=minimum, amount_max=maximum)
+            if _amount_key(record) is not None
+        )
+        return iter(sorted(records, key=lambda record: (_amount_key(record), record.id)))
+
+    def find(
+        self,
+        category: Optional[str] = None,
+        date: Optional[str] = None,
+        amount: Optional[float] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        amount_min: Optional[float] = None,
+        amount_max: Optional[float] = None,
+        description: Optional[str] = None,
+        text: Optional[str] = None,
+    ) -> Iterator[Transaction]:
+        if text is not None:
+            return self._find_text(
+                text,
+                category,
+                date,
+                amount,
+                date_from,
+                date_to,
+                amount_min,
+                amount_max,
+                description,
+            )
+        if self._overlay:
+            if date is not None:
+                date_from = date_to = date
+            if amount is not None:
+                amount_min = amount_max = amount
+            return filter(
+                _predicate(
+                    category,
+                    None if date_from is None else str(date_from),
+                    None if date_to is None else str(date_to),
+                    amount_min,
+                    amount_max,
+                    None if description is None else description.casefold(),
+                ),
+                self,
+            )
+        return map(
+            Transaction.from_dict,
+            self.file_manager.search(
+                category,
+                date,
+                amount,
+                date_from=date_from,
+                date_to=date_to,
+                amount_min=amount_min,
+                amount_max=amount_max,
+                description=description,
+            ),
+        )
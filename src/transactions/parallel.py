@@ -0,0 +1,376 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..utils.instrumentation import stats
+from ..utils.mmap_manager import (
+    FLAG_DELETED,
+    FLAG_NO_AMOUNT,
+    FLAGS_OFFSET,
+    GROWTH_SLOTS,
+    RECORD,
+    _category_sums,
+    _date_to_day,
+    _matching_slots,
+)
+from ..utils.money import from_minor_units, minor_range
+from ..utils.validators import CATEGORIES
+from .transaction import Transaction
+
+PARALLEL_THRESHOLD = 100_000
+# Частей на процесс: несколько частей выравнивают нагрузку, если
+# процессы работают с разной скоростью.
+CHUNKS_PER_WORKER = 4
+HEAP_GROWTH = 1 << 16
+CATEGORY_CODES = {category: code for code, category in enumerate(CATEGORIES)}
+
+Fields = Tuple[int, int, int, int, int, str]
+
+# Разделяемые буферы, подключенные в рабочем процессе, по имени.
+_attached: Dict[str, SharedMemory] = {}
+
+
+def _attach(*names: str) -> List[SharedMemory]:
+    """
+    Подключает разделяемые буферы в рабочем процессе. Буферы прошлых
+    публикаций отключаются, чтобы их память освободилась.
+    """
+    if set(names) != set(_attached):
+        for memory in _attached.values():
+            memory.close()
+        _attached.clear()
+        for name in names:
+            _attached[name] = SharedMemory(name=name)
+    return [_attached[name] for name in names]
+
+
+def _scan_chunk(
+    records_name: str,
+    heap_name: str,
+    start: int,
+    end: int,
+    filters: Tuple[Any, ...],
+) -> List[int]:
+    """Возвращает id подходящих записей части [start, end) в порядке строк."""
+    records, heap = _attach(records_name, heap_name)
+    category, day_from, day_to, amount_min, amount_max, needle = filters
+    offset = start * RECORD.size
+    # Одинаковые описания хранятся в куче один раз, поэтому подстрока
+    # проверяется один раз на каждое различное описание.
+    found: Dict[int, bool] = {}
+    ids = []
+    for slot in _matching_slots(
+        records.buf, offset, end - start, category, day_from, day_to, amount_min, amount_max
+    ):
+        transaction_id, _, position, _, length, _, _ = RECORD.unpack_from(
+            records.buf, offset + slot * RECORD.size
+        )
+        if needle is not None:
+            matches = found.get(position)
+            if matches is None:
+                description = str(heap.buf[position:position + length], "utf-8")
+                matches = found[position] = needle in description.casefold()
+            if not matches:
+                continue
+        ids.append(transaction_id)
+    return ids
+
+
+def _sum_chunk(
+    records_name: str,
+    heap_name: str,
+    start: int,
+    end: int,
+) -> Tuple[List[int], List[bool]]:
+    """Возвращает суммы в копейках по кодам категорий части [start, end)."""
+    records, _ = _attach(records_name, heap_name)
+    return _category_sums(records.buf, start * RECORD.size, end - start)
+
+
+@dataclass
+class ParallelScanner:
+    """
+    Параллельный просмотр записей хранилища транзакций пулом процессов.
+
+    Записи кодируются в разделяемую память в формате записей
+    фиксированной длины `MmapFileManager` (различные описания -
+    по одному разу в отдельном буфере), поэтому рабочие процессы
+    читают их напрямую, без сериализации. Записи делятся на части; каждая часть фильтруется
+    или суммируется в своем процессе (с numpy - векторно),
+    а частичные результаты сливаются в порядке частей. Суммы
+    складываются в копейках, поэтому результат не зависит от числа
+    процессов.
+
+    Подписывается на хранилище: добавление дописывает запись в буфер,
+    удаление ставит флаг-надгробие, а загрузка хранилища
+    или переполнение буфера приводят к его пересборке при следующем
+    запросе. Ниже порога `threshold` записей, а также для записей,
+    которые нельзя закодировать (например, категория не из
+    `CATEGORIES`), запросы возвращают None, и хранилище считает
+    последовательно.
+
+    Attributes:
+        store (TransactionStore): Хранилище транзакций.
+        workers (int): Число рабочих процессов. По умолчанию число ядер.
+        threshold (int): Наименьшее число записей для параллельного
+        просмотра. По умолчанию PARALLEL_THRESHOLD.
+    """
+
+    store: Any = field(repr=False)
+    workers: int = field(default_factory=lambda: os.cpu_count() or 1)
+    threshold: int = PARALLEL_THRESHOLD
+
+    def __post_init__(self):
+        """
+        Пост-инициализация объекта ParallelScanner.
+
+        Буферы и пул процессов создаются при первом запросе.
+        """
+        self._lock = threading.RLock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._records: Optional[SharedMemory] = None
+        self._heap: Optional[SharedMemory] = None
+        self._rows: Dict[int, int] = {}
+        self._days: Dict[Any, int] = {}
+        self._descriptions: Dict[str, Tuple[int, int]] = {}
+        self._count = 0
+        self._capacity = 0
+        self._heap_used = 0
+        self._stale = True
+        self._unsupported = False
+
+    def rebuild(self, store: Any) -> None:
+        """Отмечает буфер устаревшим: он пересоберется при запросе."""
+        with self._lock:
+            self._stale = True
+            self._unsupported = False
+
+    def on_add(self, record: Transaction) -> None:
+        """Дописывает запись в буфер."""
+        with self._lock:
+            if not self._stale and not self._append(record):
+                self._stale = True
+
+    def on_delete(self, record: Transaction) -> None:
+        """Ставит записи флаг-надгробие."""
+        with self._lock:
+            if self._stale:
+                return
+            row = self._rows.pop(record.id, None)
+            if row is None:
+                return
+            position = row * RECORD.size + FLAGS_OFFSET
+            self._records.buf[position] = self._records.buf[position] | FLAG_DELETED
+            # Буфер, в котором надгробий больше, чем записей, пересобирается.
+            if self._count > 2 * len(self._rows) + GROWTH_SLOTS:
+                self._stale = True
+
+    def on_commit(self, fingerprint: Optional[List[int]]) -> None:
+        """Буфер обновляется вместе с хранилищем."""
+
+    def _encode(self, record: Transaction) -> Optional[Fields]:
+        """
+        Кодирует поля записи для буфера; None, если запись нельзя
+        закодировать. Дни дат кэшируются, а сумма в копейках берется
+        из записи.
+        """
+        code = CATEGORY_CODES.get(record.category)
+        transaction_id = record.id
+        if code is None or type(transaction_id) is not int:
+            return None
+        day = self._days.get(record.date)
+        if day is None:
+            try:
+                day = self._days[record.date] = _date_to_day(record.date)
+            except ValueError:
+                return None
+        units = record.minor
+        if units is None:
+            return transaction_id, 0, day, code, FLAG_NO_AMOUNT, record.description
+        return transaction_id, units, day, code, 0, record.description
+
+    def _pack(self, row: int, fields: Fields, location: Tuple[int, int]) -> None:
+        """Записывает поля записи в строку буфера."""
+        transaction_id, units, day, code, flags, _ = fields
+        RECORD.pack_into(
+            self._records.buf,
+            row * RECORD.size,
+            transaction_id,
+            units,
+            location[0],
+            day,
+            location[1],
+            code,
+            flags,
+        )
+        self._rows[transaction_id] = row
+
+    def _append(self, record: Transaction) -> bool:
+        """Дописывает запись в буфер; возвращает False, если она не помещается."""
+        fields = self._encode(record)
+        if fields is None or self._count >= self._capacity:
+            return False
+        location = self._descriptions.get(fields[5])
+        if location is None:
+            description = fields[5].encode("utf-8")
+            if self._heap_used + len(description) > self._heap.size:
+                return False
+            end = self._heap_used + len(description)
+            self._heap.buf[self._heap_used:end] = description
+            location = self._descriptions[fields[5]] = (self._heap_used, len(description))
+            self._heap_used = end
+        self._pack(self._count, fields, location)
+        self._count += 1
+        return True
+
+    def _publish(self) -> bool:
+        """
+        Пересобирает разделяемые буферы, если они устарели.
+
+        Returns:
+            bool: False, если записи нельзя закодировать.
+        """
+        if not self._stale:
+            return True
+        if self._unsupported:
+            return False
+        with stats.timer("parallel.publish"):
+            rows = []
+            heap = bytearray()
+            descriptions: Dict[str, Tuple[int, int]] = {}
+            for record in self.store:
+                fields = self._encode(record)
+                if fields is None:
+                    self._unsupported = True
+                    return False
+                if fields[5] not in descriptions:
+                    description = fields[5].encode("utf-8")
+                    descriptions[fields[5]] = (len(heap), len(description))
+                    heap += description
+                rows.append(fields)
+
+            self._release()
+            self._capacity = len(rows) + max(len(rows) // 4, GROWTH_SLOTS)
+            self._records = SharedMemory(create=True, size=self._capacity * RECORD.size)
+            self._heap = SharedMemory(
+                create=True, size=len(heap) + max(len(heap) // 4, HEAP_GROWTH)
+            )
+            self._heap.buf[:len(heap)] = heap
+            self._heap_used = len(heap)
+            self._descriptions = descriptions
+            self._rows = {}
+            for row, fields in enumerate(rows):
+                self._pack(row, fields, descriptions[fields[5]])
+            self._count = len(rows)
+            self._stale = False
+        return True
+
+    def _ready(self) -> bool:
+        """Можно ли выполнить запрос параллельно."""
+        return len(self.store) >= self.threshold and self._publish()
+
+    def _map(self, function: Callable[..., Any], *args: Any) -> List[Any]:
+        """Выполняет функцию над частями буфера и возвращает результаты по порядку."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        size = max(1, -(-self._count // (self.workers * CHUNKS_PER_WORKER)))
+        names = (self._records.name, self._heap.name)
+        futures = [
+            self._executor.submit(function, *names, start, min(start + size, self._count), *args)
+            for start in range(0, self._count, size)
+        ]
+        stats.count("parallel.chunks", len(futures))
+        return [future.result() for future in futures]
+
+    def category_totals(self) -> Optional[Dict[str, float]]:
+        """
+        Считает суммы по категориям параллельно.
+
+        Returns:
+            Optional[Dict[str, float]]: Суммы по категориям или None,
+            если запрос нужно выполнить последовательно.
+        """
+        with stats.timer("parallel.totals"), self._lock:
+            if not self._ready():
+                return None
+            parts = self._map(_sum_chunk)
+
+        sums = [0] * len(CATEGORIES)
+        present = [False] * len(CATEGORIES)
+        for part_sums, part_present in parts:
+            for code in range(len(CATEGORIES)):
+                sums[code] += part_sums[code]
+                present[code] = present[code] or part_present[code]
+        return {
+            category: from_minor_units(sums[code])
+            for code, category in enumerate(CATEGORIES)
+            if present[code]
+        }
+
+    def find_ids(
+        self,
+        category: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        amount_min: Optional[float] = None,
+        amount_max: Optional[float] = None,
+        description: Optional[str] = None,
+    ) -> Optional[List[int]]:
+        """
+        Ищет записи параллельно по критериям `TransactionStore.find`.
+
+        Args:
+            category (str, optional): Категория транзакции.
+            date_from (str, optional): Начальная дата включительно.
+            date_to (str, optional): Конечная дата включительно.
+            amount_min (float, optional): Минимальная сумма включительно.
+            amount_max (float, optional): Максимальная сумма включительно.
+            description (str, optional): Подстрока описания
+            (без учета регистра).
+
+        Returns:
+            Optional[List[int]]: Id найденных записей по возрастанию
+            или None, если запрос нужно выполнить последовательно.
+        """
+        try:
+            filters = (
+                # Неизвестной категории соответствует код, которого нет в буфере.
+                None if category is None else CATEGORY_CODES.get(category, len(CATEGORIES)),
+                None if date_from is None else _date_to_day(date_from),
+                None if date_to is None else _date_to_day(date_to),
+                *minor_range(amount_min, amount_max),
+                None if description is None else description.casefold(),
+            )
+        except ValueError:
+            return None
+
+        with stats.timer("parallel.scan"), self._lock:
+            if not self._ready():
+                return None
+            parts = self._map(_scan_chunk, filters)
+            stats.count("store.rows_scanned", len(self._rows))
+        ids = [transaction_id for part in parts for transaction_id in part]
+        # Строки идут в порядке добавления, а не id: отредактированная
+        # запись переписывается в конец буфера.
+        ids.sort()
+        return ids
+
+    def _release(self) -> None:
+        """Освобождает разделяемые буферы."""
+        for memory in (self._records, self._heap):
+            if memory is not None:
+                memory.close()
+                memory.unlink()
+        self._records = self._heap = None
+        self._stale = True
+
+    def close(self) -> None:
+        """Останавливает пул процессов и освобождает разделяемые буферы."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+            self._release()
@@ -0,0 +1,27 @@
+from dataclasses import dataclass
+
+from ..utils.sharded_manager import ShardedFileManager
+from .overlay_store import OverlayTransactionStore
+from .transaction_store import RECORD_MEMORY
+
+
+@dataclass
+class ShardedTransactionStore(OverlayTransactionStore):
+    """
+    Хранилище транзакций поверх каталога сегментов по месяцам
+    (см. `ShardedFileManager`).
+
+    Записи читаются посегментно по требованию: изменение читает
+    и перезаписывает только сегменты своих месяцев, поиск с интервалом
+    дат - только сегменты месяцев интервала, а суммы по категориям
+    берутся из манифеста.
+
+    Attributes:
+        file_manager (ShardedFileManager): Менеджер каталога сегментов.
+    """
+
+    file_manager: ShardedFileManager
+
+    def memory_usage(self) -> int:
+        """В памяти хранятся наложение и кэш прочитанных сегментов."""
+        return super().memory_usage() + self.file_manager.cached_records() * RECORD_MEMORY
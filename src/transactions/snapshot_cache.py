@@ -0,0 +1,140 @@
+import marshal
+import os
+import sys
+import tempfile
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+from ..utils.file_manager import FileManager
+from ..utils.instrumentation import stats
+from .transaction import Transaction
+
+CACHE_FORMAT = 2
+# Меньшие журналы разбираются быстрее, чем читается кэш с диска.
+MIN_CACHE_RECORDS = 10000
+
+Index = List[Tuple[Any, int]]
+
+
+@dataclass
+class SnapshotCache:
+    """
+    Двоичный кэш загруженного журнала транзакций.
+
+    Хранит записи по столбцам и готовые отсортированные индексы по дате
+    и сумме в формате marshal рядом с файлом транзакций
+    (`<файл>.cache`). Загрузка кэша не требует разбора JSON
+    и сортировки индексов, а повторяющиеся строки восстанавливаются
+    уже интернированными. Кэш действителен, пока не изменились
+    отпечаток файла транзакций и его версия: после изменения файла
+    он пересоздается при первой загрузке. Формат marshal зависит
+    от версии Python, поэтому она входит в ключ кэша.
+
+    Attributes:
+        file_manager (FileManager): Менеджер хранения транзакций.
+    """
+
+    file_manager: FileManager
+
+    def __post_init__(self):
+        """
+        Пост-инициализация объекта SnapshotCache.
+
+        Определяет путь к файлу кэша.
+        """
+        self.filename = f"{self.file_manager.filename}.cache"
+
+    def key(self, version: int) -> Optional[list]:
+        """
+        Возвращает ключ состояния файла транзакций. Вызывается
+        под блокировкой файла, чтобы ключ соответствовал прочитанным
+        данным.
+
+        Args:
+            version (int): Версия файла транзакций.
+
+        Returns:
+            Optional[list]: Ключ или None, если файла нет.
+        """
+        fingerprint = self.file_manager.fingerprint()
+        if fingerprint is None:
+            return None
+        return [CACHE_FORMAT, *sys.version_info[:2], version, *fingerprint]
+
+    def load(
+        self, key: Optional[list]
+    ) -> Optional[Tuple[List[Transaction], Index, Index]]:
+        """
+        Загружает записи и индексы из кэша.
+
+        Args:
+            key (list, optional): Ключ текущего состояния файла.
+
+        Returns:
+            Optional[Tuple[List[Transaction], Index, Index]]: Записи
+            и индексы по дате и сумме или None, если кэша нет
+            или он устарел.
+        """
+        if key is None:
+            return None
+        try:
+            with stats.timer("cache.read"), open(self.filename, "rb") as file:
+                saved = marshal.loads(file.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if not isinstance(saved, dict) or saved.get("key") != key:
+            return None
+
+        with stats.timer("store.decode"):
+            records = list(map(Transaction, *saved["columns"]))
+        stats.count("cache.hits")
+        return records, saved["by_date"], saved["by_amount"]
+
+    def save(
+        self,
+        key: Optional[list],
+        records: List[Transaction],
+        by_date: Index,
+        by_amount: Index,
+    ) -> None:
+        """
+        Сохраняет записи и индексы в кэш, если журнал достаточно велик.
+        Записи с нестроковыми датами (не поддерживаются marshal)
+        не кэшируются.
+
+        Args:
+            key (list, optional): Ключ состояния файла на момент чтения.
+            records (List[Transaction]): Записи.
+            by_date (Index): Индекс по дате.
+            by_amount (Index): Индекс по сумме.
+        """
+        if key is None or len(records) < MIN_CACHE_RECORDS:
+            return
+        columns = (
+            [record.id for record in records],
+            [record.date for record in records],
+            [record.category for record in records],
+            [record.amount for record in records],
+            [record.description for record in records],
+        )
+        try:
+            data = marshal.dumps(
+                {"key": key, "columns": columns, "by_date": by_date, "by_amount": by_amount}
+            )
+        except ValueError:
+            return
+
+        # Кэш пишут без блокировки файла транзакций, поэтому временный
+        # файл уникален для каждого писателя.
+        directory = os.path.dirname(self.filename) or "."
+        descriptor, temp_filename = tempfile.mkstemp(
+            prefix=os.path.basename(self.filename), suffix=".tmp", dir=directory
+        )
+        try:
+            with stats.timer("cache.write"), os.fdopen(descriptor, "wb") as file:
+                file.write(data)
+            os.replace(temp_filename, self.filename)
+        except OSError:
+            with suppress(FileNotFoundError):
+                os.remove(temp_filename)
@@ -0,0 +1,193 @@
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..utils.sqlite_manager import SQLiteFileManager
+from .transaction import Transaction
+from .transaction_store import TransactionStore
+
+
+@dataclass
+class SQLiteTransactionStore(TransactionStore):
+    """
+    Хранилище транзакций поверх базы SQLite.
+
+    Записи не загружаются в память: поиск, выборки по индексам
+    и суммы по категориям выполняются запросами к базе.
+    Блок `batch()` выполняется одной транзакцией SQLite, которая
+    сразу захватывает блокировку записи базы (BEGIN IMMEDIATE),
+    поэтому конкурирующие процессы выполняют блоки по очереди.
+    Изменения применяются к базе сразу, поэтому отложенная запись
+    (`write_behind`) не поддерживается.
+
+    Attributes:
+        file_manager (SQLiteFileManager): Менеджер базы SQLite.
+    """
+
+    file_manager: SQLiteFileManager
+
+    def __post_init__(self):
+        """
+        Пост-инициализация объекта SQLiteTransactionStore.
+
+        Raises:
+            ValueError: Вызывается, если включена отложенная запись.
+        """
+        if self.write_behind:
+            raise ValueError("Хранилище SQLite не поддерживает отложенную запись.")
+        super().__post_init__()
+
+    def load(self) -> None:
+        """Уведомляет подписчиков о загрузке; сами записи остаются в базе."""
+        self._fingerprint = self.file_manager.fingerprint()
+        for listener in self._listeners:
+            listener.rebuild(self)
+
+    def _publish(self) -> None:
+        """
+        Передает подписчикам отпечаток, снятый при фиксации транзакции,
+        а не после нее, когда базу мог изменить другой процесс.
+        """
+        if self.file_manager.committed is not None:
+            self._fingerprint = self.file_manager.committed
+        super()._publish()
+
+    def refresh(self) -> bool:
+        """
+        Записи читаются из базы, поэтому всегда актуальны, а подписчики
+        (например, итоги баланса) перестраиваются, если базу изменил
+        другой процесс или менеджер: счетчик изменений базы
+        (PRAGMA user_version) отличается от загруженного.
+
+        Returns:
+            bool: True, если подписчики были перестроены.
+        """
+        if self._batch_depth or self._frozen:
+            return False
+        return self._reload_stale()
+
+    def stale(self) -> bool:
+        """Изменилась ли база после загрузки подписчиков."""
+        return self.file_manager.fingerprint() != self._fingerprint
+
+    def _reload_stale(self) -> bool:
+        """Перестраивает подписчиков, если база изменилась после загрузки."""
+        if not self.stale():
+            return False
+        self.load()
+        return True
+
+    def _index(self, record: Transaction) -> None:
+        """Индексы поддерживает сама база."""
+
+    def _index_many(self, records: List[Transaction]) -> None:
+        """Индексы поддерживает сама база."""
+
+    def _reindex(self, record: Transaction, updated: Transaction) -> None:
+        """Индексы поддерживает сама база."""
+
+    def _unindex(self, record: Transaction) -> None:
+        """Индексы поддерживает сама база."""
+
+    def _save(self, *events: Dict[str, Any]) -> None:
+        """
+        Сразу применяет события к базе, чтобы чтения внутри блока
+        `batch()` видели изменения; фиксацию выполняет транзакция блока.
+        """
+        self.file_manager.save_changes(list(events))
+
+    @contextmanager
+    def batch(self) -> Iterator["SQLiteTransactionStore"]:
+        with super().batch(), self.file_manager.transaction():
+            # Другой процесс мог зафиксировать изменения между
+            # refresh() и захватом блокировки записи базы.
+            if self._batch_depth == 1:
+                self._reload_stale()
+            yield self
+
+    def memory_usage(self) -> int:
+        """Записи хранятся в базе, а не в памяти."""
+        return 0
+
+    def __len__(self) -> int:
+        return self.file_manager.count()
+
+    def __iter__(self) -> Iterator[Transaction]:
+        return map(Transaction.from_dict, self.file_manager.iter_records())
+
+    def __contains__(self, transaction_id: int) -> bool:
+        return self.get(transaction_id) is not None
+
+    def get(self, transaction_id: int) -> Optional[Transaction]:
+        record = self.file_manager.get(transaction_id)
+        return None if record is None else Transaction.from_dict(record)
+
+    def next_id(self) -> int:
+        last_id = self.file_manager.last_id()
+        return 1 if last_id is None else last_id + 1
+
+    def category_totals(self) -> Dict[str, float]:
+        return self.file_manager.category_totals()
+
+    def by_category(self, category: str) -> Iterator[Transaction]:
+        return map(Transaction.from_dict, self.file_manager.search(category=category))
+
+    def date_range(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> Iterator[Transaction]:
+        return map(
+            Transaction.from_dict,
+            self.file_manager.search(date_from=start, date_to=end, order_by="date"),
+        )
+
+    def amount_range(
+        self,
+        minimum: Optional[float] = None,
+        maximum: Optional[float] = None,
+    ) -> Iterator[Transaction]:
+        return map(
+            Transaction.from_dict,
+            self.file_manager.search(
+                amount_min=minimum, amount_max=maximum, order_by="amount"
+            ),
+        )
+
+    def find(
+        self,
+        category: Optional[str] = None,
+        date: Optional[str] = None,
+        amount: Optional[float] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        amount_min: Optional[float] = None,
+        amount_max: Optional[float] = None,
+        description: Optional[str] = None,
+        text: Optional[str] = None,
+    ) -> Iterator[Transaction]:
+        if text is not None:
+            return self._find_text(
+                text,
+                category,
+                date,
+                amount,
+                date_from,
+                date_to,
+                amount_min,
+                amount_max,
+                description,
+            )
+        return map(
+            Transaction.from_dict,
+            self.file_manager.search(
+                category,
+                date,
+                amount,
+                date_from=date_from,
+                date_to=date_to,
+                amount_min=amount_min,
+                amount_max=amount_max,
+                description=description,
+            ),
+        )
@@ -0,0 +1,151 @@
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..utils.instrumentation import stats
+from .transaction import Transaction
+
+WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> Tuple[str, ...]:
+    """
+    Разбивает текст на слова для полнотекстового поиска.
+
+    Текст нормализуется (NFKC) и приводится к нижнему регистру
+    без учета регистра (casefold), а "ё" заменяется на "е", поэтому
+    "Ёлка", "ЕЛКА" и "елка" дают одно слово.
+
+    Args:
+        text (str): Текст.
+
+    Returns:
+        Tuple[str, ...]: Уникальные слова в порядке появления.
+    """
+    folded = unicodedata.normalize("NFKC", str(text)).casefold().replace("ё", "е")
+    return tuple(dict.fromkeys(WORD.findall(folded)))
+
+
+@dataclass
+class DescriptionIndex:
+    """
+    Инвертированный индекс слов описаний транзакций.
+
+    Для каждого слова хранит множество id записей, в описании которых
+    оно встречается, а словарь слов поддерживается отсортированным,
+    поэтому префикс запроса находит все продолжающие его слова
+    бинарным поиском. Подписывается на хранилище транзакций
+    и обновляется при добавлении, изменении и удалении записей.
+
+    Attributes:
+        postings (Dict[str, Dict[int, None]]): Id записей по словам.
+        vocabulary (List[str]): Отсортированный словарь слов.
+    """
+
+    postings: Dict[str, Dict[int, None]] = field(default_factory=dict)
+    vocabulary: List[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        """
+        Пост-инициализация объекта DescriptionIndex.
+
+        Создает кэш разбора описаний: одинаковые описания
+        разбиваются на слова один раз.
+        """
+        self._tokens: Dict[str, Tuple[str, ...]] = {}
+
+    def _words(self, description: str) -> Tuple[str, ...]:
+        """Возвращает слова описания, разбирая каждое описание один раз."""
+        words = self._tokens.get(description)
+        if words is None:
+            words = self._tokens[description] = tokenize(description)
+        return words
+
+    def rebuild(self, store: Any) -> None:
+        """
+        Строит индекс заново по всем записям хранилища.
+
+        Args:
+            store (TransactionStore): Хранилище транзакций.
+        """
+        with stats.timer("text_index.rebuild"):
+            self.postings = {}
+            self._tokens = {}
+            for record in store:
+                for word in self._words(record.description):
+                    ids = self.postings.get(word)
+                    if ids is None:
+                        ids = self.postings[word] = {}
+                    ids[record.id] = None
+            self.vocabulary = sorted(self.postings)
+
+    def on_add(self, record: Transaction) -> None:
+        """Добавляет слова описания записи."""
+        for word in self._words(record.description):
+            ids = self.postings.get(word)
+            if ids is None:
+                ids = self.postings[word] = {}
+                insort(self.vocabulary, word)
+            ids[record.id] = None
+
+    def on_delete(self, record: Transaction) -> None:
+        """Исключает слова описания записи."""
+        for word in self._words(record.description):
+            ids = self.postings.get(word)
+            if ids is None:
+                continue
+            ids.pop(record.id, None)
+            if not ids:
+                del self.postings[word]
+                del self.vocabulary[bisect_left(self.vocabulary, word)]
+
+    def on_commit(self, fingerprint: Optional[List[int]]) -> None:
+        """Индекс хранится только в памяти."""
+
+    def _prefix(self, prefix: str) -> Set[int]:
+        """Возвращает id записей со словами, начинающимися с префикса."""
+        ids: Set[int] = set()
+        position = bisect_left(self.vocabulary, prefix)
+        while position < len(self.vocabulary):
+            word = self.vocabulary[position]
+            if not word.startswith(prefix):
+                break
+            ids.update(self.postings[word])
+            position += 1
+        return ids
+
+    def search(self, query: str) -> Set[int]:
+        """
+        Находит записи, в описании которых есть все слова запроса.
+
+        Каждое слово запроса считается префиксом: "кеш" находит
+        "кешбек" и "Кешбека". Время поиска пропорционально числу
+        подходящих слов словаря и их записей, а не размеру журнала.
+
+        Args:
+            query (str): Слова запроса.
+
+        Returns:
+            Set[int]: Id найденных записей; пустое множество,
+            если в запросе нет слов.
+        """
+        words = tokenize(query)
+        if not words:
+            return set()
+        # Слова, уже покрытые более длинным словом запроса, не сужают
+        # результат: "кеш кешбек" ищет как "кешбек".
+        words = [
+            word
+            for word in words
+            if not any(other != word and other.startswith(word) for other in words)
+        ]
+        matches = sorted((self._prefix(word) for word in words), key=len)
+        result = matches[0]
+        for ids in matches[1:]:
+            result &= ids
+            if not result:
+                break
+        stats.count("text_index.rows_matched", len(result))
+        return result
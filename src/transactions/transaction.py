@@ -1,19 +1,37 @@
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from datetime import date
-from typing import Any, Dict
+from math import floor
+from typing import Any, Dict, Optional
 
+from ..utils.money import MINOR_UNITS, from_minor_units, minor_units
 
-@dataclass
+
+def _intern(value: Any) -> Any:
+    """Интернирует строку, остальные значения возвращает как есть."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(slots=True)
 class Transaction:
     """
     Класс для представления транзакции.
 
+    Хранится в слотах без словаря атрибутов, а повторяющиеся строки
+    (дата, категория, описание) интернируются, поэтому одинаковые
+    значения в разных транзакциях занимают память один раз.
+    Сумма при создании переводится в целые копейки (`minor`), по которым
+    считаются все итоги, а сама сумма округляется до копеек.
+    Хранилище не изменяет транзакции на месте, а заменяет их новыми.
+
     Attributes:
         id (int): Идентификатор транзакции.
         date (date): Дата транзакции.
         category (str): Категория транзакции (доход или расход).
         amount (float): Сумма транзакции.
         description (str): Описание транзакции.
+        minor (int, optional): Сумма в копейках или None, если сумма
+        не является числом.
     """
 
     id: int
@@ -21,6 +39,30 @@ class Transaction:
     category: str
     amount: float
     description: str
+    minor: Optional[int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """
+        Пост-инициализация объекта Transaction.
+
+        Интернирует строковые поля и нормализует сумму.
+        """
+        amount = self.amount
+        if type(amount) is int:
+            self.minor = amount * MINOR_UNITS
+        else:
+            # Конечные суммы, уже кратные копейке, переводятся без вызова
+            # функций (для NaN и бесконечности amount - amount не равно 0).
+            finite = type(amount) is float and amount - amount == 0
+            units = floor(amount * MINOR_UNITS + 0.5) if finite else None
+            if units is None or units / MINOR_UNITS != amount:
+                units = minor_units(amount)
+                if units is not None:
+                    self.amount = from_minor_units(units)
+            self.minor = units
+        self.date = _intern(self.date)
+        self.category = _intern(self.category)
+        self.description = _intern(self.description)
 
     def __str__(self) -> str:
         """
@@ -1,25 +1,60 @@
-from dataclasses import dataclass
-from typing import Optional
-
-from ..utils.file_manager import FileManager
+from dataclasses import dataclass, field
+from typing import Any, ContextManager, Iterator, List, Optional
+
+from ..utils.instrumentation import instrumented, stats
+from ..utils.renderers import ConsoleRenderer, Renderer
+from ..utils.storage import get_file_manager, open_store
+from ..utils.validators import validate_amount
+from .bulk_import import BulkImporter, ImportReport
 from .transaction import Transaction, date
+from .transaction_store import TransactionStore
 
 
 @dataclass
 class TransactionManager:
-    """Класс для работы с транзакциями"""
+    """Класс для работы с транзакциями
+
+    Методы возвращают результаты операций, а выводят их через
+    рендерер (см. `src.utils.renderers`).
+
+    Args:
+        filename (str): Имя файла, в котором хранятся транзакции.
+        store (TransactionStore, optional): Готовое хранилище транзакций.
+        По умолчанию создается по имени файла.
+        renderer (Renderer, optional): Вывод результатов. По умолчанию
+        вывод в консоль; `Renderer()` отключает вывод.
+    """
 
     filename: str
+    store: Optional[TransactionStore] = field(default=None, repr=False)
+    renderer: Renderer = field(default_factory=ConsoleRenderer, repr=False)
 
     def __post_init__(self):
         """
         Пост-инициализация объекта BalanceManager.
 
-        Создает экземпляр FileManager для работы с файлом транзакций.
+        Создает менеджер хранения для работы с файлом транзакций
+        и резидентное хранилище с индексами.
         """
 
-        self.file_manager = FileManager(self.filename)
+        if self.store is None:
+            self.store = open_store(get_file_manager(self.filename))
+        self.file_manager = self.store.file_manager
+
+    def batch(self) -> ContextManager[TransactionStore]:
+        """
+        Объединяет изменения в одну единицу работы:
+        `with manager.batch(): ...`.
+
+        Изменения внутри блока сохраняются в файл один раз при выходе
+        и полностью отменяются, если в блоке возникло исключение.
+
+        Returns:
+            ContextManager[TransactionStore]: Контекст единицы работы.
+        """
+        return self.store.batch()
 
+    @instrumented("transactions.check")
     def check_transactions(
         self,
         transaction_id: int,
@@ -27,6 +62,7 @@ class TransactionManager:
     ) -> bool:
         """
         Проверка наличия конкретной записи в файле по id.
+        Без вывода запись не читается, проверяется только ее наличие.
 
         Args:
             transaction_id (int): ID значение искомого объекта.
@@ -37,80 +73,81 @@ class TransactionManager:
             bool: Если в БД есть записть, то возвращает
             True, инача False.
         """
-        transactions = self.file_manager.read_from_file()
+        self.store.refresh()
+        if not show:
+            return transaction_id in self.store
+        transaction = self.store.get(transaction_id)
 
-        for transaction in transactions:
-            if transaction["id"] == transaction_id:
-                if show:
-                    print()
-                    print(Transaction.from_dict(transaction))
-                return True
-        return False
+        if transaction is None:
+            return False
+        self.renderer.transaction(transaction)
+        return True
 
+    @instrumented("transactions.add")
     def add_transaction(
         self,
         date: date,
         category: str,
         amount: float,
         description: str,
-    ) -> None:
+    ) -> Transaction:
         """
         Записывает в файл БД информацию о новой транзакции.
+        ID выдается под блокировкой файла, поэтому параллельные
+        процессы не получают одинаковых ID.
 
         Args:
             date (date): Дата транзакции.
             category (str): Категория транзакции (доход или расход).
-            amount (float): Сумма транзакции.
+            amount (float): Сумма транзакции: число, Decimal или строка.
+            Округляется до копеек.
             description (str): Описание транзакции.
+
+        Raises:
+            ValueError: Вызывается, если сумма не является числом.
+
+        Returns:
+            Transaction: Добавленная транзакция.
         """
 
-        transactions = self.file_manager.read_from_file()
-        new_id = transactions[-1]["id"] + 1 if transactions else 1
-        amount = round(float(amount), 2) if isinstance(amount, float) else ""
+        amount = validate_amount(amount)
 
-        new_transaction = Transaction(
-            id=new_id,
-            date=date,
-            category=category,
-            amount=amount,
-            description=description,
-        )
-        transactions.append(new_transaction.to_dict())
-        self.file_manager.write_to_file(transactions)
-        print()
-        print("Запись успешно добавлена.")
-        print()
+        def add(store: TransactionStore) -> Transaction:
+            transaction = Transaction(
+                id=store.next_id(),
+                date=date,
+                category=category,
+                amount=amount,
+                description=description,
+            )
+            store.add(transaction)
+            return transaction
 
+        transaction = self.store.transact(add)
+        self.renderer.added(transaction)
+        return transaction
+
+    @instrumented("transactions.delete")
     def delete_transaction(
         self,
         transaction_id: int,
-    ) -> None:
+    ) -> Optional[Transaction]:
         """
         Удаляет транзакцию по переданному номеру (ID).
 
         Args:
             transaction_id (int): ID транзакции которую необходимо удалить.
-        """
-
-        transactions = self.file_manager.read_from_file()
-        found = False
-
-        for transaction in transactions:
-            if transaction["id"] == transaction_id:
-                transactions.remove(transaction)
-                found = True
 
-        if not found:
-            print()
-            print(f"Запись с ID {transaction_id} не найдена.")
-            print()
-            return
+        Returns:
+            Optional[Transaction]: Удаленная транзакция или None,
+            если записи с таким ID нет.
+        """
 
-        self.file_manager.write_to_file(transactions)
-        print()
-        print(f"Запись с ID {transaction_id} успешно удалена.")
-        print()
+        transaction = self.store.transact(lambda store: store.delete(transaction_id))
+        self.renderer.deleted(transaction_id, transaction)
+        return transaction
 
+    @instrumented("transactions.edit")
     def edit_transaction(
         self,
         transaction_id: int,
@@ -118,7 +155,7 @@ class TransactionManager:
         category: str = None,
         amount: float = None,
         description: str = None,
-    ) -> None:
+    ) -> Optional[Transaction]:
         """
         Вносит изменения в соотвествии с переданными аргументами
         в ранее созданную транзакцию.
@@ -131,40 +168,59 @@ class TransactionManager:
             amount (float, optional): Сумма транзакции. По умолчанию None.
             description (str, optional): Описание транзакции.
             По умолчанию None.
+
+        Raises:
+            ValueError: Вызывается, если сумма не является числом.
+
+        Returns:
+            Optional[Transaction]: Измененная транзакция или None,
+            если записи с таким ID нет.
+        """
+        changes = {
+            field: value
+            for field, value in (
+                ("date", date),
+                ("category", category),
+                ("amount", amount),
+                ("description", description),
+            )
+            if value is not None
+        }
+        if "amount" in changes:
+            changes["amount"] = validate_amount(changes["amount"])
+        transaction = self.store.transact(
+            lambda store: store.update(transaction_id, **changes)
+        )
+        self.renderer.edited(transaction_id, transaction)
+        return transaction
+
+    def find_transactions(self, **criteria: Any) -> Iterator[Transaction]:
         """
-        data = self.file_manager.read_from_file()
-        found = False
-
-        for transaction in data:
-            if transaction["id"] == transaction_id:
-                found = True
-                if date is not None:
-                    transaction["date"] = date
-                if category is not None:
-                    transaction["category"] = category
-                if amount is not None:
-                    transaction["amount"] = amount
-                if description is not None:
-                    transaction["description"] = description
-
-                self.file_manager.write_to_file(data)
-                print()
-                print("Запись успешно отредактирована.")
-                print(Transaction.from_dict(transaction))
-                break
-
-        if not found:
-            print()
-            print(f"Запись с ID {transaction_id} не найдена.")
-            print()
-            return
+        Лениво ищет транзакции по критериям `search_transactions`
+        без вывода.
 
+        Args:
+            **criteria: Критерии поиска.
+
+        Returns:
+            Iterator[Transaction]: Найденные транзакции в порядке id.
+        """
+        self.store.refresh()
+        return self.store.find(**criteria)
+
+    @instrumented("transactions.search")
     def search_transactions(
         self,
         category: str = None,
         date: date = None,
         amount: float = None,
-    ):
+        date_from: date = None,
+        date_to: date = None,
+        amount_min: float = None,
+        amount_max: float = None,
+        description: str = None,
+        text: str = None,
+    ) -> List[Transaction]:
         """Поиск и вывод информации о транзакциях по заданным критериям.
         Исключает возможность поиска если не передано ни одного аргумента.
 
@@ -173,50 +229,99 @@ class TransactionManager:
             По умолчанию None.
             date (date, optional): Дата транзакции. По умолчанию None.
             amount (float, optional): Сумма транзакции. По умолчанию None.
+            date_from (date, optional): Начальная дата интервала
+            включительно. По умолчанию None.
+            date_to (date, optional): Конечная дата интервала
+            включительно. По умолчанию None.
+            amount_min (float, optional): Минимальная сумма включительно.
+            По умолчанию None.
+            amount_max (float, optional): Максимальная сумма включительно.
+            По умолчанию None.
+            description (str, optional): Подстрока описания без учета
+            регистра. По умолчанию None.
+            text (str, optional): Слова описания: находятся записи,
+            в описании которых есть слова, начинающиеся с каждого
+            из них (без учета регистра, "ё" равна "е"). Ищется
+            по индексу слов. По умолчанию None.
+
+        Returns:
+            List[Transaction]: Найденные транзакции; пустой список,
+            если критерии не указаны.
+        """
+        criteria = {
+            "category": category,
+            "date": date,
+            "amount": amount,
+            "date_from": date_from,
+            "date_to": date_to,
+            "amount_min": amount_min,
+            "amount_max": amount_max,
+            "description": description,
+            "text": text,
+        }
+
+        if all(value is None for value in criteria.values()):
+            self.renderer.no_criteria()
+            return []
+
+        transactions = list(self.find_transactions(**criteria))
+        self.renderer.search_results(transactions)
+        return transactions
+
+    @instrumented("transactions.import")
+    def import_transactions(self, path: str, batch_size: int = 10000) -> ImportReport:
         """
+        Пакетно импортирует транзакции из выписки CSV или JSONL.
 
-        if category is None and date is None and amount is None:
-            print()
-            print(
-                "Не указаны критерии поиска. ",
-                "Укажите хотя бы один критерий поиска.",
-            )
-            print()
-            return
-
-        transactions = self.file_manager.read_from_file()
-        filtered_transactions = []
-
-        for transaction in transactions:
-            if (
-                (category is None or transaction["category"] == category)
-                and (date is None or transaction["date"] == date)
-                and (amount is None or transaction["amount"] == amount)
-            ):
-                filtered_transactions.append(Transaction.from_dict(transaction))
-
-        if not filtered_transactions:
-            print()
-            print("По заданному критерию поиска результаты не обнаружены.")
-            print()
-
-        else:
-            print()
-            print("Результаты поиска:")
-            print()
-            for transaction in filtered_transactions:
-                print(transaction)
-
-    def show_all(self):
-        """Выводит все существующие транзакции."""
+        Args:
+            path (str): Путь к файлу выписки.
+            batch_size (int, optional): Количество строк, сохраняемых
+            одной записью. По умолчанию 10000.
 
+        Returns:
+            ImportReport: Итоги импорта.
+        """
+        report = BulkImporter(self.store, batch_size).import_file(path)
+        self.renderer.import_report(report)
+        return report
+
+    @instrumented("transactions.export")
+    def export_transactions(self, path: str) -> int:
+        """
+        Выгружает все транзакции в файл. Формат определяется
+        по расширению, как у файла транзакций (см. `get_file_manager`).
+
+        Args:
+            path (str): Путь к файлу выгрузки.
+
+        Returns:
+            int: Количество выгруженных записей.
+        """
+        self.store.refresh()
+        records = self.store.snapshot()
+        file_manager = get_file_manager(path)
         try:
-            transactions = self.file_manager.read_from_file()
-            results = []
-
-            for transaction in transactions:
-                results.append(Transaction.from_dict(transaction))
-            for result in results:
-                print(result)
-        except ValueError:
-            pass
+            file_manager.write_to_file(records)
+            wait_for_compaction = getattr(file_manager, "wait_for_compaction", None)
+            if wait_for_compaction is not None:
+                wait_for_compaction()
+        finally:
+            close = getattr(file_manager, "close", None)
+            if close is not None:
+                close()
+        self.renderer.exported(path, len(records))
+        return len(records)
+
+    @instrumented("transactions.show_all")
+    def show_all(self) -> int:
+        """
+        Выводит все существующие транзакции.
+
+        Returns:
+            int: Количество выведенных транзакций.
+        """
+
+        self.store.refresh()
+        count = self.renderer.transactions(self.store)
+        stats.count("store.rows_scanned", count)
+        return count
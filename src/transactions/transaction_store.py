@@ -0,0 +1,894 @@
+import heapq
+import os
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
+
+from ..utils.file_manager import FileManager
+from ..utils.instrumentation import stats
+from ..utils.journal_manager import EVENT_ADD, EVENT_DELETE, EVENT_EDIT
+from ..utils.locking import VersionConflictError
+from ..utils.money import from_minor_units, minor_range
+from .parallel import PARALLEL_THRESHOLD, ParallelScanner
+from .snapshot_cache import SnapshotCache
+from .text_index import DescriptionIndex
+from .transaction import Transaction
+
+T = TypeVar("T")
+DEFAULT_RETRIES = 100
+SORT_CHUNK = 8192
+# Примерный объем памяти одной загруженной записи вместе с индексами
+# (измерен tracemalloc на синтетическом журнале).
+RECORD_MEMORY = 350
+
+
+def _amount_key(record: Transaction) -> Optional[int]:
+    """Возвращает сумму в копейках или None, если сумма не числовая."""
+    return record.minor
+
+
+def _predicate(
+    category: Optional[str],
+    date_from: Optional[str],
+    date_to: Optional[str],
+    amount_min: Optional[float],
+    amount_max: Optional[float],
+    needle: Optional[str],
+    text_ids: Optional[Set[int]] = None,
+) -> Callable[[Transaction], bool]:
+    """
+    Создает фильтр записей по критериям поиска. Даты сравниваются
+    как строки, суммы - в копейках, описание - по подстроке `needle`
+    в нижнем регистре, а `text_ids` - id записей, найденных
+    полнотекстовым поиском.
+    """
+    amount_min, amount_max = minor_range(amount_min, amount_max)
+
+    def predicate(record: Transaction) -> bool:
+        record_date = str(record.date)
+        record_amount = _amount_key(record)
+        return (
+            (category is None or record.category == category)
+            and (date_from is None or record_date >= date_from)
+            and (date_to is None or record_date <= date_to)
+            and (
+                (amount_min is None and amount_max is None)
+                or record_amount is not None
+                and (amount_min is None or record_amount >= amount_min)
+                and (amount_max is None or record_amount <= amount_max)
+            )
+            and (needle is None or needle in record.description.casefold())
+            and (text_ids is None or record.id in text_ids)
+        )
+
+    return predicate
+
+
+def _bounds(
+    index: List[Tuple[Any, int]],
+    low: Any = None,
+    high: Any = None,
+) -> Tuple[int, int]:
+    """
+    Находит бинарным поиском границы интервала [low, high]
+    в отсортированном индексе пар (значение, id).
+    """
+    start = 0 if low is None else bisect_left(index, (low,))
+    end = len(index) if high is None else bisect_right(index, (high, float("inf")))
+    return start, end
+
+
+def _merge_sorted(index: List[Tuple[Any, int]], entries: List[Tuple[Any, int]]) -> list:
+    """
+    Вливает пары в отсортированный индекс: пары сортируются небольшими
+    частями, а части сливаются итератором `heapq.merge` на Python,
+    поэтому длинная сортировка не держит GIL целиком.
+    """
+    runs = [
+        sorted(entries[start:start + SORT_CHUNK])
+        for start in range(0, len(entries), SORT_CHUNK)
+    ]
+    return list(heapq.merge(index, *runs))
+
+
+@dataclass
+class TransactionStore:
+    """
+    Резидентное хранилище транзакций с индексами.
+
+    Загружает записи один раз и поддерживает индексы:
+    хеш-индекс по id, отсортированные индексы по дате и сумме
+    и корзины по категориям. Все изменения сразу сохраняются через менеджер
+    хранения, после чего передаются подписчикам (см. `subscribe`).
+    Внутри `batch()` изменения накапливаются и сохраняются один раз.
+    Загруженные записи и индексы больших журналов кэшируются
+    в двоичном виде (см. `SnapshotCache`), поэтому повторный запуск
+    без изменений файла не разбирает его заново.
+
+    При совместной работе нескольких процессов с одним файлом запись
+    выполняется под исключительной блокировкой и только если версия
+    файла не изменилась с момента загрузки (оптимистичная блокировка);
+    иначе хранилище перечитывается и вызывается VersionConflictError.
+    `transact()` повторяет операцию на свежих данных.
+
+    В режиме отложенной записи (`write_behind`) изменения, как
+    внутри `batch()`, сразу видны в хранилище, но сохраняются только
+    вызовом `flush()`, например, фоновой задачей. Режим рассчитан
+    на файл, который меняет один процесс: при конфликте версий
+    несохраненные изменения повторяются поверх перечитанного файла
+    (побеждает последняя запись).
+
+    Attributes:
+        file_manager (FileManager): Менеджер хранения транзакций.
+        streaming (bool): Загружать записи потоково, по одной,
+        и строить индексы слиянием небольших отсортированных частей.
+        Медленнее разбора и сортировки целиком, но не держит GIL
+        подолгу, поэтому не блокирует другие потоки. По умолчанию False.
+        write_behind (bool): Откладывать запись изменений до `flush()`.
+        По умолчанию False.
+    """
+
+    file_manager: FileManager
+    streaming: bool = False
+    write_behind: bool = False
+
+    def __post_init__(self):
+        """
+        Пост-инициализация объекта TransactionStore.
+
+        Загружает записи и строит индексы.
+        """
+        self._listeners: List[Any] = []
+        self._batch_depth = 0
+        self._version = 0
+        self._fingerprint: Optional[List[int]] = None
+        self._pending_events: List[Dict[str, Any]] = []
+        self._pending_commit = False
+        self._batch_mark = 0
+        self._frozen = 0
+        self._text_index: Optional[DescriptionIndex] = None
+        self._scanner: Optional[ParallelScanner] = None
+        self._cache = SnapshotCache(self.file_manager)
+        self.load()
+
+    def load(self) -> None:
+        """Загружает записи из хранилища и перестраивает индексы."""
+        self._by_id: Dict[int, Transaction] = {}
+        self._by_date: List[Tuple[str, int]] = []
+        self._by_amount: List[Tuple[int, int]] = []
+        self._by_category: Dict[str, Dict[int, None]] = defaultdict(dict)
+
+        file_lock = self.file_manager.file_lock
+        with stats.timer("store.load"):
+            with file_lock.shared():
+                self._version = file_lock.version()
+                self._fingerprint = self.file_manager.fingerprint()
+                cache_key = None if self.streaming else self._cache.key(self._version)
+                cached = self._cache.load(cache_key)
+                if cached is None:
+                    if self.streaming:
+                        records = self.file_manager.iter_records()
+                    else:
+                        records = self.file_manager.read_from_file()
+                    with stats.timer("store.decode"):
+                        records = [Transaction.from_dict(data) for data in records]
+
+            with stats.timer("store.index"):
+                if cached is None:
+                    self._index_many(records)
+                else:
+                    records, self._by_date, self._by_amount = cached
+                    for record in records:
+                        self._by_id[record.id] = record
+                        self._by_category[record.category][record.id] = None
+            stats.count("store.rows_loaded", len(records))
+            if cached is None:
+                self._cache.save(cache_key, records, self._by_date, self._by_amount)
+
+        for listener in self._listeners:
+            listener.rebuild(self)
+
+    def refresh(self) -> bool:
+        """
+        Перечитывает хранилище, если файл изменен другим процессом.
+        Пока есть несохраненные изменения, хранилище не перечитывается,
+        чтобы не потерять их; внутри `frozen()` - тоже.
+
+        Returns:
+            bool: True, если данные были перечитаны.
+        """
+        if self._frozen or not self.stale():
+            return False
+        self.load()
+        return True
+
+    def stale(self) -> bool:
+        """
+        Проверяет, не изменил ли файл другой процесс после загрузки,
+        не перечитывая хранилище. Пока есть несохраненные изменения,
+        хранилище не считается устаревшим (см. `refresh`).
+
+        Returns:
+            bool: True, если хранилище нужно перечитать.
+        """
+        if self._pending_events:
+            return False
+        return self.file_manager.file_lock.version() != self._version
+
+    @contextmanager
+    def frozen(self) -> Iterator["TransactionStore"]:
+        """
+        Закрепляет загруженное состояние: внутри блока `refresh()`
+        не перечитывает хранилище, поэтому одновременные чтения
+        из нескольких потоков работают с одним снимком записей.
+        Изменять хранилище внутри блока нельзя.
+
+        Returns:
+            Iterator[TransactionStore]: Это же хранилище.
+        """
+        self._frozen += 1
+        try:
+            yield self
+        finally:
+            self._frozen -= 1
+
+    @property
+    def fingerprint(self) -> Optional[List[int]]:
+        """
+        Отпечаток файла транзакций, соответствующий записям хранилища.
+        Снимается под блокировкой файла при загрузке и при каждой записи,
+        поэтому запись другого процесса не может попасть между ними.
+        """
+        return self._fingerprint
+
+    def subscribe(self, listener: Any) -> None:
+        """
+        Подписывает объект на изменения записей.
+
+        Подписчик должен реализовать методы `rebuild(records)`,
+        `on_add(record)`, `on_delete(record)` и `on_commit(fingerprint)`.
+        Редактирование передается как удаление старой версии записи
+        и добавление новой. `on_commit` получает отпечаток файла,
+        снятый под блокировкой сразу после записи (см. `fingerprint`).
+
+        Args:
+            listener (Any): Подписчик.
+        """
+        self._listeners.append(listener)
+        listener.rebuild(self)
+
+    def text_index(self) -> DescriptionIndex:
+        """
+        Возвращает индекс слов описаний. Индекс строится при первом
+        обращении и затем обновляется вместе с записями.
+
+        Returns:
+            DescriptionIndex: Индекс слов описаний.
+        """
+        if self._text_index is None:
+            self._text_index = DescriptionIndex()
+            self.subscribe(self._text_index)
+        return self._text_index
+
+    def enable_parallel(
+        self,
+        workers: Optional[int] = None,
+        threshold: int = PARALLEL_THRESHOLD,
+    ) -> ParallelScanner:
+        """
+        Включает параллельный просмотр: полный пересчет сумм
+        по категориям и поиск, которому индексы оставляют не меньше
+        `threshold` кандидатов, выполняются пулом процессов
+        (см. `ParallelScanner`).
+
+        Args:
+            workers (int, optional): Число рабочих процессов.
+            По умолчанию число ядер.
+            threshold (int, optional): Наименьшее число записей
+            для параллельного просмотра. По умолчанию PARALLEL_THRESHOLD.
+
+        Returns:
+            ParallelScanner: Параллельный просмотр.
+        """
+        self.disable_parallel()
+        self._scanner = ParallelScanner(self, workers or os.cpu_count() or 1, threshold)
+        self.subscribe(self._scanner)
+        return self._scanner
+
+    def disable_parallel(self) -> None:
+        """Выключает параллельный просмотр и останавливает пул процессов."""
+        if self._scanner is None:
+            return
+        self._listeners.remove(self._scanner)
+        self._scanner.close()
+        self._scanner = None
+
+    def _find_text(
+        self,
+        text: str,
+        category: Optional[str] = None,
+        date: Optional[str] = None,
+        amount: Optional[float] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        amount_min: Optional[float] = None,
+        amount_max: Optional[float] = None,
+        description: Optional[str] = None,
+    ) -> Iterator[Transaction]:
+        """
+        Ищет записи среди найденных по индексу слов описаний,
+        проверяя остальные критерии только на них. Используется
+        хранилищами без резидентных индексов.
+        """
+        if date is not None:
+            date_from = date_to = date
+        if amount is not None:
+            amount_min = amount_max = amount
+        matches = _predicate(
+            category,
+            None if date_from is None else str(date_from),
+            None if date_to is None else str(date_to),
+            amount_min,
+            amount_max,
+            None if description is None else description.casefold(),
+        )
+        candidates = (self.get(i) for i in sorted(self.text_index().search(text)))
+        return filter(matches, candidates)
+
+    def _notify(
+        self,
+        removed: Iterable[Transaction] = (),
+        added: Iterable[Transaction] = (),
+    ) -> None:
+        """
+        Передает подписчикам изменения. Внутри блока `batch()`
+        `on_commit` откладывается до сохранения блока.
+        """
+        with stats.timer("store.notify"):
+            for listener in self._listeners:
+                for record in removed:
+                    listener.on_delete(record)
+                for record in added:
+                    listener.on_add(record)
+            if self._batch_depth or self.write_behind:
+                self._pending_commit = True
+            else:
+                self._publish()
+
+    def _publish(self) -> None:
+        """Сообщает подписчикам о сохранении изменений."""
+        for listener in self._listeners:
+            listener.on_commit(self._fingerprint)
+
+    def _index(self, record: Transaction) -> None:
+        """Добавляет запись во все индексы."""
+        self._by_id[record.id] = record
+        insort(self._by_date, (str(record.date), record.id))
+        amount = _amount_key(record)
+        if amount is not None:
+            insort(self._by_amount, (amount, record.id))
+        self._by_category[record.category][record.id] = None
+
+    def _index_many(self, records: List[Transaction]) -> None:
+        """
+        Добавляет пачку записей во все индексы.
+        Отсортированные индексы досортировываются один раз на всю пачку.
+        """
+        dates = []
+        amounts = []
+        for record in records:
+            self._by_id[record.id] = record
+            self._by_category[record.category][record.id] = None
+            dates.append((str(record.date), record.id))
+            amount = _amount_key(record)
+            if amount is not None:
+                amounts.append((amount, record.id))
+
+        if self.streaming:
+            self._by_date = _merge_sorted(self._by_date, dates)
+            self._by_amount = _merge_sorted(self._by_amount, amounts)
+        else:
+            self._by_date.extend(dates)
+            self._by_date.sort()
+            self._by_amount.extend(amounts)
+            self._by_amount.sort()
+
+    def _reindex(self, record: Transaction, updated: Transaction) -> None:
+        """
+        Заменяет запись в индексах измененной версией. Запись остается
+        на своем месте в порядке добавления, от которого зависят
+        `next_id()` и порядок записей в файле.
+        """
+        self._by_id[updated.id] = updated
+        del self._by_date[bisect_left(self._by_date, (str(record.date), record.id))]
+        insort(self._by_date, (str(updated.date), updated.id))
+        amount = _amount_key(record)
+        if amount is not None:
+            del self._by_amount[bisect_left(self._by_amount, (amount, record.id))]
+        amount = _amount_key(updated)
+        if amount is not None:
+            insort(self._by_amount, (amount, updated.id))
+        if updated.category != record.category:
+            del self._by_category[record.category][record.id]
+            self._by_category[updated.category][updated.id] = None
+
+    def _unindex(self, record: Transaction) -> None:
+        """Удаляет запись из всех индексов."""
+        del self._by_id[record.id]
+        del self._by_date[bisect_left(self._by_date, (str(record.date), record.id))]
+        amount = _amount_key(record)
+        if amount is not None:
+            del self._by_amount[bisect_left(self._by_amount, (amount, record.id))]
+        del self._by_category[record.category][record.id]
+
+    def _save(self, *events: Dict[str, Any]) -> None:
+        """Сохраняет события изменения через менеджер хранения."""
+        if self._batch_depth or self.write_behind:
+            self._pending_events.extend(events)
+            return
+        try:
+            self._write(list(events))
+        except BaseException:
+            self.load()
+            raise
+
+    def _write(self, events: List[Dict[str, Any]]) -> None:
+        """
+        Сохраняет события, если файл не изменился с момента загрузки.
+
+        Raises:
+            VersionConflictError: Вызывается, если файл изменен
+            другим процессом.
+        """
+        file_lock = self.file_manager.file_lock
+        with stats.timer("store.write"), file_lock.exclusive():
+            if file_lock.version() != self._version:
+                raise VersionConflictError(
+                    f"Файл {self.file_manager.filename} изменен другим процессом."
+                )
+            self.file_manager.save_changes(events, self.snapshot)
+            self._version = file_lock.version()
+            self._fingerprint = self.file_manager.fingerprint()
+
+    @contextmanager
+    def batch(self) -> Iterator["TransactionStore"]:
+        """
+        Объединяет изменения в одну единицу работы.
+
+        Внутри блока изменения сразу видны в хранилище и подписчикам,
+        но в менеджер хранения записываются одним вызовом при выходе
+        из блока, после чего подписчики получают один `on_commit`.
+        При исключении
+        все изменения блока отменяются. Вложенные блоки входят
+        во внешний и сохраняются вместе с ним. Перед началом внешнего
+        блока хранилище обновляется, если файл изменен другим процессом.
+        В режиме `write_behind` изменения блока остаются несохраненными
+        до `flush()`.
+
+        Returns:
+            Iterator[TransactionStore]: Это же хранилище.
+        """
+        if not self._batch_depth:
+            self.refresh()
+            self._batch_mark = len(self._pending_events)
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._rollback()
+            raise
+        self._batch_depth -= 1
+        if not self._batch_depth and not self.write_behind:
+            self._commit()
+
+    def _commit(self) -> None:
+        """Сохраняет накопленные в блоке изменения."""
+        events, self._pending_events = self._pending_events, []
+        changed, self._pending_commit = self._pending_commit, False
+        if events:
+            try:
+                self._write(events)
+            except BaseException:
+                self.load()
+                raise
+        if changed:
+            self._publish()
+
+    def transact(
+        self,
+        operation: Callable[["TransactionStore"], T],
+        retries: int = DEFAULT_RETRIES,
+    ) -> T:
+        """
+        Выполняет операцию в блоке `batch()` и повторяет ее на свежих
+        данных, если файл успел изменить другой процесс.
+
+        Args:
+            operation (Callable): Функция, получающая хранилище.
+            Должна читать нужные данные (например, `next_id()`)
+            внутри себя, так как при повторе вызывается заново.
+            retries (int, optional): Максимальное число попыток.
+            По умолчанию 100.
+
+        Raises:
+            VersionConflictError: Вызывается, если все попытки
+            завершились конфликтом.
+
+        Returns:
+            T: Результат операции.
+        """
+        for attempt in range(1, retries + 1):
+            try:
+                with self.batch():
+                    return operation(self)
+            except VersionConflictError:
+                if attempt == retries:
+                    raise
+
+    def _rollback(self) -> None:
+        """
+        Отменяет изменения блока, перечитывая сохраненное состояние.
+        Несохраненные изменения до начала блока (`write_behind`)
+        применяются заново.
+        """
+        kept = self._pending_events[:self._batch_mark]
+        self._pending_events = []
+        self._pending_commit = False
+        self.load()
+        self._replay(kept)
+
+    def _replay(self, events: List[Dict[str, Any]]) -> None:
+        """Заново применяет события изменения к хранилищу."""
+        for event in events:
+            if event["op"] == EVENT_DELETE:
+                self.delete(event["id"])
+                continue
+            record = Transaction.from_dict(event["record"])
+            if self.get(record.id) is None:
+                self.add(record)
+            else:
+                self.update(
+                    record.id,
+                    **{key: value for key, value in event["record"].items() if key != "id"},
+                )
+
+    @property
+    def dirty(self) -> bool:
+        """Есть ли изменения, ожидающие `flush()`."""
+        return bool(self._pending_events or self._pending_commit)
+
+    def flush(self, retries: int = DEFAULT_RETRIES) -> bool:
+        """
+        Сохраняет изменения, отложенные режимом `write_behind`.
+        Внутри блока `batch()` ничего не делает.
+
+        Если файл изменил другой процесс, изменения повторяются
+        поверх перечитанного файла. Если сохранить их не удалось,
+        они остаются несохраненными до следующего вызова.
+
+        Args:
+            retries (int, optional): Максимальное число попыток.
+            По умолчанию 100.
+
+        Raises:
+            VersionConflictError: Вызывается, если все попытки
+            завершились конфликтом.
+
+        Returns:
+            bool: True, если изменения были сохранены.
+        """
+        if self._batch_depth or not self.dirty:
+            return False
+        for attempt in range(1, retries + 1):
+            events = list(self._pending_events)
+            try:
+                self._commit()
+                return True
+            except BaseException as e:
+                self._replay(events)
+                if not isinstance(e, VersionConflictError) or attempt == retries:
+                    raise
+        return False
+
+    def memory_usage(self) -> int:
+        """
+        Оценивает объем памяти загруженных записей.
+
+        Returns:
+            int: Примерный объем в байтах.
+        """
+        return len(self._by_id) * RECORD_MEMORY
+
+    def snapshot(self) -> List[dict]:
+        """
+        Возвращает все записи в виде словарей для сохранения в файл.
+
+        Returns:
+            List[dict]: Список записей.
+        """
+        return [record.to_dict() for record in self]
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Transaction]:
+        return iter(self._by_id.values())
+
+    def __contains__(self, transaction_id: int) -> bool:
+        return transaction_id in self._by_id
+
+    def records(self) -> List[Transaction]:
+        """
+        Возвращает все записи в порядке добавления.
+
+        Returns:
+            List[Transaction]: Список записей.
+        """
+        return list(self)
+
+    def get(self, transaction_id: int) -> Optional[Transaction]:
+        """
+        Возвращает запись по id за O(1).
+
+        Args:
+            transaction_id (int): ID транзакции.
+
+        Returns:
+            Optional[Transaction]: Запись или None, если ее нет.
+        """
+        return self._by_id.get(transaction_id)
+
+    def next_id(self) -> int:
+        """
+        Возвращает id для новой записи: id последней записи + 1.
+
+        Returns:
+            int: Новый id.
+        """
+        if not self._by_id:
+            return 1
+        return next(reversed(self._by_id)) + 1
+
+    def add(self, record: Transaction) -> None:
+        """
+        Добавляет запись и сохраняет изменение.
+
+        Args:
+            record (Transaction): Новая запись.
+        """
+        self._index(record)
+        self._save({"op": EVENT_ADD, "record": record.to_dict()})
+        self._notify(added=[record])
+
+    def add_many(self, records: List[Transaction]) -> None:
+        """
+        Добавляет пачку записей и сохраняет ее одной записью в хранилище.
+
+        Args:
+            records (List[Transaction]): Новые записи.
+        """
+        if not records:
+            return
+        self._index_many(records)
+        self._save(
+            *({"op": EVENT_ADD, "record": record.to_dict()} for record in records)
+        )
+        self._notify(added=records)
+
+    def update(self, transaction_id: int, **changes: Any) -> Optional[Transaction]:
+        """
+        Изменяет поля записи и сохраняет изменение.
+
+        Args:
+            transaction_id (int): ID транзакции.
+            **changes: Новые значения полей.
+
+        Returns:
+            Optional[Transaction]: Обновленная запись или None, если ее нет.
+        """
+        record = self.get(transaction_id)
+        if record is None:
+            return None
+
+        updated = replace(record, **changes)
+        self._reindex(record, updated)
+        self._save({"op": EVENT_EDIT, "record": updated.to_dict()})
+        self._notify(removed=[record], added=[updated])
+        return updated
+
+    def delete(self, transaction_id: int) -> Optional[Transaction]:
+        """
+        Удаляет запись и сохраняет изменение.
+
+        Args:
+            transaction_id (int): ID транзакции.
+
+        Returns:
+            Optional[Transaction]: Удаленная запись или None, если ее нет.
+        """
+        record = self.get(transaction_id)
+        if record is None:
+            return None
+
+        self._unindex(record)
+        self._save({"op": EVENT_DELETE, "id": transaction_id})
+        self._notify(removed=[record])
+        return record
+
+    def category_totals(self) -> Dict[str, float]:
+        """
+        Полностью пересчитывает суммы по категориям в целых копейках
+        (при включенном параллельном просмотре - пулом процессов).
+
+        Returns:
+            Dict[str, float]: Суммы по категориям.
+        """
+        if self._scanner is not None:
+            totals = self._scanner.category_totals()
+            if totals is not None:
+                return totals
+        by_id = self._by_id
+        return {
+            category: from_minor_units(sum(by_id[i].minor or 0 for i in ids))
+            for category, ids in self._by_category.items()
+            if ids
+        }
+
+    def by_category(self, category: str) -> Iterator[Transaction]:
+        """
+        Возвращает записи выбранной категории.
+
+        Args:
+            category (str): Категория транзакций (доход или расход).
+
+        Returns:
+            Iterator[Transaction]: Записи категории.
+        """
+        for transaction_id in self._by_category.get(category, {}):
+            yield self._by_id[transaction_id]
+
+    def date_range(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> Iterator[Transaction]:
+        """
+        Возвращает записи с датой в интервале [start, end] за O(log N + k).
+
+        Args:
+            start (str, optional): Начальная дата (гггг-мм-дд).
+            По умолчанию без ограничения.
+            end (str, optional): Конечная дата (гггг-мм-дд).
+            По умолчанию без ограничения.
+
+        Returns:
+            Iterator[Transaction]: Записи в порядке возрастания даты.
+        """
+        low, high = _bounds(
+            self._by_date,
+            None if start is None else str(start),
+            None if end is None else str(end),
+        )
+        for position in range(low, high):
+            yield self._by_id[self._by_date[position][1]]
+
+    def amount_range(
+        self,
+        minimum: Optional[float] = None,
+        maximum: Optional[float] = None,
+    ) -> Iterator[Transaction]:
+        """
+        Возвращает записи с суммой в интервале [minimum, maximum]
+        за O(log N + k).
+
+        Args:
+            minimum (float, optional): Минимальная сумма.
+            По умолчанию без ограничения.
+            maximum (float, optional): Максимальная сумма.
+            По умолчанию без ограничения.
+
+        Returns:
+            Iterator[Transaction]: Записи в порядке возрастания суммы.
+        """
+        low, high = _bounds(self._by_amount, *minor_range(minimum, maximum))
+        for position in range(low, high):
+            yield self._by_id[self._by_amount[position][1]]
+
+    def find(
+        self,
+        category: Optional[str] = None,
+        date: Optional[str] = None,
+        amount: Optional[float] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        amount_min: Optional[float] = None,
+        amount_max: Optional[float] = None,
+        description: Optional[str] = None,
+        text: Optional[str] = None,
+    ) -> Iterator[Transaction]:
+        """
+        Ищет записи, удовлетворяющие всем переданным критериям.
+
+        Для каждого индексного критерия (категория, интервал дат,
+        интервал сумм, слова описания) оценивается число кандидатов,
+        и перебираются кандидаты самого узкого индекса. Остальные
+        критерии проверяются только на них, поэтому стоимость запроса
+        растет с числом подходящих записей, а не с размером журнала.
+        Без индексных критериев записи выдаются лениво, по мере просмотра.
+        При включенном параллельном просмотре (`enable_parallel`) большие
+        наборы кандидатов проверяются пулом процессов.
+
+        Args:
+            category (str, optional): Категория транзакции.
+            date (str, optional): Точная дата.
+            amount (float, optional): Точная сумма.
+            date_from (str, optional): Начальная дата включительно.
+            date_to (str, optional): Конечная дата включительно.
+            amount_min (float, optional): Минимальная сумма включительно.
+            amount_max (float, optional): Максимальная сумма включительно.
+            description (str, optional): Подстрока описания
+            (без учета регистра).
+            text (str, optional): Слова описания для полнотекстового
+            поиска по индексу (см. `DescriptionIndex.search`).
+
+        Returns:
+            Iterator[Transaction]: Найденные записи в порядке id.
+        """
+        if date is not None:
+            date_from = date_to = date
+        if amount is not None:
+            amount_min = amount_max = amount
+        date_from = None if date_from is None else str(date_from)
+        date_to = None if date_to is None else str(date_to)
+        needle = None if description is None else description.casefold()
+
+        plans = [(len(self._by_id), None)]
+        if category is not None:
+            bucket = self._by_category.get(category, {})
+            plans.append((len(bucket), lambda: iter(bucket)))
+        if date_from is not None or date_to is not None:
+            low, high = _bounds(self._by_date, date_from, date_to)
+            plans.append(
+                (high - low, lambda: (self._by_date[i][1] for i in range(low, high)))
+            )
+        if amount_min is not None or amount_max is not None:
+            a_low, a_high = _bounds(
+                self._by_amount, *minor_range(amount_min, amount_max)
+            )
+            plans.append(
+                (
+                    a_high - a_low,
+                    lambda: (self._by_amount[i][1] for i in range(a_low, a_high)),
+                )
+            )
+        text_ids = None if text is None else self.text_index().search(text)
+        if text_ids is not None:
+            plans.append((len(text_ids), lambda: iter(text_ids)))
+        candidates_count, candidate_ids = min(plans, key=lambda plan: plan[0])
+        if (
+            self._scanner is not None
+            and text_ids is None
+            and candidates_count >= self._scanner.threshold
+        ):
+            ids = self._scanner.find_ids(
+                category, date_from, date_to, amount_min, amount_max, description
+            )
+            if ids is not None:
+                stats.count("store.rows_matched", len(ids))
+                return iter([self._by_id[i] for i in ids])
+
+        matches = stats.counted(
+            _predicate(
+                category, date_from, date_to, amount_min, amount_max, needle, text_ids
+            ),
+            "store.rows_scanned",
+            "store.rows_matched",
+        )
+        if candidate_ids is None:
+            return filter(matches, self)
+        candidates = (self._by_id[i] for i in candidate_ids())
+        return iter(sorted(filter(matches, candidates), key=lambda record: record.id))
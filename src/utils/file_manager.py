@@ -1,6 +1,135 @@
 import json
-from dataclasses import dataclass
-from typing import Any, List
+import os
+import re
+import threading
+from contextlib import suppress
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, TextIO
+
+from .instrumentation import stats
+from .locking import FileLock
+
+CHUNK_SIZE = 1 << 16
+JSONL_EXTENSION = ".jsonl"
+
+
+SEPARATORS = re.compile(r"[\s,]*")
+COMPACT_SEPARATORS = (",", ":")
+
+
+def _fsync_directory(directory: str) -> None:
+    """Сбрасывает на диск запись каталога (результат переименования)."""
+    if os.name != "posix":
+        return
+    descriptor = os.open(directory or ".", os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def atomic_write(
+    filename: str,
+    write: Callable[[IO], None],
+    sync: bool = True,
+    binary: bool = False,
+) -> None:
+    """
+    Атомарно заменяет содержимое файла.
+
+    Данные пишутся во временный файл рядом с исходным, который затем
+    переименовывается поверх него. При сбое во время записи на диске
+    остается прежняя полная версия файла, а не обрезанная. Имя
+    временного файла содержит процесс и поток, поэтому одновременные
+    записи без блокировки (например, сохраненных рядом итогов)
+    не пишут в один временный файл и не удаляют чужой.
+
+    Args:
+        filename (str): Путь к файлу.
+        write (Callable): Функция, записывающая данные в открытый файл.
+        sync (bool, optional): Сбросить данные на диск (fsync)
+        до переименования. По умолчанию True.
+        binary (bool, optional): Открыть файл в двоичном режиме.
+        По умолчанию False.
+    """
+    temp_filename = f"{filename}.{os.getpid()}-{threading.get_ident()}.tmp"
+    try:
+        if binary:
+            file = open(temp_filename, "wb")
+        else:
+            file = open(temp_filename, "w", encoding="utf-8")
+        with file:
+            write(file)
+            if sync:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(temp_filename, filename)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.remove(temp_filename)
+        raise
+    if sync:
+        _fsync_directory(os.path.dirname(filename))
+
+
+def _skip_separators(buffer: str, position: int) -> int:
+    """Пропускает пробельные символы и запятые между элементами массива."""
+    return SEPARATORS.match(buffer, position).end()
+
+
+def iter_json_array(file: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Последовательно выдает элементы JSON-массива, читая файл кусками.
+
+    В памяти одновременно находится только текущий кусок файла
+    и разбираемый элемент.
+
+    Args:
+        file (TextIO): Открытый файл с JSON-массивом.
+        chunk_size (int, optional): Размер читаемого куска в символах.
+
+    Raises:
+        json.JSONDecodeError: Вызывается, если файл не является
+        корректным JSON-массивом.
+
+    Returns:
+        Iterator[Any]: Элементы массива.
+    """
+    decoder = json.JSONDecoder()
+    buffer = file.read(chunk_size)
+    eof = not buffer
+    position = _skip_separators(buffer, 0)
+
+    while position >= len(buffer) and not eof:
+        buffer = file.read(chunk_size)
+        eof = not buffer
+        position = _skip_separators(buffer, 0)
+    if eof and position >= len(buffer):
+        return
+    if buffer[position] != "[":
+        raise json.JSONDecodeError("Ожидается JSON-массив", buffer, position)
+    position += 1
+
+    while True:
+        position = _skip_separators(buffer, position)
+        if position < len(buffer) and buffer[position] == "]":
+            return
+        try:
+            if position >= len(buffer):
+                raise json.JSONDecodeError("Неожиданный конец", buffer, position)
+            value, end = decoder.raw_decode(buffer, position)
+            if end < len(buffer) or eof:
+                yield value
+                position = end
+                continue
+        except json.JSONDecodeError:
+            if eof:
+                raise
+        chunk = file.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
 
 
 @dataclass
@@ -8,31 +137,188 @@ class FileManager:
     """
     Управление чтением и записью данных в файл.
 
+    Файлы с расширением `.jsonl` хранят по одной записи JSON
+    в строке, остальные - JSON-массив. Запись атомарна (временный файл
+    и переименование), а сброс на диск (fsync) может выполняться
+    не при каждой записи, а группой: раз в `fsync_every` записей.
+    Между сбросами сбой процесса по-прежнему безопасен, а при
+    отключении питания могут потеряться последние несброшенные версии.
+
     Attributes:
         filename (str): Путь к файлу, с которым ведется работа.
+        fsync_every (int): Сбрасывать данные на диск на каждой N-й
+        записи; 0 - не сбрасывать явно. По умолчанию 1 (каждая запись).
+        indent (int, optional): Отступ JSON. По умолчанию None -
+        компактная запись без пробелов.
     """
 
     filename: str
+    fsync_every: int = field(default=1, kw_only=True)
+    indent: Optional[int] = field(default=None, kw_only=True)
+    _unsynced: int = field(default=0, init=False, repr=False)
+
+    def _should_sync(self) -> bool:
+        """Отмечает запись и решает, пора ли сбросить данные на диск."""
+        if not self.fsync_every:
+            return False
+        self._unsynced += 1
+        if self._unsynced < self.fsync_every:
+            return False
+        self._unsynced = 0
+        return True
+
+    def sync(self) -> None:
+        """Сбрасывает на диск записи, отложенные группировкой fsync."""
+        if not self._unsynced:
+            return
+        self._unsynced = 0
+        try:
+            descriptor = os.open(self.filename, os.O_RDONLY)
+        except FileNotFoundError:
+            return
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+        _fsync_directory(os.path.dirname(self.filename))
+
+    @cached_property
+    def file_lock(self) -> FileLock:
+        """Блокировка файла между процессами со счетчиком версий."""
+        return FileLock(self.filename)
+
+    @property
+    def is_jsonl(self) -> bool:
+        """Хранится ли файл построчно (JSON Lines)."""
+        return self.filename.endswith(JSONL_EXTENSION)
 
     def read_from_file(self) -> List[dict]:
         """
         Считывает данные из файла и возвращает их в виде списка.
 
+        Отсутствующий или пустой файл считается пустым списком.
+        Поврежденный файл не подменяется пустым списком, чтобы
+        следующая запись не затерла сохраненные данные.
+
+        Raises:
+            ValueError: Вызывается, если файл поврежден.
+
         Returns:
             List[Any]: Содержимое файла в виде списка.
         """
+        with stats.timer("file.read"):
+            try:
+                if self.is_jsonl:
+                    records = list(self.iter_records())
+                    stats.count("file.rows_read", len(records))
+                    return records
+                with open(self.filename, "r", encoding="utf-8") as file:
+                    content = file.read()
+                    if stats.enabled:
+                        stats.count("file.bytes_read", os.fstat(file.fileno()).st_size)
+            except FileNotFoundError:
+                return []
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Файл {self.filename} поврежден: {e}") from e
+
+            if not content.strip():
+                return []
+            try:
+                with stats.timer("file.parse"):
+                    records = json.loads(content)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Файл {self.filename} поврежден: {e}") from e
+            stats.count("file.rows_read", len(records))
+            return records
+
+    def iter_records(self) -> Iterator[dict]:
+        """
+        Последовательно выдает записи из файла, не загружая его целиком.
+
+        Raises:
+            json.JSONDecodeError: Вызывается, если файл поврежден.
+
+        Returns:
+            Iterator[dict]: Записи в порядке хранения в файле.
+        """
         try:
-            with open(self.filename, "r") as file:
-                return json.load(file)
-        except (FileNotFoundError, json.decoder.JSONDecodeError):
-            return []
+            file = open(self.filename, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with file:
+            if stats.enabled:
+                stats.count("file.bytes_read", os.fstat(file.fileno()).st_size)
+            if self.is_jsonl:
+                for line in file:
+                    if line.strip():
+                        yield json.loads(line)
+            else:
+                yield from iter_json_array(file)
 
     def write_to_file(self, data: List[Any]) -> None:
         """
-        Записывает данные в файл.
+        Атомарно записывает данные в файл под исключительной
+        блокировкой и увеличивает версию файла.
 
         Args:
             data (List[Any]): Список данных для записи в файл.
         """
-        with open(self.filename, "w") as file:
-            json.dump(data, file, indent=4, ensure_ascii=False)
+
+        def write(file: TextIO) -> None:
+            if self.is_jsonl:
+                for record in data:
+                    file.write(
+                        json.dumps(
+                            record,
+                            ensure_ascii=False,
+                            separators=COMPACT_SEPARATORS,
+                        )
+                        + "\n"
+                    )
+            else:
+                json.dump(
+                    data,
+                    file,
+                    ensure_ascii=False,
+                    indent=self.indent,
+                    separators=None if self.indent else COMPACT_SEPARATORS,
+                )
+
+        with stats.timer("file.write"), self.file_lock.exclusive():
+            atomic_write(self.filename, write, sync=self._should_sync())
+            self.file_lock.bump()
+            if stats.enabled:
+                stats.count("file.rows_written", len(data))
+                stats.count("file.bytes_written", os.path.getsize(self.filename))
+
+    def save_changes(
+        self,
+        events: List[Dict[str, Any]],
+        snapshot: Callable[[], List[dict]],
+    ) -> None:
+        """
+        Сохраняет изменения транзакций.
+
+        JSON-массив нельзя дописать, поэтому файл перезаписывается
+        целиком актуальным состоянием, а сами события игнорируются.
+
+        Args:
+            events (List[dict]): События изменения (add/edit/delete).
+            snapshot (Callable): Функция, возвращающая актуальный
+            список всех записей.
+        """
+        self.write_to_file(snapshot())
+
+    def fingerprint(self) -> Optional[List[int]]:
+        """
+        Возвращает отпечаток состояния файла для проверки изменений.
+
+        Returns:
+            Optional[List[int]]: Размер и время изменения файла
+            или None, если файла нет.
+        """
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
@@ -0,0 +1,338 @@
+import atexit
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, TypeVar
+
+STATS_ENV = "WALLET_STATS"
+STATS_FILE_ENV = "WALLET_STATS_FILE"
+PROFILE_ENV = "WALLET_PROFILE"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_DISABLED = nullcontext()
+
+
+@dataclass
+class Timer:
+    """
+    Накопленное время одной операции.
+
+    Attributes:
+        calls (int): Количество вызовов.
+        total (float): Суммарное время в секундах.
+        max (float): Наибольшее время одного вызова в секундах.
+    """
+
+    calls: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        """Возвращает показатели таймера в виде словаря."""
+        return {
+            "calls": self.calls,
+            "total_s": self.total,
+            "mean_s": self.total / self.calls if self.calls else 0.0,
+            "max_s": self.max,
+        }
+
+
+@dataclass
+class Instrumentation:
+    """
+    Таймеры и счетчики горячих участков кода.
+
+    Выключенная инструментация почти ничего не стоит: таймеры
+    возвращают пустой контекст, а счетчики сразу выходят. Включается
+    переменной окружения WALLET_STATS=1 или методом `enable()`.
+    Если задана переменная WALLET_STATS_FILE, при завершении процесса
+    снимок показателей сохраняется в этот JSON-файл, иначе при
+    включенной инструментации выводится в stderr. Переменная
+    WALLET_PROFILE=<файл> дополнительно выполняет операции менеджеров
+    под cProfile и сохраняет профиль в файл при завершении.
+
+    Attributes:
+        enabled (bool): Собираются ли показатели.
+        profile_path (str, optional): Файл профиля cProfile операций
+        менеджеров. По умолчанию None - без профилирования.
+    """
+
+    enabled: bool = False
+    profile_path: Optional[str] = None
+    timers: Dict[str, Timer] = field(default_factory=dict, init=False, repr=False)
+    counters: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self):
+        """
+        Пост-инициализация объекта Instrumentation.
+
+        Создает профилировщик, если задан файл профиля.
+        """
+        self._lock = threading.Lock()
+        self._profiler: Optional[cProfile.Profile] = None
+        self._active: Optional[cProfile.Profile] = None
+        self._profile_depth = 0
+        if self.profile_path:
+            self._profiler = cProfile.Profile()
+
+    @classmethod
+    def from_env(cls) -> "Instrumentation":
+        """
+        Создает инструментацию по переменным окружения.
+
+        Returns:
+            Instrumentation: Инструментация.
+        """
+        stats_file = os.environ.get(STATS_FILE_ENV)
+        profile_path = os.environ.get(PROFILE_ENV)
+        enabled = os.environ.get(STATS_ENV, "") not in ("", "0") or bool(stats_file)
+        instance = cls(enabled=enabled or bool(profile_path), profile_path=profile_path)
+        if instance.enabled:
+            atexit.register(instance._export_at_exit, stats_file)
+        return instance
+
+    def enable(self) -> None:
+        """Включает сбор показателей."""
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Выключает сбор показателей; собранные значения сохраняются."""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Обнуляет все таймеры и счетчики."""
+        with self._lock:
+            self.timers.clear()
+            self.counters.clear()
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Увеличивает счетчик.
+
+        Args:
+            name (str): Имя счетчика.
+            value (int, optional): Приращение. По умолчанию 1.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Учитывает один вызов операции.
+
+        Args:
+            name (str): Имя таймера.
+            seconds (float): Время вызова в секундах.
+        """
+        with self._lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                timer = self.timers[name] = Timer()
+            timer.calls += 1
+            timer.total += seconds
+            timer.max = max(timer.max, seconds)
+
+    def timer(self, name: str) -> ContextManager[None]:
+        """
+        Замеряет время блока: `with stats.timer("file.read"): ...`.
+
+        Args:
+            name (str): Имя таймера.
+
+        Returns:
+            ContextManager[None]: Контекст замера.
+        """
+        if not self.enabled:
+            return _DISABLED
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name: str) -> Iterator[None]:
+        """Замеряет время блока и учитывает его в таймере."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    @contextmanager
+    def profile(self, path: Optional[str] = None) -> Iterator[cProfile.Profile]:
+        """
+        Выполняет блок под cProfile.
+
+        Вложенные блоки входят во внешний: профилировщик один на процесс.
+
+        Args:
+            path (str, optional): Файл, в который сохраняется профиль
+            блока (формат pstats). По умолчанию профиль накапливается
+            в общем профилировщике WALLET_PROFILE или только
+            возвращается.
+
+        Returns:
+            Iterator[cProfile.Profile]: Профилировщик блока.
+        """
+        with self._lock:
+            outer = not self._profile_depth
+            if outer and path is not None:
+                self._active = cProfile.Profile()
+            elif outer:
+                if self._profiler is None:
+                    self._profiler = cProfile.Profile()
+                self._active = self._profiler
+            profiler = self._active
+            self._profile_depth += 1
+        if outer:
+            profiler.enable()
+        try:
+            yield profiler
+        finally:
+            with self._lock:
+                self._profile_depth -= 1
+            if outer:
+                profiler.disable()
+                if path is not None:
+                    profiler.dump_stats(path)
+
+    def operation(self, name: str) -> ContextManager[Any]:
+        """
+        Замеряет операцию менеджера и, если задан WALLET_PROFILE,
+        выполняет ее под общим профилировщиком.
+
+        Args:
+            name (str): Имя операции.
+
+        Returns:
+            ContextManager[Any]: Контекст операции.
+        """
+        if not self.enabled:
+            return _DISABLED
+        if self.profile_path is None:
+            return self._timed(name)
+        return self._profiled_operation(name)
+
+    @contextmanager
+    def _profiled_operation(self, name: str) -> Iterator[None]:
+        """Замеряет операцию под общим профилировщиком."""
+        with self._timed(name), self.profile():
+            yield
+
+    def counted(
+        self,
+        predicate: Callable[[Any], bool],
+        scanned: str,
+        matched: str,
+    ) -> Callable[[Any], bool]:
+        """
+        Оборачивает фильтр так, что он считает просмотренные
+        и подошедшие записи.
+
+        Args:
+            predicate (Callable): Фильтр записей.
+            scanned (str): Счетчик просмотренных записей.
+            matched (str): Счетчик подошедших записей.
+
+        Returns:
+            Callable: Фильтр со счетчиками.
+        """
+        if not self.enabled:
+            return predicate
+
+        def counting(record: Any) -> bool:
+            self.count(scanned)
+            result = predicate(record)
+            if result:
+                self.count(matched)
+            return result
+
+        return counting
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Возвращает снимок собранных показателей.
+
+        Returns:
+            Dict[str, Any]: Таймеры и счетчики.
+        """
+        with self._lock:
+            return {
+                "timers": {
+                    name: timer.to_dict() for name, timer in sorted(self.timers.items())
+                },
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+    def dump(self, path: str) -> None:
+        """
+        Сохраняет снимок показателей в JSON-файл.
+
+        Args:
+            path (str): Путь к файлу.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.snapshot(), file, ensure_ascii=False, indent=2)
+
+    def report(self) -> str:
+        """
+        Форматирует снимок показателей в виде текста.
+
+        Returns:
+            str: Таблица таймеров и счетчиков.
+        """
+        snapshot = self.snapshot()
+        lines: List[str] = [
+            f"{'таймер':<32} {'вызовы':>8} {'всего, мс':>12} {'макс, мс':>10}"
+        ]
+        for name, timer in snapshot["timers"].items():
+            lines.append(
+                f"{name:<32} {timer['calls']:>8} "
+                f"{timer['total_s'] * 1000:>12.3f} {timer['max_s'] * 1000:>10.3f}"
+            )
+        for name, value in snapshot["counters"].items():
+            lines.append(f"{name:<32} {value:>8}")
+        return "\n".join(lines)
+
+    def _export_at_exit(self, stats_file: Optional[str]) -> None:
+        """Сохраняет показатели и профиль при завершении процесса."""
+        if stats_file:
+            self.dump(stats_file)
+        else:
+            print(self.report(), file=sys.stderr)
+        if self._profiler is not None and self.profile_path:
+            self._profiler.dump_stats(self.profile_path)
+
+
+def instrumented(name: str) -> Callable[[F], F]:
+    """
+    Декоратор операции менеджера: замеряет время вызовов
+    (см. `Instrumentation.operation`).
+
+    Args:
+        name (str): Имя операции.
+
+    Returns:
+        Callable: Декоратор.
+    """
+
+    def decorator(function: F) -> F:
+        @wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not stats.enabled:
+                return function(*args, **kwargs)
+            with stats.operation(name):
+                return function(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+stats = Instrumentation.from_env()
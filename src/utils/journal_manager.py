@@ -0,0 +1,335 @@
+import json
+import os
+import tempfile
+import threading
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .file_manager import COMPACT_SEPARATORS, FileManager, atomic_write
+from .instrumentation import stats
+
+EVENT_ADD = "add"
+EVENT_EDIT = "edit"
+EVENT_DELETE = "delete"
+EVENT_RESET = "reset"
+# Размер блока, которым конец журнала читается в поисках
+# последней полной строки.
+TAIL_CHUNK = 65536
+
+
+def apply_event(records: Dict[int, dict], event: Dict[str, Any]) -> None:
+    """
+    Применяет событие журнала к словарю записей.
+
+    События идемпотентны: повторное применение уже учтенного
+    события не меняет итоговое состояние.
+
+    Args:
+        records (Dict[int, dict]): Записи, индексированные по id.
+        event (dict): Событие журнала.
+
+    Raises:
+        ValueError: Вызывается, если тип события неизвестен.
+    """
+    op = event["op"]
+    if op in (EVENT_ADD, EVENT_EDIT):
+        record = event["record"]
+        records[record["id"]] = record
+    elif op == EVENT_DELETE:
+        records.pop(event["id"], None)
+    elif op == EVENT_RESET:
+        records.clear()
+    else:
+        raise ValueError(f"Неизвестный тип события: {op}")
+
+
+def _identity(filename: str) -> Optional[Tuple[int, int]]:
+    """Возвращает устройство и inode файла или None, если файла нет."""
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+
+def _encode(event: Dict[str, Any]) -> bytes:
+    """Кодирует событие в одну строку журнала."""
+    line = json.dumps(event, ensure_ascii=False, separators=COMPACT_SEPARATORS)
+    return (line + "\n").encode("utf-8")
+
+
+@dataclass
+class JournalFileManager(FileManager):
+    """
+    Хранение транзакций в журнале событий (append-only).
+
+    Каждое изменение дописывается в конец журнала одной строкой JSON,
+    поэтому добавление записи стоит O(1). При чтении состояние
+    восстанавливается из снимка и повтора журнала поверх него.
+    Когда журнал разрастается, он в фоне сворачивается в новый снимок.
+    Дописанные события сбрасываются на диск группой, раз в `fsync_every`
+    сохранений; снимок и замена журнала всегда атомарны и сбрасываются.
+    Сам менеджер записи в памяти не держит: актуальное состояние
+    для снимка передает хранилище транзакций.
+
+    Attributes:
+        filename (str): Путь к файлу журнала.
+        compact_threshold (int): Количество событий в журнале,
+        после которого запускается фоновое сжатие.
+    """
+
+    compact_threshold: int = 10000
+
+    def __post_init__(self):
+        """
+        Пост-инициализация объекта JournalFileManager.
+
+        Определяет путь к снимку и считает события в журнале.
+        """
+        self.snapshot_filename = f"{self.filename}.snapshot"
+        self._lock = threading.RLock()
+        self._compaction: Optional[threading.Thread] = None
+        self._journal_events = 0
+        self._replay({})
+
+    def _replay(self, records: Dict[int, dict]) -> Dict[int, dict]:
+        """
+        Применяет к записям все события журнала.
+
+        Неполная последняя строка (прерванная запись) пропускается
+        и обрезается при следующем сохранении (см. `_drop_torn_tail`).
+
+        Args:
+            records (Dict[int, dict]): Записи из снимка.
+
+        Returns:
+            Dict[int, dict]: Актуальные записи.
+        """
+        self._journal_events = 0
+        try:
+            file = open(self.filename, "rb")
+        except FileNotFoundError:
+            return records
+        with file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                apply_event(records, json.loads(line))
+                self._journal_events += 1
+        return records
+
+    def read_from_file(self) -> List[dict]:
+        """
+        Восстанавливает актуальное состояние из снимка и журнала.
+
+        Returns:
+            List[dict]: Список записей.
+        """
+        with stats.timer("journal.read"), self._lock:
+            records = {
+                record["id"]: record
+                for record in FileManager(self.snapshot_filename).read_from_file()
+            }
+            return list(self._replay(records).values())
+
+    def iter_records(self) -> Iterator[dict]:
+        """
+        Последовательно выдает записи актуального состояния.
+
+        Returns:
+            Iterator[dict]: Записи в порядке добавления.
+        """
+        return iter(self.read_from_file())
+
+    def write_to_file(self, data: List[Any]) -> None:
+        """
+        Полностью заменяет содержимое хранилища.
+
+        Журнал атомарно заменяется событием сброса и событиями
+        добавления всех записей, после чего запускается сжатие.
+
+        Args:
+            data (List[Any]): Список записей.
+        """
+        events = [{"op": EVENT_RESET}]
+        events.extend({"op": EVENT_ADD, "record": record} for record in data)
+
+        with self.file_lock.exclusive(), self._lock:
+            atomic_write(
+                self.filename,
+                lambda file: file.write(b"".join(_encode(event) for event in events)),
+                binary=True,
+            )
+            self._journal_events = len(events)
+            self.file_lock.bump()
+            self.compact(lambda: data, wait=False)
+
+    def save_changes(
+        self,
+        events: List[Dict[str, Any]],
+        snapshot: Optional[Callable[[], List[dict]]] = None,
+    ) -> None:
+        """
+        Дописывает события изменения в журнал.
+
+        Args:
+            events (List[dict]): События изменения (add/edit/delete).
+            snapshot (Callable, optional): Функция, возвращающая
+            актуальный список всех записей; используется для сжатия.
+            Если не передана, состояние для сжатия читается с диска.
+        """
+        with stats.timer("journal.append"), self.file_lock.exclusive(), self._lock:
+            with open(self.filename, "a+b") as file:
+                self._drop_torn_tail(file)
+                data = b"".join(_encode(event) for event in events)
+                file.write(data)
+                stats.count("file.rows_written", len(events))
+                stats.count("file.bytes_written", len(data))
+                if self._should_sync():
+                    file.flush()
+                    os.fsync(file.fileno())
+            self._journal_events += len(events)
+            self.file_lock.bump()
+            if self._journal_events >= self.compact_threshold:
+                self.compact(snapshot, wait=False)
+
+    @staticmethod
+    def _drop_torn_tail(file: BinaryIO) -> None:
+        """
+        Обрезает неполную последнюю строку журнала, оставшуюся
+        от прерванной записи, чтобы новые события не дописались к ней.
+        Вызывается под исключительной блокировкой файла.
+
+        Args:
+            file (BinaryIO): Журнал, открытый на чтение и дозапись.
+        """
+        end = file.seek(0, os.SEEK_END)
+        if not end:
+            return
+        file.seek(end - 1)
+        if file.read(1) == b"\n":
+            return
+        while end:
+            start = max(0, end - TAIL_CHUNK)
+            file.seek(start)
+            newline = file.read(end - start).rfind(b"\n")
+            if newline >= 0:
+                file.truncate(start + newline + 1)
+                return
+            end = start
+        file.truncate(0)
+
+    def compact(
+        self,
+        snapshot: Optional[Callable[[], List[dict]]] = None,
+        wait: bool = True,
+    ) -> None:
+        """
+        Сворачивает журнал в снимок.
+
+        Состояние фиксируется сразу под блокировкой файла, а запись
+        снимка выполняется в фоновом потоке.
+
+        Args:
+            snapshot (Callable, optional): Функция, возвращающая
+            актуальный список всех записей. По умолчанию состояние
+            восстанавливается с диска.
+            wait (bool, optional): Дождаться окончания сжатия.
+            По умолчанию True.
+        """
+        with self.file_lock.exclusive(), self._lock:
+            if self._compaction is None or not self._compaction.is_alive():
+                records = snapshot() if snapshot is not None else self.read_from_file()
+                try:
+                    covered = os.path.getsize(self.filename)
+                except FileNotFoundError:
+                    covered = 0
+                self._compaction = threading.Thread(
+                    target=self._compact,
+                    args=(records, covered, _identity(self.filename)),
+                    daemon=True,
+                )
+                self._compaction.start()
+            compaction = self._compaction
+
+        if wait:
+            compaction.join()
+
+    def _compact(
+        self,
+        records: List[dict],
+        covered: int,
+        identity: Optional[Tuple[int, int]],
+    ) -> None:
+        """
+        Записывает снимок и обрезает учтенную в нем часть журнала.
+
+        Снимок заменяется раньше журнала: если процесс прервется
+        между заменами, повтор идемпотентных событий на новом снимке
+        даст то же состояние. Если за время сжатия журнал был заменен
+        (сброс или сжатие в другом процессе), снимок отбрасывается.
+
+        Args:
+            records (List[dict]): Состояние на момент начала сжатия.
+            covered (int): Позиция в журнале, до которой события
+            вошли в снимок.
+            identity (Tuple[int, int], optional): Устройство и inode
+            журнала на момент начала сжатия.
+        """
+        # Снимок пишется без блокировки, поэтому временный файл уникален
+        # для каждого сжатия: параллельные сжатия в разных процессах
+        # не пишут в один файл и не удаляют чужие снимки.
+        descriptor, snapshot_temp = tempfile.mkstemp(
+            prefix=os.path.basename(self.snapshot_filename),
+            suffix=".tmp",
+            dir=os.path.dirname(self.snapshot_filename) or ".",
+        )
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                json.dump(records, file, ensure_ascii=False, separators=COMPACT_SEPARATORS)
+                file.flush()
+                os.fsync(file.fileno())
+
+            with self.file_lock.exclusive(), self._lock:
+                if _identity(self.filename) != identity:
+                    return
+                try:
+                    with open(self.filename, "rb") as file:
+                        file.seek(covered)
+                        tail = file.read()
+                except FileNotFoundError:
+                    tail = b""
+
+                os.replace(snapshot_temp, self.snapshot_filename)
+                snapshot_temp = None
+                atomic_write(self.filename, lambda file: file.write(tail), binary=True)
+                self._journal_events = tail.count(b"\n")
+        finally:
+            if snapshot_temp is not None:
+                with suppress(FileNotFoundError):
+                    os.remove(snapshot_temp)
+
+    def wait_for_compaction(self) -> None:
+        """Дожидается окончания фонового сжатия, если оно запущено."""
+        compaction = self._compaction
+        if compaction is not None and compaction is not threading.current_thread():
+            compaction.join()
+
+    def import_json(self, path: str) -> None:
+        """
+        Загружает записи из JSON-файла, заменяя текущее содержимое.
+
+        Args:
+            path (str): Путь к JSON-файлу.
+        """
+        self.write_to_file(FileManager(path).read_from_file())
+
+    def export_json(self, path: str) -> None:
+        """
+        Выгружает текущее состояние в JSON-файл.
+
+        Args:
+            path (str): Путь к JSON-файлу.
+        """
+        FileManager(path).write_to_file(self.read_from_file())
@@ -0,0 +1,153 @@
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: блокировка действует только внутри процесса
+    fcntl = None
+
+VERSION_WIDTH = 20
+
+
+class VersionConflictError(Exception):
+    """Файл изменен другим процессом после загрузки данных."""
+
+
+@dataclass
+class FileLock:
+    """
+    Рекомендательная блокировка файла между процессами
+    со счетчиком версий.
+
+    Блокировка берется на отдельный файл `<файл>.lock`: разделяемая
+    для чтения и исключительная для записи. В нем же хранится
+    счетчик версий, который увеличивается при каждой записи, поэтому
+    процесс может дешево проверить, не устарели ли загруженные данные.
+    Повторный захват в том же потоке не блокирует, а в пределах
+    процесса блокировку держит один поток.
+
+    Attributes:
+        filename (str): Путь к защищаемому файлу.
+    """
+
+    filename: str
+
+    def __post_init__(self):
+        """
+        Пост-инициализация объекта FileLock.
+
+        Определяет путь к файлу блокировки.
+        """
+        self.lock_filename = f"{self.filename}.lock"
+        self._thread_lock = threading.RLock()
+        self._descriptor: Optional[int] = None
+        self._depth = 0
+        self._exclusive = False
+
+    @contextmanager
+    def _acquire(self, exclusive: bool) -> Iterator[None]:
+        """Захватывает блокировку с учетом вложенных захватов."""
+        with self._thread_lock:
+            if self._depth:
+                if exclusive and not self._exclusive:
+                    raise RuntimeError(
+                        "Нельзя повысить разделяемую блокировку до исключительной."
+                    )
+            else:
+                self._open(exclusive)
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if not self._depth:
+                    self._close()
+
+    def _open(self, exclusive: bool) -> None:
+        """Открывает файл блокировки и захватывает ее."""
+        flags = os.O_RDWR | os.O_CREAT if exclusive else os.O_RDONLY
+        try:
+            self._descriptor = os.open(self.lock_filename, flags, 0o644)
+        except FileNotFoundError:
+            # Файла блокировки нет - в файл еще ни разу не писали.
+            self._descriptor = None
+            return
+        self._exclusive = exclusive
+        if fcntl is not None:
+            fcntl.flock(self._descriptor, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+    def _close(self) -> None:
+        """Снимает блокировку и закрывает файл блокировки."""
+        if self._descriptor is not None:
+            os.close(self._descriptor)
+        self._descriptor = None
+        self._exclusive = False
+
+    def shared(self):
+        """
+        Разделяемая блокировка для чтения.
+
+        Returns:
+            ContextManager[None]: Контекст блокировки.
+        """
+        return self._acquire(exclusive=False)
+
+    def exclusive(self):
+        """
+        Исключительная блокировка для записи.
+
+        Returns:
+            ContextManager[None]: Контекст блокировки.
+        """
+        return self._acquire(exclusive=True)
+
+    def version(self) -> int:
+        """
+        Возвращает текущую версию файла.
+
+        Returns:
+            int: Количество записей в файл; 0, если записей не было.
+        """
+        with self._thread_lock:
+            if self._descriptor is not None:
+                return self._read_version(self._descriptor)
+            try:
+                descriptor = os.open(self.lock_filename, os.O_RDONLY)
+            except FileNotFoundError:
+                return 0
+            try:
+                return self._read_version(descriptor)
+            finally:
+                os.close(descriptor)
+
+    @staticmethod
+    def _read_version(descriptor: int) -> int:
+        """Читает счетчик версий из файла блокировки."""
+        content = os.pread(descriptor, VERSION_WIDTH, 0)
+        return int(content) if content.strip() else 0
+
+    def bump(self) -> int:
+        """
+        Увеличивает версию файла. Вызывается под исключительной
+        блокировкой после записи.
+
+        Raises:
+            RuntimeError: Вызывается, если исключительная блокировка
+            не захвачена.
+
+        Returns:
+            int: Новая версия.
+        """
+        with self._thread_lock:
+            if not self._exclusive:
+                raise RuntimeError("Требуется исключительная блокировка.")
+            version = self._read_version(self._descriptor) + 1
+            os.pwrite(
+                self._descriptor,
+                str(version).zfill(VERSION_WIDTH).encode("ascii"),
+                0,
+            )
+            return version
@@ -0,0 +1,725 @@
+import mmap
+import os
+import struct
+import sys
+import threading
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy - необязательная зависимость
+    np = None
+
+from .file_manager import FileManager, atomic_write
+from .instrumentation import stats
+from .journal_manager import EVENT_ADD, EVENT_DELETE, EVENT_EDIT, EVENT_RESET
+from .money import MINOR_UNITS, from_minor_units, minor_range, to_minor_units
+from .validators import CATEGORIES
+
+MAGIC = b"WALLETR1"
+FORMAT_VERSION = 1
+# Заголовок: сигнатура, версия формата, размер записи, идентификатор
+# файла (он же имя кучи описаний), число слотов, число живых записей
+# и счетчик изменений.
+HEADER = struct.Struct("<8sHH4xQQQQ16x")
+# Запись: id, сумма в копейках, смещение и длина описания в куче,
+# порядковый номер дня даты, код категории и флаги.
+RECORD = struct.Struct("<qqQiIBB6x")
+FLAGS_OFFSET = 33
+FLAG_DELETED = 1
+FLAG_NO_AMOUNT = 2
+FLAG_INT_AMOUNT = 4
+# Запас слотов при росте файла, чтобы не перестраивать отображение
+# на каждом добавлении.
+GROWTH_SLOTS = 1024
+SCAN_CHUNK = 8192
+
+Row = Tuple[int, int, int, int, int, int, int]
+
+if np is not None:
+    RECORD_DTYPE = np.dtype(
+        [
+            ("id", "<i8"),
+            ("amount", "<i8"),
+            ("offset", "<u8"),
+            ("day", "<i4"),
+            ("length", "<u4"),
+            ("category", "u1"),
+            ("flags", "u1"),
+            ("padding", "V6"),
+        ]
+    )
+
+
+@lru_cache(maxsize=None)
+def _day_to_date(day: int) -> str:
+    """Возвращает дату (гггг-мм-дд) по порядковому номеру дня."""
+    return sys.intern(date.fromordinal(day).isoformat())
+
+
+def _date_to_day(value: Any) -> int:
+    """Возвращает порядковый номер дня даты."""
+    if isinstance(value, date):
+        return value.toordinal()
+    try:
+        return date.fromisoformat(str(value)).toordinal()
+    except ValueError as e:
+        raise ValueError(f"Некорректная дата для двоичного формата: {value}") from e
+
+
+def _row_matches(
+    row: Row,
+    category: Optional[int],
+    day_from: Optional[int],
+    day_to: Optional[int],
+    amount_min: Optional[int],
+    amount_max: Optional[int],
+) -> bool:
+    """Проверяет поля записи без разбора описания."""
+    transaction_id, amount, _, day, _, code, flags = row
+    has_amount = amount_min is not None or amount_max is not None
+    return (
+        transaction_id > 0
+        and not flags & FLAG_DELETED
+        and (category is None or code == category)
+        and (day_from is None or day >= day_from)
+        and (day_to is None or day <= day_to)
+        and (
+            not has_amount
+            or not flags & FLAG_NO_AMOUNT
+            and (amount_min is None or amount >= amount_min)
+            and (amount_max is None or amount <= amount_max)
+        )
+    )
+
+
+def _matching_slots(
+    buffer: Any,
+    offset: int,
+    slots: int,
+    category: Optional[int],
+    day_from: Optional[int],
+    day_to: Optional[int],
+    amount_min: Optional[int],
+    amount_max: Optional[int],
+) -> List[int]:
+    """
+    Находит в буфере записей, начинающихся со смещения offset, слоты
+    записей, подходящих под фильтры полей (с numpy - векторно).
+    """
+    if not slots:
+        return []
+    if np is not None:
+        rows = np.frombuffer(buffer, dtype=RECORD_DTYPE, count=slots, offset=offset)
+        try:
+            mask = (rows["id"] > 0) & (rows["flags"] & FLAG_DELETED == 0)
+            if category is not None:
+                mask &= rows["category"] == category
+            if day_from is not None:
+                mask &= rows["day"] >= day_from
+            if day_to is not None:
+                mask &= rows["day"] <= day_to
+            if amount_min is not None or amount_max is not None:
+                mask &= rows["flags"] & FLAG_NO_AMOUNT == 0
+            if amount_min is not None:
+                mask &= rows["amount"] >= amount_min
+            if amount_max is not None:
+                mask &= rows["amount"] <= amount_max
+            return np.flatnonzero(mask).tolist()
+        finally:
+            del rows
+
+    with memoryview(buffer) as view, view[offset:offset + slots * RECORD.size] as records:
+        return [
+            slot
+            for slot, row in enumerate(RECORD.iter_unpack(records))
+            if _row_matches(row, category, day_from, day_to, amount_min, amount_max)
+        ]
+
+
+def _category_sums(buffer: Any, offset: int, slots: int) -> Tuple[List[int], List[bool]]:
+    """
+    Считает суммы в копейках по кодам категорий в буфере записей,
+    начинающихся со смещения offset (с numpy - векторно).
+
+    Returns:
+        Tuple[List[int], List[bool]]: Суммы по кодам категорий
+        и признаки того, что в категории есть записи.
+    """
+    sums = [0] * len(CATEGORIES)
+    present = [False] * len(CATEGORIES)
+    if not slots:
+        return sums, present
+    if np is not None:
+        rows = np.frombuffer(buffer, dtype=RECORD_DTYPE, count=slots, offset=offset)
+        try:
+            live = (rows["id"] > 0) & (rows["flags"] & FLAG_DELETED == 0)
+            counted = live & (rows["flags"] & FLAG_NO_AMOUNT == 0)
+            for code in range(len(CATEGORIES)):
+                in_category = rows["category"] == code
+                present[code] = bool((live & in_category).any())
+                sums[code] = int(rows["amount"][counted & in_category].sum())
+        finally:
+            del rows
+        return sums, present
+
+    with memoryview(buffer) as view, view[offset:offset + slots * RECORD.size] as records:
+        for transaction_id, amount, _, _, _, code, flags in RECORD.iter_unpack(records):
+            if transaction_id <= 0 or flags & FLAG_DELETED:
+                continue
+            present[code] = True
+            if not flags & FLAG_NO_AMOUNT:
+                sums[code] += amount
+    return sums, present
+
+
+@dataclass
+class MmapFileManager(FileManager):
+    """
+    Хранение транзакций в двоичном файле записей фиксированной длины,
+    открываемом через mmap.
+
+    Запись хранит id, порядковый номер дня даты, код категории, сумму
+    в копейках и ссылку на описание в отдельной куче описаний
+    (`<файл>.<идентификатор>.heap`). Запись с id N лежит в слоте N - 1,
+    поэтому доступ по id выполняется за O(1), а суммы и фильтры
+    считаются прямо по отображенному буферу без разбора записей
+    (с numpy - векторно). Изменения пишутся на месте: редактирование
+    перезаписывает слот, удаление ставит флаг-надгробие, новое описание
+    дописывается в кучу. Полная перезапись (`write_to_file`, `compact`)
+    создает новые файлы и освобождает место удаленных записей и старых
+    описаний.
+
+    Формат рассчитан на плотные id (как их выдает `next_id()`),
+    категории из `CATEGORIES` и суммы с точностью до копейки.
+
+    Attributes:
+        filename (str): Путь к файлу записей.
+    """
+
+    def __post_init__(self):
+        """
+        Пост-инициализация объекта MmapFileManager.
+
+        Отображает файл в память, если он уже существует.
+        """
+        self._lock = threading.RLock()
+        self._file: Optional[Any] = None
+        self._map: Optional[mmap.mmap] = None
+        self._heap_descriptor: Optional[int] = None
+        self._heap: Optional[mmap.mmap] = None
+        self.open()
+
+    def heap_filename(self, uid: int) -> str:
+        """
+        Возвращает путь к куче описаний файла с указанным идентификатором.
+
+        Args:
+            uid (int): Идентификатор файла записей.
+
+        Returns:
+            str: Путь к куче описаний.
+        """
+        return f"{self.filename}.{uid:016x}.heap"
+
+    def open(self) -> None:
+        """
+        Заново отображает файл записей и кучу описаний.
+
+        Нужно после того, как файл целиком перезаписал другой процесс.
+
+        Raises:
+            ValueError: Вызывается, если файл поврежден.
+        """
+        with self._lock:
+            self.close()
+            try:
+                file = open(self.filename, "r+b")
+            except FileNotFoundError:
+                return
+            try:
+                self._map = mmap.mmap(file.fileno(), 0)
+                magic, version, record_size, uid, *_ = HEADER.unpack_from(self._map)
+            except (ValueError, struct.error) as e:
+                file.close()
+                self.close()
+                raise ValueError(f"Файл {self.filename} поврежден: {e}") from e
+            self._file = file
+            if (magic, version, record_size) != (MAGIC, FORMAT_VERSION, RECORD.size):
+                self.close()
+                raise ValueError(
+                    f"Файл {self.filename} поврежден: неизвестный формат записей."
+                )
+            self._heap_descriptor = os.open(
+                self.heap_filename(uid), os.O_RDWR | os.O_CREAT, 0o644
+            )
+            self._map_heap()
+
+    def close(self) -> None:
+        """Закрывает отображения и файлы."""
+        with self._lock:
+            for resource in (self._heap, self._map, self._file):
+                if resource is not None:
+                    resource.close()
+            if self._heap_descriptor is not None:
+                os.close(self._heap_descriptor)
+            self._file = self._map = self._heap = self._heap_descriptor = None
+
+    def _map_heap(self) -> None:
+        """Отображает кучу описаний целиком (пустая куча не отображается)."""
+        if self._heap is not None:
+            self._heap.close()
+            self._heap = None
+        if os.fstat(self._heap_descriptor).st_size:
+            self._heap = mmap.mmap(self._heap_descriptor, 0)
+
+    def _header(self) -> Tuple[int, int, int, int]:
+        """Возвращает идентификатор файла, число слотов, записей и изменений."""
+        return HEADER.unpack_from(self._map)[3:]
+
+    def _set_header(self, uid: int, slots: int, live: int, changes: int) -> None:
+        """Записывает заголовок файла."""
+        HEADER.pack_into(
+            self._map, 0, MAGIC, FORMAT_VERSION, RECORD.size, uid, slots, live, changes
+        )
+
+    def _capacity(self) -> int:
+        """Возвращает число слотов, помещающихся в отображение."""
+        return (len(self._map) - HEADER.size) // RECORD.size
+
+    def _slots(self) -> int:
+        """
+        Возвращает число занятых слотов. Если другой процесс дописал
+        записи за пределы отображения, оно расширяется.
+        """
+        if self._map is None:
+            self.open()
+            if self._map is None:
+                return 0
+        slots = self._header()[1]
+        if slots > self._capacity():
+            self._map.close()
+            self._map = mmap.mmap(self._file.fileno(), 0)
+        return slots
+
+    def _row(self, slot: int) -> Row:
+        """Возвращает поля записи слота."""
+        return RECORD.unpack_from(self._map, HEADER.size + slot * RECORD.size)
+
+    def _description(self, offset: int, length: int) -> str:
+        """Читает описание из кучи, расширяя отображение при необходимости."""
+        if not length:
+            return ""
+        if self._heap is None or offset + length > len(self._heap):
+            self._map_heap()
+        return str(self._heap[offset:offset + length], "utf-8")
+
+    def _decode(self, row: Row) -> dict:
+        """Преобразует поля записи в запись транзакции."""
+        transaction_id, amount, offset, day, length, code, flags = row
+        if flags & FLAG_NO_AMOUNT:
+            value: Any = ""
+        elif flags & FLAG_INT_AMOUNT:
+            value = amount // MINOR_UNITS
+        else:
+            value = from_minor_units(amount)
+        return {
+            "id": transaction_id,
+            "date": _day_to_date(day),
+            "category": CATEGORIES[code],
+            "amount": value,
+            "description": self._description(offset, length),
+        }
+
+    @staticmethod
+    def _encode(record: Dict[str, Any]) -> Tuple[int, int, int, int, int, bytes]:
+        """
+        Преобразует запись транзакции в поля записи и байты описания.
+
+        Raises:
+            ValueError: Вызывается, если id, дата или категория
+            не поддерживаются форматом.
+        """
+        transaction_id = record["id"]
+        if isinstance(transaction_id, bool) or not isinstance(transaction_id, int):
+            raise ValueError(f"Некорректный id для двоичного формата: {transaction_id}")
+        if transaction_id < 1:
+            raise ValueError(f"Некорректный id для двоичного формата: {transaction_id}")
+        if record["category"] not in CATEGORIES:
+            raise ValueError(
+                f"Некорректная категория для двоичного формата: {record['category']}"
+            )
+
+        amount = record["amount"]
+        flags = 0
+        if isinstance(amount, bool) or not isinstance(amount, (int, float)):
+            flags |= FLAG_NO_AMOUNT
+            units = 0
+        else:
+            if isinstance(amount, int):
+                flags |= FLAG_INT_AMOUNT
+            units = to_minor_units(amount)
+        return (
+            transaction_id,
+            units,
+            _date_to_day(record["date"]),
+            CATEGORIES.index(record["category"]),
+            flags,
+            str(record["description"]).encode("utf-8"),
+        )
+
+    def read_from_file(self) -> List[dict]:
+        """
+        Считывает все записи из файла.
+
+        Returns:
+            List[dict]: Список записей в порядке id.
+        """
+        with stats.timer("mmap.read"):
+            records = list(self.iter_records())
+        stats.count("file.rows_read", len(records))
+        return records
+
+    def iter_records(self) -> Iterator[dict]:
+        """
+        Последовательно выдает записи, разбирая буфер частями.
+
+        Returns:
+            Iterator[dict]: Записи в порядке id.
+        """
+        with self._lock:
+            self.open()
+        slot = 0
+        while True:
+            with self._lock:
+                slots = self._slots()
+                if slot >= slots:
+                    return
+                end = min(slot + SCAN_CHUNK, slots)
+                chunk = self._map[
+                    HEADER.size + slot * RECORD.size:HEADER.size + end * RECORD.size
+                ]
+                records = [
+                    self._decode(row)
+                    for row in RECORD.iter_unpack(chunk)
+                    if row[0] > 0 and not row[6] & FLAG_DELETED
+                ]
+            yield from records
+            slot = end
+
+    def write_to_file(self, data: List[Any]) -> None:
+        """
+        Атомарно создает файл записей и новую кучу описаний под
+        исключительной блокировкой и увеличивает версию файла.
+
+        Args:
+            data (List[Any]): Список записей.
+        """
+        encoded = {}
+        for record in data:
+            fields = self._encode(record)
+            encoded[fields[0]] = fields
+        slots = max(encoded, default=0)
+        uid = int.from_bytes(os.urandom(8), "little")
+
+        buffer = bytearray(HEADER.size + slots * RECORD.size)
+        HEADER.pack_into(
+            buffer, 0, MAGIC, FORMAT_VERSION, RECORD.size, uid, slots, len(encoded), 0
+        )
+        heap = bytearray()
+        for transaction_id, units, day, code, flags, description in encoded.values():
+            RECORD.pack_into(
+                buffer,
+                HEADER.size + (transaction_id - 1) * RECORD.size,
+                transaction_id,
+                units,
+                len(heap),
+                day,
+                len(description),
+                code,
+                flags,
+            )
+            heap += description
+
+        sync = self._should_sync()
+        with stats.timer("file.write"), self.file_lock.exclusive(), self._lock:
+            previous = None
+            if self._map is not None or os.path.exists(self.filename):
+                with suppress(ValueError):
+                    self.open()
+                if self._map is not None:
+                    previous = self.heap_filename(self._header()[0])
+            self.close()
+            # Куча пишется первой: файл записей со ссылками на нее
+            # появляется только после того, как она полностью записана.
+            atomic_write(self.heap_filename(uid), lambda file: file.write(heap), sync, True)
+            atomic_write(self.filename, lambda file: file.write(buffer), sync, True)
+            if previous is not None:
+                with suppress(FileNotFoundError):
+                    os.remove(previous)
+            self.open()
+            self.file_lock.bump()
+        stats.count("file.rows_written", len(encoded))
+        stats.count("file.bytes_written", len(buffer) + len(heap))
+
+    def _append_description(self, description: bytes) -> Tuple[int, int]:
+        """Дописывает описание в кучу и возвращает его смещение и длину."""
+        offset = os.lseek(self._heap_descriptor, 0, os.SEEK_END)
+        os.write(self._heap_descriptor, description)
+        return offset, len(description)
+
+    def _grow(self, slots: int) -> None:
+        """Расширяет файл записей так, чтобы в нем помещалось slots слотов."""
+        capacity = max(slots, self._capacity() * 2, self._capacity() + GROWTH_SLOTS)
+        self._map.close()
+        os.ftruncate(self._file.fileno(), HEADER.size + capacity * RECORD.size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+    def save_changes(
+        self,
+        events: List[Dict[str, Any]],
+        snapshot: Optional[Callable[[], List[dict]]] = None,
+    ) -> None:
+        """
+        Применяет события изменения на месте: добавление
+        и редактирование записывают слот записи, удаление ставит
+        флаг-надгробие.
+
+        Args:
+            events (List[dict]): События изменения (add/edit/delete).
+            snapshot (Callable, optional): Не используется.
+
+        Raises:
+            ValueError: Вызывается при неизвестном типе события
+            или записи, которую нельзя сохранить в этом формате.
+        """
+        stats.count("file.rows_written", len(events))
+        with stats.timer("mmap.write"), self.file_lock.exclusive(), self._lock:
+            if self._slots() == 0 and self._map is None:
+                self.write_to_file([])
+            uid, slots, live, changes = self._header()
+            for event in events:
+                op = event["op"]
+                if op in (EVENT_ADD, EVENT_EDIT):
+                    slots, live = self._put(event["record"], slots, live)
+                elif op == EVENT_DELETE:
+                    live -= self._tombstone(event["id"], slots)
+                elif op == EVENT_RESET:
+                    self._map[HEADER.size:] = bytes(len(self._map) - HEADER.size)
+                    slots = live = 0
+                else:
+                    raise ValueError(f"Неизвестный тип события: {op}")
+                # Заголовок обновляется после каждой записи, чтобы
+                # читатели не видели слотов за его границей.
+                self._set_header(uid, slots, live, changes)
+            self._set_header(uid, slots, live, changes + 1)
+            if self._should_sync():
+                self.sync()
+            self.file_lock.bump()
+
+    def _put(self, record: Dict[str, Any], slots: int, live: int) -> Tuple[int, int]:
+        """Записывает запись в ее слот и возвращает новые счетчики."""
+        transaction_id, units, day, code, flags, description = self._encode(record)
+        slot = transaction_id - 1
+        old = self._row(slot) if slot < slots else None
+        old_live = old is not None and old[0] > 0 and not old[6] & FLAG_DELETED
+
+        if (
+            old is not None
+            and old[0] > 0
+            and old[4] == len(description)
+            and self._description(old[2], old[4]).encode("utf-8") == description
+        ):
+            offset, length = old[2], old[4]
+        else:
+            offset, length = self._append_description(description)
+
+        if slot >= self._capacity():
+            self._grow(slot + 1)
+        RECORD.pack_into(
+            self._map,
+            HEADER.size + slot * RECORD.size,
+            transaction_id,
+            units,
+            offset,
+            day,
+            length,
+            code,
+            flags,
+        )
+        return max(slots, slot + 1), live + (not old_live)
+
+    def _tombstone(self, transaction_id: int, slots: int) -> int:
+        """Помечает запись удаленной; возвращает 1, если она была."""
+        slot = transaction_id - 1
+        if not 0 <= slot < slots:
+            return 0
+        row = self._row(slot)
+        if row[0] <= 0 or row[6] & FLAG_DELETED:
+            return 0
+        self._map[HEADER.size + slot * RECORD.size + FLAGS_OFFSET] = row[6] | FLAG_DELETED
+        return 1
+
+    def sync(self) -> None:
+        """Сбрасывает на диск отображенные записи и кучу описаний."""
+        self._unsynced = 0
+        with self._lock:
+            if self._map is not None:
+                self._map.flush()
+                os.fsync(self._heap_descriptor)
+
+    def compact(self) -> None:
+        """Перезаписывает файл без удаленных записей и старых описаний."""
+        with self.file_lock.exclusive():
+            self.write_to_file(self.read_from_file())
+
+    def fingerprint(self) -> Optional[List[int]]:
+        """
+        Возвращает идентификатор файла и счетчик изменений.
+
+        Запись через отображение не обязана сразу обновлять время
+        изменения файла, поэтому используется счетчик из заголовка.
+
+        Returns:
+            Optional[List[int]]: Отпечаток состояния файла
+            или None, если файла нет.
+        """
+        with self._lock:
+            self._slots()
+            if self._map is None:
+                return None
+            uid, _, _, changes = self._header()
+            return [uid, changes]
+
+    def count(self) -> int:
+        """Возвращает количество записей."""
+        with self._lock:
+            return self._header()[2] if self._slots() else 0
+
+    def last_id(self) -> Optional[int]:
+        """Возвращает наибольший id или None, если записей нет."""
+        with self._lock:
+            for slot in range(self._slots() - 1, -1, -1):
+                row = self._row(slot)
+                if row[0] > 0 and not row[6] & FLAG_DELETED:
+                    return row[0]
+            return None
+
+    def contains(self, transaction_id: int) -> bool:
+        """
+        Проверяет наличие записи по флагам ее слота, не разбирая ее.
+
+        Args:
+            transaction_id (int): ID транзакции.
+
+        Returns:
+            bool: True, если запись есть.
+        """
+        with self._lock:
+            slot = transaction_id - 1
+            if not 0 <= slot < self._slots():
+                return False
+            row = self._row(slot)
+            return row[0] > 0 and not row[6] & FLAG_DELETED
+
+    def get(self, transaction_id: int) -> Optional[dict]:
+        """
+        Возвращает запись по id за O(1).
+
+        Args:
+            transaction_id (int): ID транзакции.
+
+        Returns:
+            Optional[dict]: Запись или None, если ее нет.
+        """
+        with self._lock:
+            if not self.contains(transaction_id):
+                return None
+            return self._decode(self._row(transaction_id - 1))
+
+    def search(
+        self,
+        category: Optional[str] = None,
+        date: Optional[str] = None,
+        amount: Optional[float] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        amount_min: Optional[float] = None,
+        amount_max: Optional[float] = None,
+        description: Optional[str] = None,
+        order_by: str = "id",
+    ) -> List[dict]:
+        """
+        Ищет записи, проверяя фильтры по полям прямо в буфере;
+        разбираются только подошедшие записи.
+
+        Args:
+            category (str, optional): Категория транзакции.
+            date (str, optional): Точная дата.
+            amount (float, optional): Точная сумма.
+            date_from (str, optional): Начальная дата интервала включительно.
+            date_to (str, optional): Конечная дата интервала включительно.
+            amount_min (float, optional): Минимальная сумма включительно.
+            amount_max (float, optional): Максимальная сумма включительно.
+            description (str, optional): Подстрока описания
+            (без учета регистра).
+            order_by (str, optional): Порядок выдачи: "id", "date"
+            или "amount".
+            По умолчанию "id".
+
+        Returns:
+            List[dict]: Найденные записи.
+        """
+        if date is not None:
+            date_from = date_to = date
+        if amount is not None:
+            amount_min = amount_max = amount
+        if category is not None and category not in CATEGORIES:
+            return []
+
+        with stats.timer("mmap.scan"), self._lock:
+            count = self._slots()
+            slots = _matching_slots(
+                self._map,
+                HEADER.size,
+                count,
+                None if category is None else CATEGORIES.index(category),
+                None if date_from is None else _date_to_day(date_from),
+                None if date_to is None else _date_to_day(date_to),
+                *minor_range(amount_min, amount_max),
+            )
+            stats.count("store.rows_scanned", self._header()[2] if slots else 0)
+            records = [self._decode(self._row(slot)) for slot in slots]
+
+        if description is not None:
+            needle = description.casefold()
+            records = [
+                record for record in records if needle in record["description"].casefold()
+            ]
+        if order_by == "date":
+            records.sort(key=lambda record: (record["date"], record["id"]))
+        elif order_by == "amount":
+            records.sort(key=lambda record: (record["amount"], record["id"]))
+        stats.count("store.rows_matched", len(records))
+        return records
+
+    def category_totals(self) -> Dict[str, float]:
+        """
+        Возвращает суммы по категориям, посчитанные по буферу
+        в копейках без разбора записей.
+
+        Returns:
+            Dict[str, float]: Суммы по категориям.
+        """
+        with stats.timer("mmap.scan"), self._lock:
+            slots = self._slots()
+            sums, present = _category_sums(self._map, HEADER.size, slots)
+        return {
+            category: from_minor_units(sums[code])
+            for code, category in enumerate(CATEGORIES)
+            if present[code]
+        }
@@ -0,0 +1,139 @@
+from decimal import ROUND_CEILING, ROUND_FLOOR, ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Any, Optional, Tuple, Union
+
+# Суммы хранятся в рублях (целое число или число с двумя знаками после
+# запятой), а суммируются в целых копейках без ошибки округления float.
+MINOR_UNITS = 100
+KOPECK = Decimal("0.01")
+
+
+def parse_amount(value: Any) -> Decimal:
+    """
+    Разбирает сумму из пользовательского ввода, округляя ее
+    до копеек. Строки разбираются сразу в Decimal, без промежуточного
+    float, поэтому "10.005" округляется до 10.01.
+
+    Args:
+        value (Any): Сумма: число, Decimal или строка.
+
+    Raises:
+        ValueError: Вызывается, если значение не является конечным числом.
+
+    Returns:
+        Decimal: Сумма в рублях с двумя знаками после запятой.
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float, str, Decimal)):
+        raise ValueError(f"Некорректная сумма: {value!r}")
+    try:
+        amount = Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError(f"Некорректная сумма: {value!r}")
+    if not amount.is_finite():
+        raise ValueError(f"Некорректная сумма: {value!r}")
+    return amount.quantize(KOPECK, rounding=ROUND_HALF_UP)
+
+
+def to_minor_units(amount: Union[int, float, str, Decimal]) -> int:
+    """
+    Переводит сумму в копейки с округлением до ближайшей копейки.
+    Целые числа и числа, уже кратные копейке, переводятся без Decimal.
+
+    Args:
+        amount (int | float | str | Decimal): Сумма в рублях.
+
+    Returns:
+        int: Сумма в копейках.
+    """
+    if type(amount) is int:
+        return amount * MINOR_UNITS
+    if type(amount) is float:
+        try:
+            units = round(amount * MINOR_UNITS)
+        except (ValueError, OverflowError):
+            raise ValueError(f"Некорректная сумма: {amount!r}")
+        if units / MINOR_UNITS == amount:
+            return units
+    value = Decimal(str(amount)) * MINOR_UNITS
+    return int(value.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def from_minor_units(amount: int) -> float:
+    """
+    Переводит сумму в копейках обратно в рубли.
+
+    Args:
+        amount (int): Сумма в копейках.
+
+    Returns:
+        float: Сумма в рублях.
+    """
+    return amount / MINOR_UNITS
+
+
+def minor_units(amount: Any) -> Optional[int]:
+    """
+    Переводит сумму записи в копейки.
+
+    Args:
+        amount (Any): Сумма записи.
+
+    Returns:
+        Optional[int]: Сумма в копейках или None, если сумма
+        не является конечным числом (например, пустая строка
+        в старых файлах).
+    """
+    if isinstance(amount, bool) or not isinstance(amount, (int, float, Decimal)):
+        return None
+    try:
+        return to_minor_units(amount)
+    except (ValueError, InvalidOperation):
+        return None
+
+
+def normalize_amount(value: Any) -> Union[int, float]:
+    """
+    Приводит сумму к виду, в котором она хранится: целые числа
+    остаются целыми, остальные суммы округляются до копеек.
+
+    Args:
+        value (Any): Сумма: число, Decimal или строка.
+
+    Raises:
+        ValueError: Вызывается, если значение не является конечным числом.
+
+    Returns:
+        int | float: Нормализованная сумма в рублях.
+    """
+    if type(value) is int:
+        return value
+    if type(value) is float:
+        units = minor_units(value)
+        if units is None:
+            raise ValueError(f"Некорректная сумма: {value!r}")
+        return from_minor_units(units)
+    return from_minor_units(int(parse_amount(value) * MINOR_UNITS))
+
+
+def minor_bound(value: Optional[Any], rounding: str) -> Optional[int]:
+    """
+    Переводит границу интервала сумм в копейки с округлением внутрь.
+
+    Args:
+        value (Any, optional): Граница в рублях.
+        rounding (str): ROUND_CEILING для нижней границы
+        и ROUND_FLOOR для верхней.
+
+    Returns:
+        Optional[int]: Граница в копейках или None без границы.
+    """
+    if value is None:
+        return None
+    units = Decimal(str(value)) * MINOR_UNITS
+    return int(units.to_integral_value(rounding=rounding))
+
+
+def minor_range(
+    minimum: Optional[Any], maximum: Optional[Any]
+) -> Tuple[Optional[int], Optional[int]]:
+    """Переводит интервал сумм [minimum, maximum] в копейки."""
+    return minor_bound(minimum, ROUND_CEILING), minor_bound(maximum, ROUND_FLOOR)
@@ -0,0 +1,75 @@
+import sys
+from dataclasses import dataclass, field
+from typing import Any, List
+
+from .money import minor_units, normalize_amount
+from .storage import get_file_manager
+
+
+@dataclass
+class MigrationReport:
+    """
+    Итоги перевода файла транзакций к нормализованным суммам.
+
+    Attributes:
+        total (int): Количество записей в файле.
+        changed (int): Количество исправленных сумм.
+        invalid (List[Any]): ID записей с нечисловой суммой. Такие
+        записи не учитываются в итогах и остаются без изменений.
+    """
+
+    total: int = 0
+    changed: int = 0
+    invalid: List[Any] = field(default_factory=list)
+
+
+def migrate_amounts(path: str) -> MigrationReport:
+    """
+    Нормализует суммы в существующем файле транзакций: суммы
+    с лишними знаками после запятой или с ошибкой округления
+    (например, 0.30000000000000004) округляются до копеек, целые
+    суммы остаются целыми. Файл любого формата читается и, если
+    суммы изменились, перезаписывается под исключительной блокировкой.
+    Сохраненные рядом суммы по категориям прежнего формата (в рублях)
+    пересчитываются при следующем открытии файла.
+
+    Args:
+        path (str): Путь к файлу транзакций.
+
+    Returns:
+        MigrationReport: Итоги перевода.
+    """
+    manager = get_file_manager(path)
+    report = MigrationReport()
+    try:
+        with manager.file_lock.exclusive():
+            records = manager.read_from_file()
+            for record in records:
+                amount = record.get("amount")
+                if minor_units(amount) is None:
+                    report.invalid.append(record.get("id"))
+                    continue
+                normalized = normalize_amount(amount)
+                if type(normalized) is not type(amount) or normalized != amount:
+                    record["amount"] = normalized
+                    report.changed += 1
+            report.total = len(records)
+            if report.changed:
+                manager.write_to_file(records)
+    finally:
+        close = getattr(manager, "close", None)
+        if close is not None:
+            close()
+    return report
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("Использование: python -m src.utils.money_migration <файл транзакций>")
+    report = migrate_amounts(sys.argv[1])
+    print(f"Записей: {report.total}, исправлено сумм: {report.changed}")
+    if report.invalid:
+        print(
+            "Нечисловые суммы (не учитываются в балансе): "
+            + ", ".join(map(str, report.invalid))
+        )
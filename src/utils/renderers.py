@@ -0,0 +1,474 @@
+import json
+import sys
+import threading
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Optional, TextIO, Tuple, TypeVar
+
+if TYPE_CHECKING:
+    from ..balance.reports import BalanceReport, PeriodBalance
+    from ..transactions.bulk_import import ImportReport
+    from ..transactions.transaction import Transaction
+
+T = TypeVar("T")
+
+BUFFER_LINES = 1000
+TABLE_COLUMNS = (
+    ("id", "ID", 6),
+    ("date", "Дата", 10),
+    ("category", "Категория", 9),
+    ("amount", "Сумма", 12),
+    ("description", "Описание", 0),
+)
+
+
+@dataclass
+class BulkWriter:
+    """
+    Буферизованный вывод строк.
+
+    Строки копятся в списке и выводятся одним вызовом `write`
+    на каждые `buffer_lines` строк, а не отдельным вызовом на строку.
+    Если поток не указан, используется текущий `sys.stdout`.
+
+    Attributes:
+        stream (TextIO, optional): Поток вывода. По умолчанию sys.stdout.
+        buffer_lines (int): Количество строк в одной записи в поток.
+    """
+
+    stream: Optional[TextIO] = None
+    buffer_lines: int = BUFFER_LINES
+    _lines: List[str] = field(default_factory=list, init=False, repr=False)
+
+    def line(self, text: str = "") -> None:
+        """Добавляет строку в буфер."""
+        self._lines.append(text)
+        if len(self._lines) >= self.buffer_lines:
+            self.flush()
+
+    def lines(self, texts: Iterable[str]) -> None:
+        """Добавляет строки в буфер."""
+        for text in texts:
+            self.line(text)
+
+    def flush(self) -> None:
+        """Выводит накопленные строки одной записью."""
+        if not self._lines:
+            return
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write("\n".join(self._lines) + "\n")
+        self._lines.clear()
+
+
+class Renderer:
+    """
+    Вывод результатов менеджеров.
+
+    Менеджеры возвращают результаты операций, а показывают их через
+    рендерер. Базовый рендерер ничего не выводит, поэтому подходит
+    для программных вызовов в циклах; наследники переопределяют
+    нужные методы.
+    """
+
+    def transaction(self, transaction: "Transaction") -> None:
+        """Выводит одну транзакцию."""
+
+    def transactions(self, transactions: Iterable["Transaction"]) -> int:
+        """
+        Выводит транзакции.
+
+        Returns:
+            int: Количество выведенных транзакций.
+        """
+        return sum(1 for _ in transactions)
+
+    def added(self, transaction: "Transaction") -> None:
+        """Сообщает о добавлении транзакции."""
+
+    def deleted(
+        self,
+        transaction_id: int,
+        transaction: Optional["Transaction"],
+    ) -> None:
+        """Сообщает об удалении транзакции (None - запись не найдена)."""
+
+    def edited(
+        self,
+        transaction_id: int,
+        transaction: Optional["Transaction"],
+    ) -> None:
+        """Сообщает об изменении транзакции (None - запись не найдена)."""
+
+    def no_criteria(self) -> None:
+        """Сообщает, что не указаны критерии поиска."""
+
+    def search_results(self, transactions: List["Transaction"]) -> None:
+        """Выводит результаты поиска."""
+
+    def import_report(self, report: "ImportReport") -> None:
+        """Выводит итоги импорта."""
+
+    def exported(self, path: str, count: int) -> None:
+        """Сообщает о выгрузке записей в файл."""
+
+    def balance(
+        self,
+        report: "BalanceReport",
+        show_income: bool = False,
+        show_expense: bool = False,
+    ) -> None:
+        """Выводит баланс или суммы доходов и расходов."""
+
+    def period_report(self, periods: List["PeriodBalance"]) -> None:
+        """Выводит доходы, расходы и баланс по периодам."""
+
+
+@dataclass
+class BufferedRenderer(Renderer):
+    """
+    Вывод, придержанный до подтверждения.
+
+    Вызовы запоминаются отдельно для каждого потока и передаются
+    рендереру `target` одной группой при `commit()` или отбрасываются
+    `discard()`, например, если изменение откатилось и будет выполнено
+    заново. Группы из разных потоков выводятся по очереди
+    и не перемешиваются.
+
+    Attributes:
+        target (Renderer): Рендерер, которому передается вывод.
+    """
+
+    target: Renderer
+    _local: threading.local = field(default_factory=threading.local, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    @property
+    def _calls(self) -> List[Tuple[str, tuple]]:
+        """Вызовы, придержанные в текущем потоке."""
+        calls = getattr(self._local, "calls", None)
+        if calls is None:
+            calls = self._local.calls = []
+        return calls
+
+    def _defer(self, method: str, *args: Any) -> None:
+        """Запоминает вызов метода рендерера."""
+        self._calls.append((method, args))
+
+    def discard(self) -> None:
+        """Отбрасывает вывод, придержанный в текущем потоке."""
+        self._local.calls = []
+
+    def commit(self) -> None:
+        """Передает вывод, придержанный в текущем потоке, рендереру `target`."""
+        calls, self._local.calls = self._calls, []
+        with self._lock:
+            for method, args in calls:
+                getattr(self.target, method)(*args)
+
+    def call(self, function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Выполняет функцию и выводит ее результаты одной группой.
+        Если функция завершилась ошибкой, ее вывод отбрасывается.
+
+        Args:
+            function (Callable): Функция, выводящая результаты.
+            *args: Позиционные аргументы функции.
+            **kwargs: Именованные аргументы функции.
+
+        Returns:
+            T: Результат функции.
+        """
+        self.discard()
+        try:
+            result = function(*args, **kwargs)
+        except BaseException:
+            self.discard()
+            raise
+        self.commit()
+        return result
+
+    def transaction(self, transaction: "Transaction") -> None:
+        self._defer("transaction", transaction)
+
+    def transactions(self, transactions: Iterable["Transaction"]) -> int:
+        transactions = list(transactions)
+        self._defer("transactions", transactions)
+        return len(transactions)
+
+    def added(self, transaction: "Transaction") -> None:
+        self._defer("added", transaction)
+
+    def deleted(self, transaction_id: int, transaction: Optional["Transaction"]) -> None:
+        self._defer("deleted", transaction_id, transaction)
+
+    def edited(self, transaction_id: int, transaction: Optional["Transaction"]) -> None:
+        self._defer("edited", transaction_id, transaction)
+
+    def no_criteria(self) -> None:
+        self._defer("no_criteria")
+
+    def search_results(self, transactions: List["Transaction"]) -> None:
+        self._defer("search_results", transactions)
+
+    def import_report(self, report: "ImportReport") -> None:
+        self._defer("import_report", report)
+
+    def exported(self, path: str, count: int) -> None:
+        self._defer("exported", path, count)
+
+    def balance(
+        self,
+        report: "BalanceReport",
+        show_income: bool = False,
+        show_expense: bool = False,
+    ) -> None:
+        self._defer("balance", report, show_income, show_expense)
+
+    def period_report(self, periods: List["PeriodBalance"]) -> None:
+        self._defer("period_report", periods)
+
+
+@dataclass
+class ConsoleRenderer(Renderer):
+    """
+    Вывод в консоль в формате интерактивного приложения.
+
+    Attributes:
+        writer (BulkWriter): Буферизованный вывод строк.
+        По умолчанию в текущий sys.stdout.
+    """
+
+    writer: BulkWriter = field(default_factory=BulkWriter)
+
+    def _message(self, *lines: str) -> None:
+        """Выводит сообщение между пустыми строками."""
+        self.writer.lines(("", *lines, ""))
+        self.writer.flush()
+
+    def _row(self, transaction: "Transaction") -> None:
+        """Добавляет в буфер строки одной транзакции."""
+        self.writer.line(str(transaction))
+
+    def transaction(self, transaction: "Transaction") -> None:
+        self.writer.line()
+        self._row(transaction)
+        self.writer.flush()
+
+    def transactions(self, transactions: Iterable["Transaction"]) -> int:
+        count = 0
+        for transaction in transactions:
+            self._row(transaction)
+            count += 1
+        self.writer.flush()
+        return count
+
+    def added(self, transaction: "Transaction") -> None:
+        self._message("Запись успешно добавлена.")
+
+    def deleted(
+        self,
+        transaction_id: int,
+        transaction: Optional["Transaction"],
+    ) -> None:
+        if transaction is None:
+            self._message(f"Запись с ID {transaction_id} не найдена.")
+        else:
+            self._message(f"Запись с ID {transaction_id} успешно удалена.")
+
+    def edited(
+        self,
+        transaction_id: int,
+        transaction: Optional["Transaction"],
+    ) -> None:
+        if transaction is None:
+            self._message(f"Запись с ID {transaction_id} не найдена.")
+            return
+        self.writer.lines(("", "Запись успешно отредактирована."))
+        self._row(transaction)
+        self.writer.flush()
+
+    def no_criteria(self) -> None:
+        self._message(
+            "Не указаны критерии поиска.  Укажите хотя бы один критерий поиска."
+        )
+
+    def search_results(self, transactions: List["Transaction"]) -> None:
+        if not transactions:
+            self._message("По заданному критерию поиска результаты не обнаружены.")
+            return
+        self.writer.lines(("", "Результаты поиска:", ""))
+        self.transactions(transactions)
+
+    def import_report(self, report: "ImportReport") -> None:
+        self.writer.lines(("", str(report)))
+        self.writer.flush()
+
+    def exported(self, path: str, count: int) -> None:
+        self._message(f"Выгружено записей: {count} в файл {path}.")
+
+    def balance(
+        self,
+        report: "BalanceReport",
+        show_income: bool = False,
+        show_expense: bool = False,
+    ) -> None:
+        if show_income:
+            self.writer.lines((f"Доходы: {report.income}", ""))
+        if show_expense:
+            self.writer.lines((f"Расходы: {report.expense}", ""))
+        if not show_income and not show_expense:
+            self.writer.lines((f"Текущий баланс: {report.balance}", ""))
+        self.writer.flush()
+
+    def period_report(self, periods: List["PeriodBalance"]) -> None:
+        if not periods:
+            self.writer.lines(("Нет записей за выбранный период.", ""))
+        for period in periods:
+            self.writer.line(
+                f"{period.period}: "
+                f"доходы {period.income}, "
+                f"расходы {period.expense}, "
+                f"баланс на конец периода {period.balance}"
+            )
+        if periods:
+            self.writer.line()
+        self.writer.flush()
+
+
+@dataclass
+class TableRenderer(ConsoleRenderer):
+    """
+    Вывод транзакций в консоль таблицей: по строке на транзакцию.
+    Сообщения выводятся так же, как в ConsoleRenderer.
+    """
+
+    def _header(self) -> None:
+        """Добавляет в буфер заголовок таблицы."""
+        self.writer.line(
+            " ".join(
+                title.ljust(width) if width else title
+                for _, title, width in TABLE_COLUMNS
+            ).rstrip()
+        )
+
+    def _row(self, transaction: "Transaction") -> None:
+        self.writer.line(
+            " ".join(
+                str(getattr(transaction, name)).ljust(width)
+                if width
+                else str(getattr(transaction, name))
+                for name, _, width in TABLE_COLUMNS
+            )
+        )
+
+    def transactions(self, transactions: Iterable["Transaction"]) -> int:
+        self._header()
+        return super().transactions(transactions)
+
+    def transaction(self, transaction: "Transaction") -> None:
+        self.writer.line()
+        self._header()
+        self._row(transaction)
+        self.writer.flush()
+
+
+@dataclass
+class JsonLinesRenderer(Renderer):
+    """
+    Машиночитаемый вывод: по объекту JSON на строку.
+
+    Транзакции выводятся словарями записей, остальные результаты -
+    объектами с полем "event".
+
+    Attributes:
+        writer (BulkWriter): Буферизованный вывод строк.
+        По умолчанию в текущий sys.stdout.
+    """
+
+    writer: BulkWriter = field(default_factory=BulkWriter)
+
+    def _emit(self, value: Any) -> None:
+        """Добавляет в буфер объект JSON."""
+        self.writer.line(json.dumps(value, ensure_ascii=False))
+
+    def _event(self, event: str, **data: Any) -> None:
+        """Выводит событие."""
+        self._emit({"event": event, **data})
+        self.writer.flush()
+
+    def transaction(self, transaction: "Transaction") -> None:
+        self._emit(transaction.to_dict())
+        self.writer.flush()
+
+    def transactions(self, transactions: Iterable["Transaction"]) -> int:
+        count = 0
+        for transaction in transactions:
+            self._emit(transaction.to_dict())
+            count += 1
+        self.writer.flush()
+        return count
+
+    def added(self, transaction: "Transaction") -> None:
+        self._event("added", record=transaction.to_dict())
+
+    def deleted(
+        self,
+        transaction_id: int,
+        transaction: Optional["Transaction"],
+    ) -> None:
+        self._event(
+            "deleted" if transaction is not None else "not_found",
+            id=transaction_id,
+        )
+
+    def edited(
+        self,
+        transaction_id: int,
+        transaction: Optional["Transaction"],
+    ) -> None:
+        if transaction is None:
+            self._event("not_found", id=transaction_id)
+        else:
+            self._event("edited", record=transaction.to_dict())
+
+    def no_criteria(self) -> None:
+        self._event("no_criteria")
+
+    def search_results(self, transactions: List["Transaction"]) -> None:
+        self.transactions(transactions)
+
+    def import_report(self, report: "ImportReport") -> None:
+        self._event(
+            "imported",
+            imported=report.imported,
+            rejected=report.rejected,
+            seconds=report.seconds,
+            errors=report.errors,
+        )
+
+    def exported(self, path: str, count: int) -> None:
+        self._event("exported", path=path, count=count)
+
+    def balance(
+        self,
+        report: "BalanceReport",
+        show_income: bool = False,
+        show_expense: bool = False,
+    ) -> None:
+        self._event(
+            "balance",
+            income=report.income,
+            expense=report.expense,
+            balance=report.balance,
+        )
+
+    def period_report(self, periods: List["PeriodBalance"]) -> None:
+        for period in periods:
+            self._emit(
+                {
+                    "period": period.period,
+                    "income": period.income,
+                    "expense": period.expense,
+                    "balance": period.balance,
+                }
+            )
+        self.writer.flush()
@@ -0,0 +1,723 @@
+import gzip
+import heapq
+import json
+import os
+import struct
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from contextlib import suppress
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .file_manager import COMPACT_SEPARATORS, FileManager, atomic_write
+from .instrumentation import stats
+from .journal_manager import EVENT_ADD, EVENT_DELETE, EVENT_EDIT, EVENT_RESET
+from .money import from_minor_units, to_minor_units
+
+MANIFEST = "manifest.json"
+# Индекс id: для id N в позиции N - 1 хранится код месяца его сегмента
+# (год * 12 + месяц, 0 - записи нет), по два байта little-endian.
+INDEX = "ids.bin"
+INDEX_CODE = struct.Struct("<H")
+SEGMENT_EXTENSION = ".json"
+COMPRESSED_EXTENSION = ".json.gz"
+FORMAT_VERSION = 1
+
+
+def segment_key(value: Any) -> str:
+    """
+    Возвращает ключ сегмента (месяц гггг-мм) для даты записи.
+
+    Args:
+        value (str | date): Дата (гггг-мм-дд).
+
+    Raises:
+        ValueError: Вызывается, если дата некорректна.
+
+    Returns:
+        str: Ключ сегмента.
+    """
+    try:
+        day = value if isinstance(value, date) else date.fromisoformat(str(value))
+    except ValueError as e:
+        raise ValueError(f"Некорректная дата для сегмента: {value}") from e
+    return f"{day.year:04d}-{day.month:02d}"
+
+
+def _shift_month(key: str, months: int) -> str:
+    """Сдвигает ключ месяца на указанное число месяцев."""
+    index = int(key[:4]) * 12 + int(key[5:7]) - 1 + months
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def _month_code(key: str) -> int:
+    """Возвращает код месяца для индекса id."""
+    return int(key[:4]) * 12 + int(key[5:7])
+
+
+def _month_key(code: int) -> str:
+    """Возвращает ключ месяца по коду из индекса id."""
+    return _shift_month("0000-01", code - 1)
+
+
+def _index_bytes(codes: array) -> bytes:
+    """Сериализует коды индекса id в little-endian."""
+    if sys.byteorder == "big":
+        codes = array("H", codes)
+        codes.byteswap()
+    return codes.tobytes()
+
+
+def _has_amount(record: Dict[str, Any]) -> bool:
+    """Есть ли у записи числовая сумма."""
+    amount = record["amount"]
+    return not isinstance(amount, bool) and isinstance(amount, (int, float))
+
+
+def _describe(records: Dict[int, dict], compressed: bool) -> Dict[str, Any]:
+    """Строит описание сегмента для манифеста."""
+    totals: Dict[str, int] = {}
+    for record in records.values():
+        category = record["category"]
+        amount = to_minor_units(record["amount"]) if _has_amount(record) else 0
+        totals[category] = totals.get(category, 0) + amount
+    return {
+        "count": len(records),
+        "min_id": min(records),
+        "max_id": max(records),
+        "totals": totals,
+        "compressed": compressed,
+    }
+
+
+@dataclass
+class ShardedFileManager(FileManager):
+    """
+    Хранение транзакций в каталоге сегментов по месяцам.
+
+    Каждый месяц хранится в своем файле-сегменте (`гггг-мм.json`,
+    JSON-массив записей месяца в порядке id), а манифест
+    (`manifest.json`) описывает сегменты: число записей, интервал id
+    и суммы по категориям в копейках. Индекс id (`ids.bin`) хранит
+    месяц каждой записи, поэтому запись по id читается из одного
+    сегмента. Изменение перезаписывает только сегменты затронутых
+    месяцев и манифест, а в индексе id - только позиции измененных
+    записей. Поиск с интервалом дат
+    читает только сегменты попавших в него месяцев, а суммы
+    по категориям считаются по манифесту без чтения сегментов.
+    Сегменты старше `cold_after` месяцев от последнего сжимаются
+    gzip (`гггг-мм.json.gz`).
+
+    Attributes:
+        filename (str): Путь к каталогу сегментов.
+        cold_after (int): Через сколько месяцев после последнего
+        сегмент считается холодным и сжимается. По умолчанию 12.
+        cache_segments (int): Сколько прочитанных сегментов держать
+        в памяти. По умолчанию 12.
+    """
+
+    cold_after: int = field(default=12, kw_only=True)
+    cache_segments: int = field(default=12, kw_only=True)
+
+    def __post_init__(self):
+        """
+        Пост-инициализация объекта ShardedFileManager.
+
+        Читает манифест, если каталог уже существует.
+        """
+        self._lock = threading.RLock()
+        self._cache: "OrderedDict[str, Dict[int, dict]]" = OrderedDict()
+        self._codes: Optional[array] = None
+        self.open()
+
+    @property
+    def manifest_filename(self) -> str:
+        """Путь к манифесту."""
+        return os.path.join(self.filename, MANIFEST)
+
+    @property
+    def index_filename(self) -> str:
+        """Путь к индексу id."""
+        return os.path.join(self.filename, INDEX)
+
+    def segment_filename(self, key: str, compressed: bool = False) -> str:
+        """
+        Возвращает путь к файлу сегмента.
+
+        Args:
+            key (str): Ключ сегмента (гггг-мм).
+            compressed (bool, optional): Сжатый сегмент. По умолчанию False.
+
+        Returns:
+            str: Путь к файлу сегмента.
+        """
+        extension = COMPRESSED_EXTENSION if compressed else SEGMENT_EXTENSION
+        return os.path.join(self.filename, f"{key}{extension}")
+
+    def open(self) -> None:
+        """
+        Заново читает манифест и сбрасывает кэш сегментов.
+
+        Нужно после того, как каталог изменил другой процесс.
+
+        Raises:
+            ValueError: Вызывается, если манифест поврежден.
+        """
+        with self._lock:
+            self._cache.clear()
+            self._codes = None
+            self._manifest: Optional[Dict[str, Any]] = None
+            try:
+                with open(self.manifest_filename, "r", encoding="utf-8") as file:
+                    manifest = json.load(file)
+            except FileNotFoundError:
+                return
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Манифест {self.manifest_filename} поврежден: {e}") from e
+            if manifest.get("format") != FORMAT_VERSION:
+                raise ValueError(
+                    f"Манифест {self.manifest_filename} поврежден: неизвестный формат."
+                )
+            self._manifest = manifest
+
+    def _refresh(self) -> None:
+        """Перечитывает манифест, если каталог изменил другой процесс."""
+        current = None
+        if self._manifest is not None:
+            current = [self._manifest["uid"], self._manifest["changes"]]
+        if self.fingerprint() != current:
+            self.open()
+
+    def close(self) -> None:
+        """Освобождает кэш прочитанных сегментов."""
+        with self._lock:
+            self._cache.clear()
+
+    @property
+    def _segments(self) -> Dict[str, Dict[str, Any]]:
+        """Описания сегментов из манифеста."""
+        return {} if self._manifest is None else self._manifest["segments"]
+
+    def segments(
+        self,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Возвращает ключи сегментов, пересекающихся с интервалом дат.
+
+        Args:
+            date_from (str, optional): Начальная дата интервала включительно.
+            date_to (str, optional): Конечная дата интервала включительно.
+
+        Returns:
+            List[str]: Ключи сегментов по возрастанию.
+        """
+        first = None if date_from is None else segment_key(date_from)
+        last = None if date_to is None else segment_key(date_to)
+        with self._lock:
+            return [
+                key
+                for key in sorted(self._segments)
+                if (first is None or key >= first) and (last is None or key <= last)
+            ]
+
+    def _read_segment(self, key: str) -> Dict[int, dict]:
+        """Читает сегмент с диска и возвращает записи по id."""
+        compressed = self._segments[key]["compressed"]
+        filename = self.segment_filename(key, compressed)
+        with stats.timer("shards.read"):
+            try:
+                if compressed:
+                    with gzip.open(filename, "rt", encoding="utf-8") as file:
+                        records = json.load(file)
+                else:
+                    with open(filename, "r", encoding="utf-8") as file:
+                        records = json.load(file)
+            except (OSError, EOFError, json.JSONDecodeError) as e:
+                raise ValueError(f"Сегмент {filename} поврежден: {e}") from e
+        stats.count("shards.segments_read")
+        stats.count("file.rows_read", len(records))
+        return {record["id"]: record for record in records}
+
+    def _segment(self, key: str) -> Dict[int, dict]:
+        """Возвращает записи сегмента, читая его при первом обращении."""
+        records = self._cache.get(key)
+        if records is not None:
+            self._cache.move_to_end(key)
+            return records
+        records = self._cache[key] = self._read_segment(key)
+        while len(self._cache) > self.cache_segments:
+            self._cache.popitem(last=False)
+        return records
+
+    def cached_records(self) -> int:
+        """Возвращает число записей в кэше прочитанных сегментов."""
+        with self._lock:
+            return sum(len(records) for records in self._cache.values())
+
+    def _index(self) -> array:
+        """
+        Возвращает коды месяцев индекса id, читая его при первом
+        обращении. Отсутствующий индекс строится по сегментам
+        и записывается при следующем сохранении.
+        """
+        if self._codes is not None:
+            return self._codes
+        codes = array("H")
+        try:
+            with open(self.index_filename, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            for key in self._segments:
+                code = _month_code(key)
+                for transaction_id in self._read_segment(key):
+                    if transaction_id > len(codes):
+                        codes.extend([0] * (transaction_id - len(codes)))
+                    codes[transaction_id - 1] = code
+            self._index_stale = True
+        else:
+            codes.frombytes(data[:len(data) // 2 * 2])
+            if sys.byteorder == "big":
+                codes.byteswap()
+            self._index_stale = False
+        self._codes = codes
+        return codes
+
+    def _locate(self, transaction_id: int) -> Optional[str]:
+        """Находит ключ сегмента записи по индексу id."""
+        codes = self._index()
+        if not 0 < transaction_id <= len(codes) or not codes[transaction_id - 1]:
+            return None
+        key = _month_key(codes[transaction_id - 1])
+        if key in self._segments and transaction_id in self._segment(key):
+            return key
+        # Индекс разошелся с сегментами (например, после сбоя между
+        # их записью): ищем по интервалам id из манифеста.
+        for key in sorted(self._segments, reverse=True):
+            segment = self._segments[key]
+            if segment["min_id"] <= transaction_id <= segment["max_id"]:
+                if transaction_id in self._segment(key):
+                    return key
+        return None
+
+    def read_from_file(self) -> List[dict]:
+        """
+        Считывает все записи из всех сегментов.
+
+        Returns:
+            List[dict]: Список записей в порядке id.
+        """
+        with stats.timer("shards.read_all"):
+            return list(self.iter_records())
+
+    def _segment_records(self, key: str) -> List[dict]:
+        """Читает записи сегмента в порядке id, не вытесняя кэш."""
+        with self._lock:
+            if key not in self._segments:
+                return []
+            records = self._cache.get(key) or self._read_segment(key)
+            return [records[i] for i in sorted(records)]
+
+    def _id_runs(self) -> List[List[str]]:
+        """
+        Группирует сегменты в серии с пересекающимися интервалами id.
+        Серии следуют друг за другом по возрастанию id.
+        """
+        with self._lock:
+            bounds = sorted(
+                (segment["min_id"], segment["max_id"], key)
+                for key, segment in self._segments.items()
+            )
+        runs: List[List[str]] = []
+        run_max = None
+        for min_id, max_id, key in bounds:
+            if run_max is None or min_id > run_max:
+                runs.append([])
+                run_max = max_id
+            runs[-1].append(key)
+            run_max = max(run_max, max_id)
+        return runs
+
+    def iter_records(self) -> Iterator[dict]:
+        """
+        Последовательно выдает записи в порядке id, как и остальные
+        менеджеры хранения. Сегменты с непересекающимися интервалами
+        id (обычный случай: записи добавляются по порядку дат) читаются
+        по одному; сегменты, интервалы id которых пересекаются (записи
+        задним числом), читаются вместе и сливаются по id.
+
+        Returns:
+            Iterator[dict]: Записи в порядке id.
+        """
+        for run in self._id_runs():
+            if len(run) == 1:
+                yield from self._segment_records(run[0])
+            else:
+                yield from heapq.merge(
+                    *(self._segment_records(key) for key in run),
+                    key=lambda record: record["id"],
+                )
+
+    def _write_segment(
+        self,
+        key: str,
+        records: Dict[int, dict],
+        cold_before: str,
+        sync: bool,
+    ) -> None:
+        """
+        Записывает сегмент (или удаляет пустой) и обновляет его
+        описание в манифесте. Сегменты месяцев до `cold_before`
+        сжимаются.
+        """
+        segments = self._segments
+        previous = segments.get(key)
+        compressed = key < cold_before
+        if not records:
+            segments.pop(key, None)
+            self._cache.pop(key, None)
+        else:
+            data = [records[i] for i in sorted(records)]
+            payload = json.dumps(
+                data, ensure_ascii=False, separators=COMPACT_SEPARATORS
+            ).encode("utf-8")
+            if compressed:
+                payload = gzip.compress(payload, mtime=0)
+            atomic_write(
+                self.segment_filename(key, compressed),
+                lambda file: file.write(payload),
+                sync,
+                True,
+            )
+            stats.count("file.rows_written", len(data))
+            stats.count("file.bytes_written", len(payload))
+            segments[key] = _describe(records, compressed)
+            self._cache[key] = records
+            self._cache.move_to_end(key)
+        if previous is not None and (not records or previous["compressed"] != compressed):
+            with suppress(FileNotFoundError):
+                os.remove(self.segment_filename(key, previous["compressed"]))
+
+    def _cold_before(self, keys: List[str]) -> str:
+        """Возвращает ключ первого месяца, сегменты до которого холодные."""
+        return _shift_month(max(keys), -self.cold_after) if keys else ""
+
+    def _write_index(self, changed: Dict[int, int], sync: bool) -> None:
+        """
+        Записывает коды месяцев измененных записей на их позиции
+        в индексе id; весь индекс перезаписывается, только если его
+        не было на диске.
+        """
+        codes = self._index()
+        for transaction_id, code in changed.items():
+            if transaction_id > len(codes):
+                codes.extend([0] * (transaction_id - len(codes)))
+            codes[transaction_id - 1] = code
+        if self._index_stale:
+            payload = _index_bytes(codes)
+            atomic_write(self.index_filename, lambda file: file.write(payload), sync, True)
+            self._index_stale = False
+            return
+        with open(self.index_filename, "r+b") as file:
+            for transaction_id, code in sorted(changed.items()):
+                file.seek((transaction_id - 1) * INDEX_CODE.size)
+                file.write(INDEX_CODE.pack(code))
+            if sync:
+                file.flush()
+                os.fsync(file.fileno())
+
+    def _write_manifest(self, sync: bool) -> None:
+        """Записывает манифест: он меняется последним, после сегментов."""
+        manifest = self._manifest
+
+        def write(file) -> None:
+            json.dump(manifest, file, ensure_ascii=False, separators=COMPACT_SEPARATORS)
+
+        atomic_write(self.manifest_filename, write, sync)
+
+    def _new_manifest(self) -> Dict[str, Any]:
+        """Создает пустой манифест с новым идентификатором каталога."""
+        return {
+            "format": FORMAT_VERSION,
+            "uid": int.from_bytes(os.urandom(8), "little"),
+            "changes": 0,
+            "segments": {},
+        }
+
+    def write_to_file(self, data: List[Any]) -> None:
+        """
+        Перезаписывает все сегменты под исключительной блокировкой
+        и увеличивает версию файла.
+
+        Args:
+            data (List[Any]): Список записей.
+        """
+        months: Dict[str, Dict[int, dict]] = {}
+        for record in data:
+            months.setdefault(segment_key(record["date"]), {})[record["id"]] = record
+
+        sync = self._should_sync()
+        with stats.timer("file.write"), self.file_lock.exclusive(), self._lock:
+            os.makedirs(self.filename, exist_ok=True)
+            with suppress(ValueError):
+                self.open()
+            stale = dict(self._segments)
+            self._manifest = self._new_manifest()
+            self._codes = array("H")
+            self._index_stale = True
+            cold_before = self._cold_before(list(months))
+            for key in sorted(months):
+                self._write_segment(key, months[key], cold_before, sync)
+            self._write_index(
+                {
+                    transaction_id: _month_code(key)
+                    for key, records in months.items()
+                    for transaction_id in records
+                },
+                sync,
+            )
+            for key, segment in stale.items():
+                if self._segments.get(key, {}).get("compressed") != segment["compressed"]:
+                    with suppress(FileNotFoundError):
+                        os.remove(self.segment_filename(key, segment["compressed"]))
+            self._write_manifest(sync)
+            self.file_lock.bump()
+
+    def save_changes(
+        self,
+        events: List[Dict[str, Any]],
+        snapshot: Optional[Callable[[], List[dict]]] = None,
+    ) -> None:
+        """
+        Применяет события изменения, перезаписывая только сегменты
+        затронутых месяцев и манифест.
+
+        Запись, дата которой переехала в другой месяц, удаляется
+        из старого сегмента и добавляется в новый.
+
+        Args:
+            events (List[dict]): События изменения (add/edit/delete).
+            snapshot (Callable, optional): Не используется.
+
+        Raises:
+            ValueError: Вызывается при неизвестном типе события
+            или некорректной дате записи.
+        """
+        sync = self._should_sync()
+        with stats.timer("shards.write"), self.file_lock.exclusive(), self._lock:
+            self._refresh()
+            if self._manifest is None:
+                os.makedirs(self.filename, exist_ok=True)
+                self._manifest = self._new_manifest()
+            touched: Dict[str, Dict[int, dict]] = {}
+            changed: Dict[int, int] = {}
+
+            def segment(key: str) -> Dict[int, dict]:
+                if key not in touched:
+                    touched[key] = (
+                        dict(self._segment(key)) if key in self._segments else {}
+                    )
+                return touched[key]
+
+            def locate(transaction_id: int) -> Optional[str]:
+                for key, records in touched.items():
+                    if transaction_id in records:
+                        return key
+                key = self._locate(transaction_id)
+                # Запись могла уйти из сегмента в этом же блоке.
+                if key in touched and transaction_id not in touched[key]:
+                    return None
+                return key
+
+            for event in events:
+                op = event["op"]
+                if op in (EVENT_ADD, EVENT_EDIT):
+                    record = event["record"]
+                    key = segment_key(record["date"])
+                    old = locate(record["id"])
+                    if old is not None and old != key:
+                        segment(old).pop(record["id"], None)
+                    segment(key)[record["id"]] = record
+                    changed[record["id"]] = _month_code(key)
+                elif op == EVENT_DELETE:
+                    old = locate(event["id"])
+                    if old is not None:
+                        segment(old).pop(event["id"], None)
+                        changed[event["id"]] = 0
+                elif op == EVENT_RESET:
+                    for key in [*self._segments, *touched]:
+                        segment(key).clear()
+                    changed.clear()
+                    self._codes = array("H")
+                    self._index_stale = True
+                else:
+                    raise ValueError(f"Неизвестный тип события: {op}")
+
+            keys = {key for key in self._segments if key not in touched}
+            keys.update(key for key, records in touched.items() if records)
+            cold_before = self._cold_before(list(keys))
+            for key in sorted(touched):
+                self._write_segment(key, touched[key], cold_before, sync)
+            self._compress_cold(cold_before, sync)
+            self._write_index(changed, sync)
+            stats.count("shards.segments_written", len(touched))
+            self._manifest["changes"] += 1
+            self._write_manifest(sync)
+            self.file_lock.bump()
+
+    def _compress_cold(self, cold_before: str, sync: bool) -> None:
+        """Сжимает сегменты, ставшие холодными после появления новых месяцев."""
+        segments = self._segments
+        for key in sorted(segments):
+            if key >= cold_before:
+                break
+            if not segments[key]["compressed"]:
+                self._write_segment(key, self._segment(key), cold_before, sync)
+
+    def fingerprint(self) -> Optional[List[int]]:
+        """
+        Возвращает идентификатор каталога и счетчик изменений из манифеста.
+
+        Returns:
+            Optional[List[int]]: Отпечаток состояния каталога
+            или None, если манифеста нет.
+        """
+        try:
+            with open(self.manifest_filename, "r", encoding="utf-8") as file:
+                manifest = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return [manifest.get("uid"), manifest.get("changes")]
+
+    def count(self) -> int:
+        """Возвращает количество записей по манифесту."""
+        with self._lock:
+            return sum(segment["count"] for segment in self._segments.values())
+
+    def last_id(self) -> Optional[int]:
+        """Возвращает наибольший id или None, если записей нет."""
+        with self._lock:
+            return max(
+                (segment["max_id"] for segment in self._segments.values()), default=None
+            )
+
+    def contains(self, transaction_id: int) -> bool:
+        """
+        Проверяет наличие записи.
+
+        Args:
+            transaction_id (int): ID транзакции.
+
+        Returns:
+            bool: True, если запись есть.
+        """
+        with self._lock:
+            return self._locate(transaction_id) is not None
+
+    def get(self, transaction_id: int) -> Optional[dict]:
+        """
+        Возвращает запись по id, читая только сегменты, в интервал id
+        которых она попадает.
+
+        Args:
+            transaction_id (int): ID транзакции.
+
+        Returns:
+            Optional[dict]: Запись или None, если ее нет.
+        """
+        with self._lock:
+            key = self._locate(transaction_id)
+            return None if key is None else self._segment(key)[transaction_id]
+
+    def search(
+        self,
+        category: Optional[str] = None,
+        date: Optional[str] = None,
+        amount: Optional[float] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        amount_min: Optional[float] = None,
+        amount_max: Optional[float] = None,
+        description: Optional[str] = None,
+        order_by: str = "id",
+    ) -> List[dict]:
+        """
+        Ищет записи, читая только сегменты месяцев интервала дат,
+        в которых есть записи категории.
+
+        Args:
+            category (str, optional): Категория транзакции.
+            date (str, optional): Точная дата.
+            amount (float, optional): Точная сумма.
+            date_from (str, optional): Начальная дата интервала включительно.
+            date_to (str, optional): Конечная дата интервала включительно.
+            amount_min (float, optional): Минимальная сумма включительно.
+            amount_max (float, optional): Максимальная сумма включительно.
+            description (str, optional): Подстрока описания
+            (без учета регистра).
+            order_by (str, optional): Порядок выдачи: "id", "date"
+            или "amount".
+            По умолчанию "id".
+
+        Returns:
+            List[dict]: Найденные записи.
+        """
+        if date is not None:
+            date_from = date_to = date
+        if amount is not None:
+            amount_min = amount_max = amount
+        date_from = None if date_from is None else str(date_from)
+        date_to = None if date_to is None else str(date_to)
+        needle = None if description is None else description.casefold()
+        has_amount = amount_min is not None or amount_max is not None
+
+        records = []
+        scanned = 0
+        with stats.timer("shards.scan"), self._lock:
+            for key in self.segments(date_from, date_to):
+                if category is not None and category not in self._segments[key]["totals"]:
+                    continue
+                segment = self._segment(key)
+                scanned += len(segment)
+                for record in segment.values():
+                    if (
+                        (category is None or record["category"] == category)
+                        and (date_from is None or str(record["date"]) >= date_from)
+                        and (date_to is None or str(record["date"]) <= date_to)
+                        and (
+                            not has_amount
+                            or _has_amount(record)
+                            and (amount_min is None or record["amount"] >= amount_min)
+                            and (amount_max is None or record["amount"] <= amount_max)
+                        )
+                        and (needle is None or needle in record["description"].casefold())
+                    ):
+                        records.append(record)
+        stats.count("store.rows_scanned", scanned)
+
+        if order_by == "date":
+            records.sort(key=lambda record: (record["date"], record["id"]))
+        elif order_by == "amount":
+            records.sort(key=lambda record: (record["amount"], record["id"]))
+        else:
+            records.sort(key=lambda record: record["id"])
+        stats.count("store.rows_matched", len(records))
+        return records
+
+    def category_totals(self) -> Dict[str, float]:
+        """
+        Возвращает суммы по категориям по манифесту, не читая сегменты.
+
+        Returns:
+            Dict[str, float]: Суммы по категориям.
+        """
+        totals: Dict[str, int] = {}
+        with self._lock:
+            for segment in self._segments.values():
+                for category, amount in segment["totals"].items():
+                    totals[category] = totals.get(category, 0) + amount
+        return {category: from_minor_units(amount) for category, amount in totals.items()}
@@ -0,0 +1,336 @@
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import groupby
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .file_manager import FileManager
+from .instrumentation import stats
+from .journal_manager import EVENT_ADD, EVENT_DELETE, EVENT_EDIT, EVENT_RESET
+from .money import MINOR_UNITS, from_minor_units, minor_range
+
+FIELDS = ("id", "date", "category", "amount", "description")
+SELECT = "SELECT id, date, category, amount, description FROM transactions"
+INSERT = (
+    "INSERT OR REPLACE INTO transactions (id, date, category, amount, description)"
+    " VALUES (:id, :date, :category, :amount, :description)"
+)
+DELETE = "DELETE FROM transactions WHERE id = ?"
+# Сумма в целых копейках: фильтры и итоги сравнивают копейки, как
+# резидентное хранилище, а не значения REAL.
+AMOUNT_MINOR = f"CAST(ROUND(amount * {MINOR_UNITS}) AS INTEGER)"
+HAS_AMOUNT = "typeof(amount) IN ('integer', 'real')"
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS transactions (
+        id INTEGER PRIMARY KEY,
+        date TEXT NOT NULL,
+        category TEXT NOT NULL,
+        amount REAL NOT NULL,
+        description TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS transactions_date ON transactions (date)",
+    "CREATE INDEX IF NOT EXISTS transactions_category ON transactions (category)",
+    "DROP INDEX IF EXISTS transactions_amount",
+    f"CREATE INDEX IF NOT EXISTS transactions_amount_minor ON transactions ({AMOUNT_MINOR})",
+)
+
+
+def _to_record(row: Tuple[Any, ...]) -> dict:
+    """Преобразует строку таблицы в запись транзакции."""
+    return dict(zip(FIELDS, row))
+
+
+@dataclass
+class SQLiteFileManager(FileManager):
+    """
+    Хранение транзакций в базе SQLite.
+
+    Таблица транзакций индексирована по дате, категории и сумме,
+    поэтому фильтры и суммы вычисляются в SQL без загрузки всех
+    записей в память. Используется одно переиспользуемое соединение
+    в режиме WAL, а изменения записываются пакетами в одной транзакции.
+
+    Attributes:
+        filename (str): Путь к файлу базы данных.
+        committed (List[int], optional): Отпечаток базы (см. `fingerprint`)
+        после последней транзакции, зафиксированной этим соединением.
+    """
+
+    def __post_init__(self):
+        """
+        Пост-инициализация объекта SQLiteFileManager.
+
+        Открывает соединение и создает схему, если ее еще нет.
+        """
+        self._lock = threading.RLock()
+        self._transaction_depth = 0
+        self.committed: Optional[List[int]] = None
+        self.connection = sqlite3.connect(self.filename, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.create_function(
+            "casefold", 1, lambda text: str(text).casefold(), deterministic=True
+        )
+        with self.connection:
+            for statement in SCHEMA:
+                self.connection.execute(statement)
+
+    def _query(self, sql: str, parameters: Tuple[Any, ...] = ()) -> List[tuple]:
+        """Выполняет запрос и возвращает все строки результата."""
+        with stats.timer("sqlite.query"), self._lock:
+            return self.connection.execute(sql, parameters).fetchall()
+
+    def _bump_version(self) -> int:
+        """Увеличивает счетчик изменений базы (PRAGMA user_version)."""
+        (version,) = self.connection.execute("PRAGMA user_version").fetchone()
+        self.connection.execute(f"PRAGMA user_version = {version + 1}")
+        return version + 1
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Объединяет изменения в одну транзакцию SQLite.
+
+        Внешний блок начинается с BEGIN IMMEDIATE и сразу захватывает
+        блокировку записи базы, поэтому чтения внутри блока не устаревают
+        из-за других процессов. Изменения фиксируются при выходе
+        из внешнего блока и откатываются при исключении. Вложенные
+        блоки входят во внешний.
+
+        Returns:
+            Iterator[None]: Контекст транзакции.
+        """
+        with self._lock:
+            if not self._transaction_depth and not self.connection.in_transaction:
+                self.connection.execute("BEGIN IMMEDIATE")
+            self._transaction_depth += 1
+            try:
+                yield
+            except BaseException:
+                self._transaction_depth -= 1
+                if not self._transaction_depth:
+                    self.connection.rollback()
+                raise
+            self._transaction_depth -= 1
+            if not self._transaction_depth:
+                try:
+                    version = self._bump_version()
+                    self.connection.commit()
+                except BaseException:
+                    self.connection.rollback()
+                    raise
+                self.committed = [version]
+
+    def read_from_file(self) -> List[dict]:
+        """
+        Считывает все записи из базы.
+
+        Returns:
+            List[dict]: Список записей в порядке id.
+        """
+        return list(self.iter_records())
+
+    def iter_records(self) -> Iterator[dict]:
+        """
+        Последовательно выдает записи из базы, не загружая их все сразу.
+
+        Returns:
+            Iterator[dict]: Записи в порядке id.
+        """
+        with self._lock:
+            cursor = self.connection.execute(f"{SELECT} ORDER BY id")
+        for row in cursor:
+            yield _to_record(row)
+
+    def write_to_file(self, data: List[Any]) -> None:
+        """
+        Полностью заменяет содержимое таблицы в одной транзакции.
+
+        Args:
+            data (List[Any]): Список записей.
+        """
+        with self.transaction():
+            self.connection.execute("DELETE FROM transactions")
+            self.connection.executemany(INSERT, data)
+
+    def save_changes(
+        self,
+        events: List[Dict[str, Any]],
+        snapshot: Optional[Callable[[], List[dict]]] = None,
+    ) -> None:
+        """
+        Применяет события изменения одной транзакцией SQLite
+        (или в составе открытой транзакции, см. `transaction`).
+
+        Args:
+            events (List[dict]): События изменения (add/edit/delete).
+            snapshot (Callable, optional): Не используется.
+        """
+        stats.count("file.rows_written", len(events))
+        with stats.timer("sqlite.write"), self.transaction():
+            for op, group in groupby(events, key=lambda event: event["op"]):
+                if op in (EVENT_ADD, EVENT_EDIT):
+                    self.connection.executemany(
+                        INSERT, (event["record"] for event in group)
+                    )
+                elif op == EVENT_DELETE:
+                    self.connection.executemany(
+                        DELETE, ((event["id"],) for event in group)
+                    )
+                elif op == EVENT_RESET:
+                    self.connection.execute("DELETE FROM transactions")
+                else:
+                    raise ValueError(f"Неизвестный тип события: {op}")
+
+    def fingerprint(self) -> Optional[List[int]]:
+        """
+        Возвращает счетчик изменений базы.
+
+        Размер и время изменения файла в режиме WAL не отражают
+        последние записи, поэтому используется PRAGMA user_version.
+
+        Returns:
+            Optional[List[int]]: Отпечаток состояния базы.
+        """
+        (version,) = self._query("PRAGMA user_version")[0]
+        return [version]
+
+    def count(self) -> int:
+        """Возвращает количество записей."""
+        return self._query("SELECT COUNT(*) FROM transactions")[0][0]
+
+    def last_id(self) -> Optional[int]:
+        """Возвращает наибольший id или None, если записей нет."""
+        return self._query("SELECT MAX(id) FROM transactions")[0][0]
+
+    def get(self, transaction_id: int) -> Optional[dict]:
+        """
+        Возвращает запись по id.
+
+        Args:
+            transaction_id (int): ID транзакции.
+
+        Returns:
+            Optional[dict]: Запись или None, если ее нет.
+        """
+        rows = self._query(f"{SELECT} WHERE id = ?", (transaction_id,))
+        return _to_record(rows[0]) if rows else None
+
+    def search(
+        self,
+        category: Optional[str] = None,
+        date: Optional[str] = None,
+        amount: Optional[float] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        amount_min: Optional[float] = None,
+        amount_max: Optional[float] = None,
+        description: Optional[str] = None,
+        order_by: str = "id",
+    ) -> List[dict]:
+        """
+        Ищет записи, передавая фильтры в SQL.
+
+        Args:
+            category (str, optional): Категория транзакции.
+            date (str, optional): Точная дата.
+            amount (float, optional): Точная сумма.
+            date_from (str, optional): Начальная дата интервала включительно.
+            date_to (str, optional): Конечная дата интервала включительно.
+            amount_min (float, optional): Минимальная сумма включительно.
+            amount_max (float, optional): Максимальная сумма включительно.
+            description (str, optional): Подстрока описания
+            (без учета регистра).
+            order_by (str, optional): Порядок выдачи: "id", "date"
+            или "amount".
+            По умолчанию "id".
+
+        Returns:
+            List[dict]: Найденные записи.
+        """
+        if amount is not None:
+            amount_min = amount_max = amount
+        amount_min, amount_max = minor_range(amount_min, amount_max)
+        conditions = []
+        parameters: List[Any] = []
+        if amount_min is not None or amount_max is not None:
+            conditions.append(HAS_AMOUNT)
+        for condition, value in (
+            ("category = ?", category),
+            ("date = ?", None if date is None else str(date)),
+            ("date >= ?", None if date_from is None else str(date_from)),
+            ("date <= ?", None if date_to is None else str(date_to)),
+            (f"{AMOUNT_MINOR} >= ?", amount_min),
+            (f"{AMOUNT_MINOR} <= ?", amount_max),
+            (
+                "instr(casefold(description), ?) > 0",
+                None if description is None else description.casefold(),
+            ),
+        ):
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value)
+
+        sql = SELECT
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += {
+            "date": " ORDER BY date, id",
+            "amount": f" ORDER BY {AMOUNT_MINOR}, id",
+        }.get(order_by, " ORDER BY id")
+        rows = self._query(sql, tuple(parameters))
+        stats.count("store.rows_matched", len(rows))
+        return [_to_record(row) for row in rows]
+
+    def category_totals(self) -> Dict[str, float]:
+        """
+        Возвращает суммы по категориям, посчитанные в SQL
+        в целых копейках.
+
+        Returns:
+            Dict[str, float]: Суммы по категориям.
+        """
+        rows = self._query(
+            f"SELECT category, SUM({AMOUNT_MINOR}) FROM transactions"
+            f" WHERE {HAS_AMOUNT} GROUP BY category"
+        )
+        return {category: from_minor_units(total) for category, total in rows}
+
+    def close(self) -> None:
+        """Закрывает соединение с базой."""
+        with self._lock:
+            self.connection.close()
+
+
+def migrate_json_to_sqlite(json_path: str, sqlite_path: str) -> int:
+    """
+    Переносит транзакции из JSON-файла в базу SQLite.
+
+    Args:
+        json_path (str): Путь к исходному JSON-файлу.
+        sqlite_path (str): Путь к файлу базы данных.
+
+    Returns:
+        int: Количество перенесенных записей.
+    """
+    records = FileManager(json_path).read_from_file()
+    manager = SQLiteFileManager(sqlite_path)
+    try:
+        manager.write_to_file(records)
+    finally:
+        manager.close()
+    return len(records)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit(
+            "Использование: python -m src.utils.sqlite_manager"
+            " <transactions.json> <transactions.sqlite>"
+        )
+    count = migrate_json_to_sqlite(sys.argv[1], sys.argv[2])
+    print(f"Перенесено записей: {count}")
@@ -0,0 +1,71 @@
+from ..transactions.mmap_store import MmapTransactionStore
+from ..transactions.sharded_store import ShardedTransactionStore
+from ..transactions.sqlite_store import SQLiteTransactionStore
+from ..transactions.transaction_store import TransactionStore
+from .file_manager import FileManager
+from .journal_manager import JournalFileManager
+from .mmap_manager import MmapFileManager
+from .sharded_manager import ShardedFileManager
+from .sqlite_manager import SQLiteFileManager
+
+JOURNAL_EXTENSION = ".journal"
+SQLITE_EXTENSIONS = (".sqlite", ".sqlite3", ".db")
+MMAP_EXTENSION = ".wallet"
+SHARDED_EXTENSION = ".shards"
+
+
+def get_file_manager(filename: str) -> FileManager:
+    """
+    Создает менеджер хранения, подходящий для указанного файла.
+
+    Формат определяется по расширению: `.journal` - журнал событий,
+    `.sqlite`, `.sqlite3` и `.db` - база SQLite, `.wallet` - двоичный
+    файл записей фиксированной длины (mmap), `.shards` - каталог
+    сегментов по месяцам, любое другое - JSON-файл.
+
+    Args:
+        filename (str): Путь к файлу транзакций.
+
+    Returns:
+        FileManager: Менеджер хранения.
+    """
+    if filename.endswith(JOURNAL_EXTENSION):
+        return JournalFileManager(filename)
+    if filename.endswith(SQLITE_EXTENSIONS):
+        return SQLiteFileManager(filename)
+    if filename.endswith(MMAP_EXTENSION):
+        return MmapFileManager(filename)
+    if filename.endswith(SHARDED_EXTENSION):
+        return ShardedFileManager(filename)
+    return FileManager(filename)
+
+
+def open_store(
+    file_manager: FileManager,
+    streaming: bool = False,
+    write_behind: bool = False,
+) -> TransactionStore:
+    """
+    Создает хранилище транзакций, подходящее для менеджера хранения.
+
+    Args:
+        file_manager (FileManager): Менеджер хранения.
+        streaming (bool, optional): Загружать записи потоково
+        (см. `TransactionStore`). По умолчанию False.
+        write_behind (bool, optional): Откладывать запись изменений
+        до `flush()` (см. `TransactionStore`). По умолчанию False.
+
+    Raises:
+        ValueError: Вызывается, если отложенная запись запрошена
+        для базы SQLite.
+
+    Returns:
+        TransactionStore: Хранилище транзакций.
+    """
+    if isinstance(file_manager, SQLiteFileManager):
+        return SQLiteTransactionStore(file_manager, write_behind=write_behind)
+    if isinstance(file_manager, MmapFileManager):
+        return MmapTransactionStore(file_manager, write_behind=write_behind)
+    if isinstance(file_manager, ShardedFileManager):
+        return ShardedTransactionStore(file_manager, write_behind=write_behind)
+    return TransactionStore(file_manager, streaming, write_behind)
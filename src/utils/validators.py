@@ -1,4 +1,80 @@
 from datetime import datetime
+from typing import Any, Union
+
+from .money import normalize_amount
+
+CATEGORIES = ("доход", "расход")
+
+
+def validate_date(value: Any) -> str:
+    """
+    Проверяет дату в формате гггг-мм-дд.
+
+    Args:
+        value (Any): Проверяемое значение.
+
+    Raises:
+        ValueError: Вызывается, если дата некорректна.
+
+    Returns:
+        str: Строка с датой в формате гггг-мм-дд.
+    """
+    try:
+        return str(datetime.strptime(str(value).strip(), "%Y-%m-%d").date())
+    except ValueError:
+        raise ValueError("Некорректный формат даты.")
+
+
+def validate_category(value: Any) -> str:
+    """
+    Проверяет категорию транзакции (доход или расход).
+
+    Args:
+        value (Any): Проверяемое значение.
+
+    Raises:
+        ValueError: Вызывается, если категория некорректна.
+
+    Returns:
+        str: Категория в нижнем регистре.
+    """
+    category = str(value).strip().lower()
+    if category not in CATEGORIES:
+        raise ValueError("Некорректная категория")
+    return category
+
+
+def validate_amount(value: Any) -> Union[int, float]:
+    """
+    Проверяет сумму транзакции и округляет ее до копеек.
+    Строка разбирается через Decimal (см. `normalize_amount`).
+
+    Args:
+        value (Any): Проверяемое значение.
+
+    Raises:
+        ValueError: Вызывается, если сумма не является числом.
+
+    Returns:
+        int | float: Сумма транзакции.
+    """
+    try:
+        return normalize_amount(value)
+    except ValueError:
+        raise ValueError("Сумма должна быть числом. Попробуйте снова.")
+
+
+def validate_description(value: Any) -> str:
+    """
+    Приводит описание транзакции к строке.
+
+    Args:
+        value (Any): Описание.
+
+    Returns:
+        str: Описание транзакции.
+    """
+    return "" if value is None else str(value)
 
 
 def get_valid_date(msg: str = None, skip_allowed: bool = False):
@@ -19,10 +95,9 @@ def get_valid_date(msg: str = None, skip_allowed: bool = False):
         if skip_allowed and not date_str:
             return None
         try:
-            date = datetime.strptime(date_str, "%Y-%m-%d").date()
-            return str(date)
-        except ValueError:
-            print("Некорректный формат даты.")
+            return validate_date(date_str)
+        except ValueError as e:
+            print(e)
 
 
 def get_valid_category(msg: str = None, skip_allowed: bool = False):
@@ -43,10 +118,7 @@ def get_valid_category(msg: str = None, skip_allowed: bool = False):
         if skip_allowed and not category:
             return None
         try:
-            if category in ["доход", "расход"]:
-                return category
-            else:
-                raise ValueError("Некорректная категория")
+            return validate_category(category)
         except ValueError as e:
             print(e)
 
@@ -70,10 +142,9 @@ def get_valid_amount(msg: str = None, skip_allowed: bool = False):
         if skip_allowed and not amount_str:
             return None
         try:
-            amount = float(amount_str)
-            return amount
-        except ValueError:
-            print("Сумма должна быть числом. Попробуйте снова.")
+            return validate_amount(amount_str)
+        except ValueError as e:
+            print(e)
 
 
 def get_description(msg: str = None, skip_allowed: bool = False):
@@ -0,0 +1,175 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.balance.async_balance_manager import AsyncBalanceManager
+from src.transactions.async_manager import AsyncTransactionManager
+from src.transactions.transaction_manager import TransactionManager
+from src.utils.file_manager import FileManager
+from src.utils.renderers import Renderer
+
+
+class AddedRenderer(Renderer):
+    def __init__(self):
+        self.added_ids = []
+
+    def added(self, transaction):
+        self.added_ids.append(transaction.id)
+
+
+@pytest.fixture
+def ledger_path(tmp_path):
+    path = str(tmp_path / "ledger.json")
+    FileManager(path).write_to_file(FileManager("data/test_database.json").read_from_file())
+    return path
+
+
+def test_concurrent_reads_share_one_load(ledger_path, monkeypatch):
+    opened = []
+    original_open = AsyncTransactionManager._open
+
+    def counting_open(self):
+        opened.append(self.filename)
+        return original_open(self)
+
+    monkeypatch.setattr(AsyncTransactionManager, "_open", counting_open)
+
+    async def main():
+        manager = AsyncTransactionManager(ledger_path)
+        return await asyncio.gather(
+            *(manager.check_transactions(transaction_id) for transaction_id in range(1, 11))
+        )
+
+    assert asyncio.run(main()) == [True] * 3 + [False] * 7
+    assert opened == [ledger_path]
+
+
+def test_writes_are_serialized_and_grouped(ledger_path, monkeypatch, capsys):
+    saves = []
+    original_save = FileManager.save_changes
+
+    def counting_save(self, events, snapshot):
+        saves.append(len(events))
+        original_save(self, events, snapshot)
+
+    monkeypatch.setattr(FileManager, "save_changes", counting_save)
+
+    async def main():
+        async with AsyncTransactionManager(ledger_path) as manager:
+            await asyncio.gather(
+                *(
+                    manager.add_transaction("2024-06-01", "расход", 10.0, f"кофе {index}")
+                    for index in range(30)
+                )
+            )
+            await manager.delete_transaction(1)
+
+    asyncio.run(main())
+    capsys.readouterr()
+
+    records = FileManager(ledger_path).read_from_file()
+    assert sorted(record["id"] for record in records) == list(range(2, 34))
+    assert sum(saves) == 31
+    assert len(saves) < 31
+
+
+def test_failed_batch_does_not_repeat_output(ledger_path):
+    renderer = AddedRenderer()
+
+    def fail():
+        raise RuntimeError
+
+    async def main():
+        async with AsyncTransactionManager(ledger_path, renderer) as manager:
+
+            async def write_failing():
+                return await manager.write(fail)
+
+            return await asyncio.gather(
+                manager.add_transaction("2024-06-01", "расход", 10.0, "кофе"),
+                write_failing(),
+                manager.add_transaction("2024-06-02", "расход", 20.0, "чай"),
+                return_exceptions=True,
+            )
+
+    added, failed, _ = asyncio.run(main())
+    assert isinstance(failed, RuntimeError)
+    assert renderer.added_ids == [added.id, added.id + 1]
+
+
+def test_reads_run_in_parallel(ledger_path):
+    barrier = threading.Barrier(2, timeout=5)
+
+    async def main():
+        manager = AsyncTransactionManager(ledger_path, Renderer())
+        return await asyncio.gather(manager.read(barrier.wait), manager.read(barrier.wait))
+
+    assert sorted(asyncio.run(main())) == [0, 1]
+
+
+def test_reads_refresh_only_stale_store(ledger_path, monkeypatch):
+    refreshes = []
+    original_refresh = AsyncTransactionManager._refresh
+
+    async def counting_refresh(self, store):
+        refreshes.append(store)
+        await original_refresh(self, store)
+
+    monkeypatch.setattr(AsyncTransactionManager, "_refresh", counting_refresh)
+
+    async def main():
+        manager = AsyncTransactionManager(ledger_path, Renderer())
+        await asyncio.gather(*(manager.check_transactions(1) for _ in range(5)))
+        unchanged = len(refreshes)
+        TransactionManager(ledger_path, renderer=Renderer()).add_transaction(
+            "2024-06-01", "расход", 50.0, "кофе"
+        )
+        found = await asyncio.gather(*(manager.check_transactions(4) for _ in range(5)))
+        return unchanged, found
+
+    unchanged, found = asyncio.run(main())
+    assert unchanged == 0
+    assert found == [True] * 5
+    assert len(refreshes) == 1
+
+
+def test_balance_shares_store(ledger_path, capsys):
+    async def main():
+        transactions = AsyncTransactionManager(ledger_path)
+        balance = AsyncBalanceManager(ledger_path, transactions=transactions)
+        await balance.current_balance()
+        await transactions.add_transaction("2024-06-01", "расход", 50.0, "кофе")
+        await balance.current_balance()
+        await transactions.close()
+        return await balance.verify_totals()
+
+    assert asyncio.run(main()) is True
+    out = capsys.readouterr().out
+    assert "Текущий баланс: 200.0" in out
+    assert "Текущий баланс: 150.0" in out
+
+
+def test_loading_does_not_block_loop(tmp_path):
+    from benchmarks.synthetic import generate_records
+
+    path = str(tmp_path / "big.json")
+    FileManager(path).write_to_file(list(generate_records(100_000)))
+
+    async def main():
+        manager = AsyncTransactionManager(path)
+        loading = asyncio.ensure_future(manager.manager())
+        gaps = []
+        previous = time.perf_counter()
+        while not loading.done():
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            gaps.append(now - previous)
+            previous = now
+        await loading
+        return gaps
+
+    gaps = asyncio.run(main())
+    assert len(gaps) > 10
+    assert max(gaps) < 0.1
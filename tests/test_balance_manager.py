@@ -1,6 +1,10 @@
+import shutil
+
 import pytest
 
 from src.balance.balance_manager import BalanceManager
+from src.transactions.transaction import Transaction
+from src.transactions.transaction_manager import TransactionManager
 
 
 @pytest.fixture
@@ -21,3 +25,68 @@ def test_income_balance(balance_manager, capsys):
     balance_manager.current_balance(show_income=True)
     captured = capsys.readouterr()
     assert "Доходы: 700.0" in captured.out.strip()
+
+@pytest.fixture
+def ledger_path(tmp_path):
+    path = str(tmp_path / "ledger.json")
+    shutil.copy("data/test_database.json", path)
+    return path
+
+def test_totals_follow_shared_store(ledger_path, capsys):
+    manager = TransactionManager(ledger_path)
+    balance = BalanceManager(ledger_path, store=manager.store)
+
+    manager.add_transaction("2024-05-06", "расход", 50.0, "кофе")
+    manager.edit_transaction(3, amount=150.0)
+    manager.delete_transaction(2)
+    capsys.readouterr()
+
+    balance.current_balance()
+    assert "Текущий баланс: 700.0" in capsys.readouterr().out
+    assert balance.verify_totals() is True
+
+def test_totals_persist_alongside_ledger(ledger_path):
+    manager = TransactionManager(ledger_path)
+    BalanceManager(ledger_path, store=manager.store)
+    manager.add_transaction("2024-05-06", "доход", 50.0, "кешбек")
+
+    reopened = BalanceManager(ledger_path)
+    assert reopened.totals._load() is True
+    assert reopened._calculate("доход") == 750.0
+
+def test_verify_totals_fixes_drift(ledger_path):
+    balance_manager = BalanceManager(ledger_path)
+    balance_manager.totals.totals["доход"] = 1.0
+
+    assert balance_manager.verify_totals() is False
+    assert balance_manager._calculate("доход") == 700.0
+    assert balance_manager.verify_totals() is True
+
+def test_totals_ignore_commit_between_write_and_save(ledger_path):
+    manager = TransactionManager(ledger_path)
+    other = TransactionManager(ledger_path)
+
+    class Interloper:
+        """Другой процесс записывает файл между записью и сохранением сумм."""
+
+        def rebuild(self, store):
+            pass
+
+        def on_add(self, record):
+            pass
+
+        def on_delete(self, record):
+            pass
+
+        def on_commit(self, fingerprint):
+            if other.store.get(10) is None:
+                record = Transaction(10, "2024-05-07", "доход", 50.0, "кешбек")
+                other.store.transact(lambda store: store.add(record))
+
+    manager.store.subscribe(Interloper())
+    BalanceManager(ledger_path, store=manager.store)
+    manager.add_transaction("2024-05-06", "доход", 100.0, "премия")
+
+    reopened = BalanceManager(ledger_path)
+    assert reopened._calculate("доход") == 850.0
+    assert reopened.periods.totals("month")["2024-05"]["доход"] == 850.0
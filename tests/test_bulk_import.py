@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from src.transactions.bulk_import import BulkImporter
+from src.transactions.transaction import Transaction
+from src.transactions.transaction_store import TransactionStore
+from src.utils.file_manager import FileManager
+
+
+class CountingFileManager(FileManager):
+    writes = 0
+
+    def write_to_file(self, data):
+        self.writes += 1
+        super().write_to_file(data)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return TransactionStore(CountingFileManager(str(tmp_path / "ledger.json")))
+
+
+def test_import_csv_in_batches(store, tmp_path):
+    path = tmp_path / "statement.csv"
+    rows = ["date,category,amount,description"]
+    rows += [f"2024-05-{day:02d},Расход,{day}.5,покупка {day}" for day in range(1, 8)]
+    path.write_text("\n".join(rows), encoding="utf-8")
+
+    report = BulkImporter(store, batch_size=3).import_file(str(path))
+
+    assert report.imported == 7
+    assert report.rejected == 0
+    assert store.file_manager.writes == 3
+    assert [record.id for record in store] == list(range(1, 8))
+    assert store.get(7).to_dict() == {
+        "id": 7,
+        "date": "2024-05-07",
+        "category": "расход",
+        "amount": 7.5,
+        "description": "покупка 7",
+    }
+
+
+def test_import_jsonl_rejects_invalid_rows(store, tmp_path):
+    path = tmp_path / "statement.jsonl"
+    lines = [
+        {"date": "2024-05-01", "category": "доход", "amount": 600, "description": "Зарплата"},
+        {"date": "2024-13-01", "category": "доход", "amount": 1, "description": ""},
+        {"date": "2024-05-02", "category": "перевод", "amount": 1, "description": ""},
+    ]
+    path.write_text(
+        "\n".join(json.dumps(line) for line in lines) + "\nnot json\n",
+        encoding="utf-8",
+    )
+
+    report = BulkImporter(store).import_file(str(path))
+
+    assert report.imported == 1
+    assert report.rejected == 3
+    assert report.errors[0] == "Строка 2: Некорректный формат даты."
+    assert report.errors[1] == "Строка 3: Некорректная категория"
+    assert "Загружено записей: 1" in str(report)
+
+
+def test_import_retries_chunk_after_concurrent_write(store, tmp_path):
+    other = TransactionStore(FileManager(store.file_manager.filename))
+    other.transact(lambda other: other.add(
+        Transaction(other.next_id(), "2024-05-01", "доход", 600, "Зарплата")
+    ))
+    path = tmp_path / "statement.csv"
+    path.write_text(
+        "date,category,amount,description\n2024-05-02,расход,50,кофе\n",
+        encoding="utf-8",
+    )
+
+    report = BulkImporter(store).import_file(str(path))
+
+    assert report.imported == 1
+    saved = FileManager(store.file_manager.filename).read_from_file()
+    assert [record["id"] for record in saved] == [1, 2]
+
+
+def test_import_jsonl_rejects_non_object_rows(store, tmp_path):
+    path = tmp_path / "statement.jsonl"
+    path.write_text("[1, 2]\n", encoding="utf-8")
+
+    report = BulkImporter(store).import_file(str(path))
+
+    assert report.imported == 0
+    assert report.rejected == 1
+    assert report.errors == ["Строка 1: Строка JSONL должна быть объектом."]
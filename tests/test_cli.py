@@ -0,0 +1,109 @@
+import io
+import json
+import shutil
+
+import pytest
+
+from src.cli import main
+from src.utils.file_manager import FileManager
+from src.utils.locking import FileLock
+
+
+@pytest.fixture
+def ledger_path(tmp_path):
+    path = str(tmp_path / "ledger.json")
+    shutil.copy("data/test_database.json", path)
+    return path
+
+
+def test_add_and_search(ledger_path, capsys):
+    assert main(["-f", ledger_path, "add", "2024-06-01", "расход", "50", "кофе"]) == 0
+    assert "Запись успешно добавлена." in capsys.readouterr().out
+
+    assert main(["-f", ledger_path, "--format", "jsonl", "search", "--category", "расход"]) == 0
+    found = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [record["id"] for record in found] == [2, 4]
+
+
+def test_balance(ledger_path, capsys):
+    assert main(["-f", ledger_path, "balance"]) == 0
+    assert "Текущий баланс: 200.0" in capsys.readouterr().out
+
+    assert main(["-f", ledger_path, "balance", "--expense"]) == 0
+    assert "Расходы: 500.0" in capsys.readouterr().out
+
+
+def test_invalid_arguments(ledger_path, capsys):
+    with pytest.raises(SystemExit) as error:
+        main(["-f", ledger_path, "add", "2024-13-01", "расход", "1"])
+
+    assert error.value.code == 2
+    assert "Некорректный формат даты." in capsys.readouterr().err
+
+
+def test_missing_record_exit_code(ledger_path, capsys):
+    assert main(["-f", ledger_path, "delete", "99"]) == 1
+    assert main(["-f", ledger_path, "show", "99"]) == 1
+
+
+def test_export(ledger_path, tmp_path):
+    target = str(tmp_path / "export.jsonl")
+
+    assert main(["-f", ledger_path, "-q", "export", target]) == 0
+    assert FileManager(target).read_from_file() == FileManager(ledger_path).read_from_file()
+
+
+def test_batch_writes_once(ledger_path, capsys):
+    commands = io.StringIO(
+        "# пополнение\n"
+        "add 2024-06-01 доход 1000 'Премия за май'\n"
+        "\n"
+        "edit 1 --amount 5\n"
+        "delete 2\n"
+        "balance\n"
+    )
+
+    assert main(["-f", ledger_path, "batch"], stdin=commands) == 0
+
+    assert "Текущий баланс: 1105.0" in capsys.readouterr().out
+    assert FileLock(ledger_path).version() == 1
+    records = FileManager(ledger_path).read_from_file()
+    assert [record["id"] for record in records] == [1, 3, 4]
+    assert records[-1]["description"] == "Премия за май"
+
+
+def test_batch_error_rolls_back(ledger_path, capsys):
+    commands = io.StringIO("add 2024-06-01 доход 1000\nadd bad\n")
+
+    assert main(["-f", ledger_path, "-q", "batch"], stdin=commands) == 1
+
+    assert "строка 2" in capsys.readouterr().err
+    assert len(FileManager(ledger_path).read_from_file()) == 3
+
+
+def test_batch_keep_going(ledger_path, capsys):
+    commands = io.StringIO("add 2024-06-01 доход 1000\nadd bad\ndelete 3\n")
+
+    assert main(["-f", ledger_path, "-q", "batch", "--keep-going"], stdin=commands) == 1
+
+    assert "строка 2" in capsys.readouterr().err
+    records = FileManager(ledger_path).read_from_file()
+    assert [record["id"] for record in records] == [1, 2, 4]
+
+
+def test_batch_keep_going_after_unbalanced_quote(ledger_path, capsys):
+    commands = io.StringIO("add 2024-06-01 доход 1000\nadd 2024-06-02 доход 5 'кофе\ndelete 3\n")
+
+    assert main(["-f", ledger_path, "-q", "batch", "--keep-going"], stdin=commands) == 1
+
+    assert "строка 2" in capsys.readouterr().err
+    records = FileManager(ledger_path).read_from_file()
+    assert [record["id"] for record in records] == [1, 2, 4]
+
+
+def test_batch_rollback_prints_no_success(ledger_path, capsys):
+    commands = io.StringIO("add 2024-06-01 доход 1000\nadd bad\n")
+
+    assert main(["-f", ledger_path, "batch"], stdin=commands) == 1
+
+    assert "Запись успешно добавлена." not in capsys.readouterr().out
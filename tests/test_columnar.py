@@ -0,0 +1,81 @@
+from datetime import date, timedelta
+
+import pytest
+
+from src.balance.period_totals import period_key
+from src.transactions.transaction import Transaction
+from src.utils.file_manager import FileManager
+
+np = pytest.importorskip("numpy")
+
+from src.transactions.columnar import ColumnarLedger  # noqa: E402
+
+
+@pytest.fixture
+def ledger():
+    return ColumnarLedger.from_records(
+        map(Transaction.from_dict, FileManager("data/test_database.json").read_from_file())
+    )
+
+
+def test_columns(ledger):
+    assert ledger.amounts.dtype == np.int64
+    assert ledger.dates.dtype == np.dtype("datetime64[D]")
+    assert ledger.amounts.tolist() == [60000, 50000, 10000]
+
+
+def test_totals_and_balance(ledger):
+    assert ledger.total("доход") == 700.0
+    assert ledger.total("расход") == 500.0
+    assert ledger.balance() == 200.0
+
+
+def test_period_sums(ledger):
+    assert ledger.period_sums("year") == {
+        "2020": {"расход": 500.0},
+        "2024": {"доход": 700.0},
+    }
+
+
+@pytest.mark.parametrize("unit", ["week", "month", "year"])
+def test_period_rollups_match_period_key(unit):
+    records = [
+        Transaction(index, str(day), "доход" if index % 3 else "расход", index, "")
+        for index, day in enumerate(
+            (date(2019, 12, 20) + timedelta(days=offset) for offset in range(0, 800, 3)),
+            start=1,
+        )
+    ]
+    expected = {}
+    for record in records:
+        cell = expected.setdefault(period_key(record.date, unit), {})
+        cell[record.category] = cell.get(record.category, 0) + record.minor
+
+    assert ColumnarLedger.from_records(records).period_rollups(unit) == expected
+
+
+def test_records_without_amount():
+    ledger = ColumnarLedger.from_records(
+        [
+            Transaction(1, "2024-05-01", "доход", 600, "Зарплата"),
+            Transaction(2, "2024-05-02", "доход", "", "без суммы"),
+        ]
+    )
+
+    assert ledger.has_amount.tolist() == [True, False]
+    assert ledger.total("доход") == 600.0
+    assert ledger.balance() == 600.0
+    assert ledger.period_sums("year") == {"2024": {"доход": 600.0}}
+
+
+def test_period_sums_are_exact_in_kopecks():
+    # 2**53 + 1 копейка не представима во float64.
+    ledger = ColumnarLedger.from_records(
+        [
+            Transaction(1, "2024-05-01", "доход", 2**52 / 50, ""),
+            Transaction(2, "2024-05-02", "доход", 0.01, ""),
+        ]
+    )
+
+    assert ledger.amounts.sum() == 2**53 + 1
+    assert ledger.period_sums("month") == {"2024-05": {"доход": (2**53 + 1) / 100}}
@@ -0,0 +1,107 @@
+import io
+import json
+import threading
+
+import pytest
+
+from src.utils.file_manager import FileManager, atomic_write, iter_json_array
+
+
+test_db_path = "data/test_database.json"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 1 << 16])
+def test_iter_json_array_matches_json_load(chunk_size):
+    with open(test_db_path) as file:
+        expected = json.load(file)
+    with open(test_db_path) as file:
+        assert list(iter_json_array(file, chunk_size)) == expected
+
+
+def test_iter_json_array_numbers_across_chunks():
+    assert list(iter_json_array(io.StringIO("[12345, 6789]"), chunk_size=2)) == [
+        12345,
+        6789,
+    ]
+    assert list(iter_json_array(io.StringIO("  "))) == []
+    assert list(iter_json_array(io.StringIO("[ ]"))) == []
+
+
+def test_iter_json_array_truncated_file():
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(io.StringIO('[{"id": 1}, {"id"'), chunk_size=4))
+
+
+def test_jsonl_round_trip(tmp_path):
+    records = FileManager(test_db_path).read_from_file()
+    manager = FileManager(str(tmp_path / "ledger.jsonl"))
+    manager.write_to_file(records)
+
+    assert list(manager.iter_records()) == records
+    assert manager.read_from_file() == records
+
+
+def test_write_is_compact_and_atomic(tmp_path):
+    path = tmp_path / "ledger.json"
+    manager = FileManager(str(path))
+    manager.write_to_file([{"id": 1, "description": "кофе"}])
+
+    assert path.read_text(encoding="utf-8") == '[{"id":1,"description":"кофе"}]'
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_failed_write_keeps_previous_version(tmp_path):
+    manager = FileManager(str(tmp_path / "ledger.json"))
+    manager.write_to_file([{"id": 1}])
+
+    with pytest.raises(TypeError):
+        manager.write_to_file([{"id": 2, "amount": object()}])
+
+    assert manager.read_from_file() == [{"id": 1}]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_concurrent_atomic_writes(tmp_path):
+    path = str(tmp_path / "totals.json")
+    errors = []
+
+    def write(value):
+        try:
+            for _ in range(200):
+                atomic_write(path, lambda file: file.write(value), sync=False)
+        except OSError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(str(index),)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_corrupt_file_is_not_read_as_empty(tmp_path):
+    path = tmp_path / "ledger.json"
+    path.write_text('[{"id": 1}, {"id"', encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        FileManager(str(path)).read_from_file()
+
+    path.write_text("", encoding="utf-8")
+    assert FileManager(str(path)).read_from_file() == []
+
+
+def test_fsync_group_commit(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr("os.fsync", synced.append)
+    manager = FileManager(str(tmp_path / "ledger.json"), fsync_every=3)
+
+    for index in range(7):
+        manager.write_to_file([{"id": index}])
+    # 3-я и 6-я записи: файл и каталог
+    assert len(synced) == 4
+
+    manager.sync()
+    assert len(synced) == 6
@@ -0,0 +1,101 @@
+import json
+import pstats
+import shutil
+
+import pytest
+
+from src.balance.balance_manager import BalanceManager
+from src.transactions.transaction_manager import TransactionManager
+from src.utils.instrumentation import Instrumentation, instrumented, stats
+from src.utils.renderers import Renderer
+
+
+@pytest.fixture
+def enabled_stats():
+    stats.reset()
+    stats.enable()
+    yield stats
+    stats.disable()
+    stats.reset()
+
+
+@pytest.fixture
+def ledger_path(tmp_path):
+    path = str(tmp_path / "ledger.json")
+    shutil.copy("data/test_database.json", path)
+    return path
+
+
+def test_disabled_collects_nothing(ledger_path):
+    stats.reset()
+    manager = TransactionManager(ledger_path, renderer=Renderer())
+    manager.search_transactions(category="доход")
+
+    assert stats.snapshot() == {"timers": {}, "counters": {}}
+
+
+def test_manager_operations_are_measured(ledger_path, enabled_stats):
+    manager = TransactionManager(ledger_path, renderer=Renderer())
+    balance = BalanceManager(ledger_path, store=manager.store, renderer=Renderer())
+    manager.add_transaction("2024-06-01", "расход", 50.0, "кофе")
+    manager.search_transactions(category="доход", description="ЗАРП")
+    balance.current_balance()
+
+    snapshot = enabled_stats.snapshot()
+    timers, counters = snapshot["timers"], snapshot["counters"]
+    for name in (
+        "file.read",
+        "file.parse",
+        "file.write",
+        "store.load",
+        "store.decode",
+        "store.write",
+        "transactions.add",
+        "transactions.search",
+        "balance.current",
+    ):
+        assert timers[name]["calls"] >= 1, name
+    assert counters["file.rows_read"] == 3
+    assert counters["file.rows_written"] == 4
+    assert counters["file.bytes_written"] > 0
+    assert counters["store.rows_scanned"] == 2
+    assert counters["store.rows_matched"] == 1
+    json.dumps(snapshot)
+
+
+def test_dump_and_report(tmp_path, enabled_stats):
+    with enabled_stats.timer("block"):
+        enabled_stats.count("rows", 5)
+
+    path = tmp_path / "stats.json"
+    enabled_stats.dump(str(path))
+    saved = json.loads(path.read_text(encoding="utf-8"))
+    assert saved["timers"]["block"]["calls"] == 1
+    assert saved["counters"] == {"rows": 5}
+    assert "block" in enabled_stats.report()
+
+
+def test_profile_writes_pstats(tmp_path):
+    instrumentation = Instrumentation(enabled=True)
+    path = str(tmp_path / "operation.prof")
+
+    with instrumentation.profile(path):
+        with instrumentation.profile():
+            sorted(range(1000), key=lambda value: -value)
+
+    assert pstats.Stats(path).total_calls > 0
+
+
+def test_instrumented_profiles_into_shared_profiler(tmp_path, monkeypatch):
+    instrumentation = Instrumentation(
+        enabled=True, profile_path=str(tmp_path / "wallet.prof")
+    )
+    monkeypatch.setattr("src.utils.instrumentation.stats", instrumentation)
+
+    @instrumented("work")
+    def work():
+        return sum(range(100))
+
+    assert work() == 4950
+    assert instrumentation.snapshot()["timers"]["work"]["calls"] == 1
+    assert pstats.Stats(instrumentation._profiler).total_calls > 0
@@ -0,0 +1,122 @@
+import json
+import os
+
+import pytest
+
+from src.transactions.transaction_manager import TransactionManager
+from src.utils.file_manager import FileManager
+from src.utils.journal_manager import JournalFileManager, _identity
+
+
+test_db_path = "data/test_database.json"
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return str(tmp_path / "wallet.journal")
+
+
+def test_replay_restores_state(journal_path):
+    manager = JournalFileManager(journal_path)
+    manager.save_changes([
+        {"op": "add", "record": {"id": 1, "amount": 10}},
+        {"op": "add", "record": {"id": 2, "amount": 20}},
+        {"op": "edit", "record": {"id": 1, "amount": 15}},
+        {"op": "delete", "id": 2},
+    ])
+
+    reopened = JournalFileManager(journal_path)
+    assert reopened.read_from_file() == [{"id": 1, "amount": 15}]
+
+
+def test_incomplete_line_is_ignored(journal_path):
+    manager = JournalFileManager(journal_path)
+    manager.save_changes([{"op": "add", "record": {"id": 1, "amount": 10}}])
+    with open(journal_path, "ab") as file:
+        file.write(b'{"op":"add","record":{"id":2')
+
+    assert JournalFileManager(journal_path).read_from_file() == [
+        {"id": 1, "amount": 10}
+    ]
+
+
+def test_append_after_incomplete_line(journal_path):
+    manager = JournalFileManager(journal_path)
+    manager.save_changes([{"op": "add", "record": {"id": 1, "amount": 10}}])
+    with open(journal_path, "ab") as file:
+        file.write(b'{"op":"add","rec')
+
+    reopened = JournalFileManager(journal_path)
+    reopened.save_changes([{"op": "add", "record": {"id": 2, "amount": 20}}])
+    reopened.save_changes([{"op": "add", "record": {"id": 3, "amount": 30}}])
+
+    assert [record["id"] for record in JournalFileManager(journal_path).read_from_file()] == [
+        1, 2, 3
+    ]
+
+
+def test_compaction_keeps_state(journal_path):
+    manager = JournalFileManager(journal_path, compact_threshold=3)
+    for transaction_id in range(1, 6):
+        manager.save_changes(
+            [{"op": "add", "record": {"id": transaction_id, "amount": 1}}]
+        )
+    manager.wait_for_compaction()
+    manager.compact()
+
+    with open(manager.snapshot_filename) as file:
+        assert len(json.load(file)) == 5
+    with open(journal_path) as file:
+        assert file.read() == ""
+
+    assert len(JournalFileManager(journal_path).read_from_file()) == 5
+
+
+def test_stale_compaction_leaves_other_snapshot(journal_path, tmp_path):
+    first = JournalFileManager(journal_path)
+    second = JournalFileManager(journal_path)
+    first.save_changes([{"op": "add", "record": {"id": 1, "amount": 10}}])
+    identity = _identity(journal_path)
+    # Старый журнал остается открытым, чтобы его inode не достался новому.
+    with open(journal_path, "rb"):
+        second.write_to_file([{"id": 2, "amount": 20}])
+        second.wait_for_compaction()
+
+        first._compact([{"id": 1, "amount": 10}], 0, identity)
+
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+    assert JournalFileManager(journal_path).read_from_file() == [{"id": 2, "amount": 20}]
+
+
+def test_sees_appends_of_other_instance(journal_path):
+    reader = JournalFileManager(journal_path)
+    writer = JournalFileManager(journal_path)
+    writer.save_changes([{"op": "add", "record": {"id": 1, "amount": 10}}])
+
+    assert reader.read_from_file() == [{"id": 1, "amount": 10}]
+
+
+def test_import_export_json(journal_path, tmp_path):
+    manager = JournalFileManager(journal_path)
+    manager.import_json(test_db_path)
+    manager.wait_for_compaction()
+
+    export_path = str(tmp_path / "export.json")
+    manager.export_json(export_path)
+
+    expected = FileManager(test_db_path).read_from_file()
+    assert FileManager(export_path).read_from_file() == expected
+    assert JournalFileManager(journal_path).read_from_file() == expected
+
+
+def test_transaction_manager_on_journal(journal_path):
+    manager = TransactionManager(journal_path)
+    assert isinstance(manager.file_manager, JournalFileManager)
+
+    manager.add_transaction("2024-05-01", "доход", 600.0, "Зарплата")
+    manager.add_transaction("2024-05-02", "расход", 100.0, "Продукты")
+    manager.edit_transaction(2, amount=150.0)
+    manager.delete_transaction(1)
+
+    records = JournalFileManager(journal_path).read_from_file()
+    assert [(record["id"], record["amount"]) for record in records] == [(2, 150.0)]
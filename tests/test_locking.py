@@ -0,0 +1,99 @@
+import contextlib
+import io
+import multiprocessing
+
+import pytest
+
+from src.transactions.transaction import Transaction
+from src.transactions.transaction_manager import TransactionManager
+from src.transactions.transaction_store import TransactionStore
+from src.utils.file_manager import FileManager
+from src.utils.locking import FileLock, VersionConflictError
+
+WORKERS = 4
+WRITES_PER_WORKER = 50
+
+
+def add_worker(path, worker):
+    manager = TransactionManager(path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for index in range(WRITES_PER_WORKER):
+            manager.add_transaction(
+                "2024-01-01", "доход", 1.0, f"процесс {worker}, запись {index}"
+            )
+
+
+def increment_worker(path, worker):
+    store = TransactionStore(FileManager(path, fsync_every=0))
+    for _ in range(WRITES_PER_WORKER):
+        store.transact(lambda s: s.update(1, amount=s.get(1).amount + 1))
+
+
+def run_workers(target, *args):
+    context = multiprocessing.get_context()
+    processes = [
+        context.Process(target=target, args=args + (worker,))
+        for worker in range(WORKERS)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+
+@pytest.mark.parametrize("filename", ["ledger.json", "ledger.journal", "ledger.sqlite"])
+def test_concurrent_adds_are_not_lost(tmp_path, filename):
+    path = str(tmp_path / filename)
+    run_workers(add_worker, path)
+
+    records = TransactionManager(path).store.records()
+    assert len(records) == WORKERS * WRITES_PER_WORKER
+    assert sorted(record.id for record in records) == list(
+        range(1, WORKERS * WRITES_PER_WORKER + 1)
+    )
+
+
+def test_concurrent_read_modify_write(tmp_path):
+    path = str(tmp_path / "ledger.json")
+    FileManager(path).write_to_file([
+        {
+            "id": 1,
+            "date": "2024-01-01",
+            "category": "доход",
+            "amount": 0,
+            "description": "счетчик",
+        }
+    ])
+    run_workers(increment_worker, path)
+
+    assert FileManager(path).read_from_file()[0]["amount"] == WORKERS * WRITES_PER_WORKER
+
+
+def test_stale_store_raises_conflict(tmp_path):
+    path = str(tmp_path / "ledger.json")
+    first = TransactionStore(FileManager(path))
+    second = TransactionStore(FileManager(path))
+    record = Transaction(
+        id=1, date="2024-01-01", category="доход", amount=1.0, description="a"
+    )
+    first.add(record)
+
+    with pytest.raises(VersionConflictError):
+        second.add(record)
+    assert second.records() == [record]
+
+
+def test_file_lock_version(tmp_path):
+    lock = FileLock(str(tmp_path / "ledger.json"))
+    assert lock.version() == 0
+
+    with lock.exclusive():
+        assert lock.bump() == 1
+        with lock.shared():
+            assert lock.bump() == 2
+    assert lock.version() == 2
+
+    with lock.shared(), pytest.raises(RuntimeError):
+        with lock.exclusive():
+            pass
@@ -0,0 +1,147 @@
+import os
+
+import pytest
+
+from src.balance.balance_manager import BalanceManager
+from src.transactions.mmap_store import MmapTransactionStore
+from src.transactions.transaction_manager import TransactionManager
+from src.utils import mmap_manager
+from src.utils.file_manager import FileManager
+from src.utils.mmap_manager import MmapFileManager
+from src.utils.storage import get_file_manager
+
+
+test_db_path = "data/test_database.json"
+
+
+@pytest.fixture(params=["numpy", "python"])
+def wallet_path(request, tmp_path, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(mmap_manager, "np", None)
+    path = str(tmp_path / "wallet.wallet")
+    manager = get_file_manager(path)
+    manager.write_to_file(FileManager(test_db_path).read_from_file())
+    manager.close()
+    return path
+
+
+def test_round_trip(wallet_path):
+    manager = MmapFileManager(wallet_path)
+
+    assert manager.read_from_file() == FileManager(test_db_path).read_from_file()
+    assert manager.get(1)["amount"] == 600
+    assert manager.get(4) is None
+    assert manager.count() == 3
+
+
+def test_search_and_totals_over_buffer(wallet_path):
+    manager = MmapFileManager(wallet_path)
+
+    assert [record["id"] for record in manager.search(category="доход")] == [1, 3]
+    assert [
+        record["id"] for record in manager.search(date_from="2024-01-01", amount=100)
+    ] == [3]
+    assert [
+        record["id"]
+        for record in manager.search(
+            amount_min=100, amount_max=500, description="ШАМПУНЬ"
+        )
+    ] == [2]
+    assert manager.category_totals() == {"доход": 700.0, "расход": 500.0}
+
+
+def test_changes_are_written_in_place(wallet_path):
+    manager = MmapFileManager(wallet_path)
+    size = os.path.getsize(wallet_path)
+    fingerprint = manager.fingerprint()
+
+    manager.save_changes([
+        {"op": "delete", "id": 2},
+        {"op": "edit", "record": {**manager.get(3), "amount": 300.0}},
+    ])
+
+    assert os.path.getsize(wallet_path) == size
+    assert manager.fingerprint() != fingerprint
+    assert manager.contains(2) is False
+    assert manager.count() == 2
+    assert manager.last_id() == 3
+    assert manager.category_totals() == {"доход": 900.0}
+    assert MmapFileManager(wallet_path).get(3)["amount"] == 300.0
+
+
+def test_compact_drops_tombstones(wallet_path):
+    manager = MmapFileManager(wallet_path)
+    manager.save_changes([{"op": "delete", "id": 3}])
+    manager.compact()
+
+    heaps = [
+        name for name in os.listdir(os.path.dirname(wallet_path)) if name.endswith(".heap")
+    ]
+    assert os.path.getsize(wallet_path) == (
+        mmap_manager.HEADER.size + 2 * mmap_manager.RECORD.size
+    )
+    assert [record["id"] for record in manager.read_from_file()] == [1, 2]
+    assert heaps == [os.path.basename(manager.heap_filename(manager.fingerprint()[0]))]
+
+
+def test_unsupported_category_is_rejected(tmp_path):
+    manager = MmapFileManager(str(tmp_path / "wallet.wallet"))
+
+    with pytest.raises(ValueError):
+        manager.write_to_file([
+            {
+                "id": 1,
+                "date": "2024-05-01",
+                "category": "долг",
+                "amount": 1.0,
+                "description": "",
+            }
+        ])
+
+
+def test_batch_overlay_and_rollback(wallet_path):
+    manager = TransactionManager(wallet_path)
+    assert isinstance(manager.store, MmapTransactionStore)
+    fingerprint = manager.file_manager.fingerprint()
+
+    with pytest.raises(RuntimeError):
+        with manager.batch():
+            manager.store.delete(3)
+            assert 3 not in manager.store
+            assert manager.store.next_id() == 3
+            assert len(manager.store) == 2
+            raise RuntimeError
+
+    assert 3 in manager.store
+    assert manager.file_manager.fingerprint() == fingerprint
+
+    with manager.batch():
+        manager.store.delete(1)
+        manager.store.update(3, amount=300.0)
+        assert manager.store.category_totals() == {"доход": 300.0, "расход": 500.0}
+
+    assert manager.store.category_totals() == {"доход": 300.0, "расход": 500.0}
+    assert [record.id for record in manager.store] == [2, 3]
+
+
+def test_managers_on_mmap(wallet_path, capsys):
+    manager = TransactionManager(wallet_path)
+    balance = BalanceManager(wallet_path, store=manager.store)
+
+    manager.add_transaction("2024-05-06", "расход", 50.0, "кофе")
+    manager.delete_transaction(2)
+    capsys.readouterr()
+
+    assert manager.check_transactions(4) is True
+    assert manager.check_transactions(2) is False
+    balance.current_balance()
+    manager.search_transactions(category="расход")
+    output = capsys.readouterr().out
+    assert "Текущий баланс: 650.0" in output
+    assert "Описание: кофе" in output
+    assert balance.verify_totals() is True
+
+    other = TransactionManager(wallet_path)
+    assert [record.id for record in other.store] == [1, 3, 4]
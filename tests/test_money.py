@@ -0,0 +1,110 @@
+from decimal import Decimal
+
+import pytest
+
+from src.balance.balance_manager import BalanceManager
+from src.balance.reports import BalanceReport
+from src.transactions.transaction import Transaction
+from src.transactions.transaction_manager import TransactionManager
+from src.utils.file_manager import FileManager
+from src.utils.money import (
+    from_minor_units,
+    minor_range,
+    minor_units,
+    normalize_amount,
+    parse_amount,
+    to_minor_units,
+)
+from src.utils.money_migration import migrate_amounts
+from src.utils.renderers import Renderer
+
+
+def test_to_minor_units():
+    assert to_minor_units(600) == 60000
+    assert to_minor_units(0.29) == 29
+    assert to_minor_units("10.005") == 1001
+    assert to_minor_units(Decimal("-1.5")) == -150
+
+
+def test_from_minor_units():
+    assert from_minor_units(60000) == 600.0
+    assert from_minor_units(29) == 0.29
+
+
+def test_parse_amount():
+    assert parse_amount("10.005") == Decimal("10.01")
+    assert parse_amount(" 600 ") == Decimal("600.00")
+    for value in ("", "abc", "nan", float("inf"), None, True):
+        with pytest.raises(ValueError):
+            parse_amount(value)
+
+
+def test_normalize_amount():
+    assert normalize_amount(600) == 600 and isinstance(normalize_amount(600), int)
+    assert normalize_amount(0.1 + 0.2) == 0.3
+    assert normalize_amount("10.005") == 10.01
+    assert normalize_amount(Decimal("2.5")) == 2.5
+    with pytest.raises(ValueError):
+        normalize_amount(float("nan"))
+
+
+def test_minor_units():
+    assert minor_units(600) == 60000
+    assert minor_units(0.1 + 0.2) == 30
+    assert minor_units("") is None
+    assert minor_units(False) is None
+    assert minor_units(float("inf")) is None
+    assert minor_range(0.005, 10.005) == (1, 1000)
+    assert minor_range(None, 5) == (None, 500)
+
+
+def test_transaction_keeps_amount_in_kopecks():
+    record = Transaction(1, "2024-05-01", "доход", Decimal("0.105"), "")
+
+    assert record.amount == 0.11 and record.minor == 11
+    assert Transaction(2, "2024-05-01", "доход", "", "").minor is None
+    assert Transaction(3, "2024-05-01", "доход", 0.1 + 0.2, "") == Transaction(
+        3, "2024-05-01", "доход", 0.3, ""
+    )
+
+
+def test_totals_are_exact(tmp_path):
+    path = str(tmp_path / "ledger.json")
+    manager = TransactionManager(path, renderer=Renderer())
+    balance = BalanceManager(path, store=manager.store, renderer=Renderer())
+    for _ in range(10):
+        manager.add_transaction("2024-05-01", "доход", 0.1, "")
+    manager.add_transaction("2024-05-02", "расход", "0.3", "")
+    manager.add_transaction("2024-05-03", "доход", 600, "")
+
+    assert manager.store.get(12).amount == 600
+    assert balance.current_balance().income == 601.0
+    assert balance.current_balance().balance == 600.7
+    assert balance.verify_totals() is True
+    assert BalanceReport(0.3, 0.1).balance == 0.2
+    with pytest.raises(ValueError):
+        manager.add_transaction("2024-05-03", "доход", "abc", "")
+
+
+def test_migrate_amounts(tmp_path):
+    path = str(tmp_path / "ledger.json")
+    records = [
+        {"id": 1, "date": "2024-05-01", "category": "доход", "amount": 600, "description": ""},
+        {"id": 2, "date": "2024-05-01", "category": "доход", "amount": 0.1 + 0.2,
+         "description": ""},
+        {"id": 3, "date": "2024-05-01", "category": "расход", "amount": "", "description": ""},
+        {"id": 4, "date": "2024-05-01", "category": "расход", "amount": 10.005,
+         "description": ""},
+    ]
+    FileManager(path).write_to_file(records)
+
+    report = migrate_amounts(path)
+
+    assert (report.total, report.changed, report.invalid) == (4, 2, [3])
+    assert [record["amount"] for record in FileManager(path).read_from_file()] == [
+        600,
+        0.3,
+        "",
+        10.01,
+    ]
+    assert migrate_amounts(path).changed == 0
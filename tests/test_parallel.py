@@ -0,0 +1,65 @@
+import shutil
+
+import pytest
+
+from src.transactions.transaction import Transaction
+from src.transactions.transaction_store import TransactionStore
+from src.utils import mmap_manager
+from src.utils.file_manager import FileManager
+
+
+@pytest.fixture(params=["numpy", "python"])
+def store(request, tmp_path, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(mmap_manager, "np", None)
+    path = str(tmp_path / "ledger.json")
+    shutil.copy("data/test_database.json", path)
+    store = TransactionStore(FileManager(path))
+    yield store
+    store.disable_parallel()
+
+
+def test_matches_serial_results(store):
+    serial_totals = store.category_totals()
+    serial = {
+        "description": [record.id for record in store.find(description="ШАМП")],
+        "category": [record.id for record in store.find(category="доход")],
+        "range": [record.id for record in store.find(date_from="2024-01-01", amount_max=100)],
+    }
+
+    store.enable_parallel(workers=2, threshold=0)
+
+    assert store.category_totals() == serial_totals == {"доход": 700.0, "расход": 500.0}
+    assert [record.id for record in store.find(description="ШАМП")] == serial["description"]
+    assert [record.id for record in store.find(category="доход")] == serial["category"]
+    assert [
+        record.id for record in store.find(date_from="2024-01-01", amount_max=100)
+    ] == serial["range"]
+    assert list(store.find(category="долг")) == []
+
+
+def test_changes_update_shared_buffer(store):
+    scanner = store.enable_parallel(workers=2, threshold=0)
+    assert scanner.category_totals() == {"доход": 700.0, "расход": 500.0}
+
+    store.add(Transaction(4, "2024-05-06", "расход", 50.0, "кофе"))
+    store.update(1, amount=650)
+    store.delete(2)
+
+    assert scanner.category_totals() == {"доход": 750.0, "расход": 50.0}
+    assert scanner.find_ids(category="расход") == [4]
+    assert scanner.find_ids(amount_min=600) == [1]
+
+
+def test_serial_fallback(store):
+    scanner = store.enable_parallel(workers=2, threshold=10)
+
+    assert scanner.category_totals() is None
+    assert store.category_totals() == {"доход": 700.0, "расход": 500.0}
+
+    scanner.threshold = 0
+    store.add(Transaction(4, "2024-05-06", "долг", 50.0, "займ"))
+    assert scanner.category_totals() is None
+    assert [record.id for record in store.find(description="займ")] == [4]
@@ -0,0 +1,128 @@
+import shutil
+import threading
+
+import pytest
+
+from src.balance.balance_manager import BalanceManager
+from src.balance import period_totals
+from src.balance.period_totals import PeriodTotals, period_key
+from src.transactions.transaction import Transaction
+from src.transactions.transaction_store import TransactionStore
+from src.utils.file_manager import FileManager
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = str(tmp_path / "ledger.json")
+    shutil.copy("data/test_database.json", path)
+    return TransactionStore(FileManager(path))
+
+
+def test_period_key():
+    assert period_key("2024-05-05") == "2024-05"
+    assert period_key("2024-05-05", "week") == "2024-W18"
+    assert period_key("2024-12-30", "week") == "2025-W01"
+    assert period_key("2024-05-05", "year") == "2024"
+    with pytest.raises(ValueError):
+        period_key("2024-05-05", "decade")
+
+
+def test_totals_and_balance_history(store):
+    periods = PeriodTotals(store.file_manager)
+    store.subscribe(periods)
+
+    assert periods.totals("year") == {
+        "2020": {"расход": 500.0},
+        "2021": {},
+        "2022": {},
+        "2023": {},
+        "2024": {"доход": 700.0},
+    }
+    assert periods.balance_history("month", "2024-04-01", "2024-06-30") == [
+        ("2024-04", -500.0),
+        ("2024-05", 200.0),
+        ("2024-06", 200.0),
+    ]
+
+
+def test_rollups_follow_mutations(store):
+    periods = PeriodTotals(store.file_manager)
+    store.subscribe(periods)
+
+    store.add(Transaction(
+        id=store.next_id(),
+        date="2024-06-03",
+        category="расход",
+        amount=50.25,
+        description="кофе",
+    ))
+    store.update(2, date="2024-05-06")
+    store.delete(1)
+
+    assert periods.totals("month") == {
+        "2024-05": {"расход": 500.0, "доход": 100.0},
+        "2024-06": {"расход": 50.25},
+    }
+    assert periods.totals("week", "2024-05-06", "2024-05-12") == {
+        "2024-W19": {"расход": 500.0},
+    }
+    assert periods.balance_history("month") == [
+        ("2024-05", -400.0),
+        ("2024-06", -450.25),
+    ]
+
+    reloaded = PeriodTotals(store.file_manager)
+    reloaded.rebuild(TransactionStore(FileManager(store.file_manager.filename)))
+    assert reloaded.rollups == periods.rollups
+
+
+def test_period_report(store, capsys):
+    BalanceManager(store.file_manager.filename, store=store).period_report(
+        "year", "2023-01-01"
+    )
+    assert capsys.readouterr().out.splitlines() == [
+        "2023: доходы 0.0, расходы 0.0, баланс на конец периода -500.0",
+        "2024: доходы 700.0, расходы 0.0, баланс на конец периода 200.0",
+        "",
+    ]
+
+
+def test_concurrent_saves_do_not_collide(store):
+    periods = [PeriodTotals(store.file_manager) for _ in range(4)]
+    for rollups in periods:
+        rollups.rebuild(store)
+    errors = []
+
+    def save(rollups):
+        try:
+            for _ in range(100):
+                rollups.on_commit(store.fingerprint)
+        except OSError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save, args=(rollups,)) for rollups in periods]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    reloaded = PeriodTotals(store.file_manager)
+    assert reloaded._load(store.fingerprint) is True
+    assert reloaded.rollups == periods[0].rollups
+
+
+def test_columnar_rebuild_matches_records(store, monkeypatch):
+    pytest.importorskip("numpy")
+    for day in range(1, 29):
+        store.add(Transaction(store.next_id(), f"2023-02-{day:02d}", "расход", day / 4, ""))
+    expected = PeriodTotals(store.file_manager)
+    store.subscribe(expected)
+
+    monkeypatch.setattr(period_totals, "COLUMNAR_THRESHOLD", 0)
+    columnar = PeriodTotals(store.file_manager)
+    columnar.filename += ".columnar"
+    columnar.rebuild(store)
+
+    assert columnar.rollups == expected.rollups
+    assert columnar._periods == expected._periods
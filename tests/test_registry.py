@@ -0,0 +1,162 @@
+import threading
+
+import pytest
+
+from src.registry import Wallet, WalletRegistry
+from src.transactions.transaction_manager import TransactionManager
+from src.transactions.transaction_store import RECORD_MEMORY
+from src.utils.file_manager import FileManager
+from src.utils.renderers import Renderer
+from src.utils.sqlite_manager import SQLiteFileManager
+
+
+test_db_path = "data/test_database.json"
+
+
+def saved_ids(path):
+    return [record["id"] for record in FileManager(path).read_from_file()]
+
+
+@pytest.fixture
+def registry(tmp_path):
+    for wallet_id in ("alice", "bob", "carol"):
+        FileManager(str(tmp_path / f"{wallet_id}.json")).write_to_file(
+            FileManager(test_db_path).read_from_file()
+        )
+    registry = WalletRegistry(str(tmp_path), max_wallets=2, flush_interval=None)
+    yield registry
+    registry.close()
+
+
+def test_views_share_one_store(registry):
+    with registry.wallet("alice") as wallet:
+        assert wallet.balance.store is wallet.transactions.store
+        wallet.transactions.add_transaction("2024-05-06", "доход", 50.0, "кешбек")
+        assert wallet.balance.current_balance().income == 750.0
+
+
+def test_changes_are_written_behind(registry):
+    path = registry.path("alice")
+    with registry.wallet("alice") as wallet:
+        wallet.transactions.delete_transaction(2)
+        assert wallet.dirty
+
+    assert saved_ids(path) == [1, 2, 3]
+    assert registry.flush() == ["alice"]
+    assert saved_ids(path) == [1, 3]
+    assert registry.flush() == []
+
+
+def test_rollback_keeps_earlier_unsaved_changes(registry):
+    with registry.wallet("alice") as wallet:
+        wallet.transactions.delete_transaction(2)
+        with pytest.raises(RuntimeError):
+            with wallet.transactions.batch():
+                wallet.transactions.store.delete(3)
+                raise RuntimeError
+        assert [record.id for record in wallet.transactions.store] == [1, 3]
+
+    registry.flush()
+    assert saved_ids(registry.path("alice")) == [1, 3]
+
+
+def test_lru_eviction_flushes(registry):
+    with registry.wallet("alice") as wallet:
+        wallet.transactions.delete_transaction(1)
+    with registry.wallet("bob"):
+        pass
+    with registry.wallet("alice"):
+        pass
+    with registry.wallet("carol"):
+        pass
+
+    assert "bob" not in registry
+    assert "alice" in registry and "carol" in registry
+    assert registry.evict("alice") is True
+    assert saved_ids(registry.path("alice")) == [2, 3]
+
+
+def test_wallet_is_not_reopened_while_closing(registry, monkeypatch):
+    registry.max_wallets = 1
+    flushing = threading.Event()
+    release = threading.Event()
+    original_flush = Wallet.flush
+
+    def slow_flush(self):
+        flushing.set()
+        release.wait(5)
+        return original_flush(self)
+
+    monkeypatch.setattr(Wallet, "flush", slow_flush)
+    with registry.wallet("alice") as wallet:
+        wallet.transactions.delete_transaction(1)
+
+    def open_bob():
+        with registry.wallet("bob"):
+            pass
+
+    seen = []
+
+    def open_alice():
+        with registry.wallet("alice") as wallet:
+            seen.append(wallet.transactions.check_transactions(1))
+
+    evicting = threading.Thread(target=open_bob)
+    evicting.start()
+    assert flushing.wait(5)
+    reopening = threading.Thread(target=open_alice)
+    reopening.start()
+    release.set()
+    evicting.join()
+    reopening.join()
+
+    assert seen == [False]
+
+
+def test_memory_limit(registry):
+    registry.max_memory = 3 * RECORD_MEMORY
+    with registry.wallet("alice"):
+        with registry.wallet("bob"):
+            assert len(registry) == 2
+        assert "bob" not in registry
+    assert len(registry) == 1
+
+
+def test_conflicting_flush_replays_changes(registry):
+    with registry.wallet("alice") as wallet:
+        wallet.transactions.delete_transaction(2)
+
+    other = TransactionManager(registry.path("alice"), renderer=Renderer())
+    other.edit_transaction(3, amount=300.0)
+
+    registry.flush()
+    records = FileManager(registry.path("alice")).read_from_file()
+    assert [(record["id"], record["amount"]) for record in records] == [(1, 600), (3, 300.0)]
+
+
+def test_background_flush(tmp_path):
+    with WalletRegistry(str(tmp_path), flush_interval=0.01) as registry:
+        with registry.wallet("dave") as wallet:
+            wallet.transactions.add_transaction("2024-05-06", "доход", 5.0, "")
+        flushed = threading.Event()
+        for _ in range(500):
+            if not wallet.dirty:
+                flushed.set()
+                break
+            flushed.wait(0.01)
+        assert flushed.is_set()
+    assert saved_ids(registry.path("dave")) == [1]
+
+
+def test_invalid_wallet_id(registry):
+    with pytest.raises(ValueError):
+        registry.path("../etc")
+
+
+def test_sqlite_wallets_write_through(tmp_path):
+    with WalletRegistry(str(tmp_path), extension=".sqlite", flush_interval=None) as registry:
+        with registry.wallet("dave") as wallet:
+            wallet.transactions.add_transaction("2024-05-06", "доход", 5.0, "")
+        assert not wallet.transactions.store.write_behind
+        assert [record["id"] for record in SQLiteFileManager(registry.path("dave"))
+                .read_from_file()] == [1]
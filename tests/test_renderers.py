@@ -0,0 +1,79 @@
+import io
+import json
+import shutil
+
+import pytest
+
+from src.balance.balance_manager import BalanceManager
+from src.transactions.transaction_manager import TransactionManager
+from src.utils.renderers import (
+    BulkWriter,
+    JsonLinesRenderer,
+    Renderer,
+    TableRenderer,
+)
+
+
+@pytest.fixture
+def ledger_path(tmp_path):
+    path = str(tmp_path / "ledger.json")
+    shutil.copy("data/test_database.json", path)
+    return path
+
+
+def test_managers_return_results_without_output(ledger_path, capsys):
+    manager = TransactionManager(ledger_path, renderer=Renderer())
+    balance = BalanceManager(ledger_path, store=manager.store, renderer=Renderer())
+
+    added = manager.add_transaction("2024-06-01", "расход", 50.0, "кофе")
+    assert added.id == 4
+    assert manager.edit_transaction(4, amount=60.0).amount == 60.0
+    assert manager.delete_transaction(999) is None
+    assert [record.id for record in manager.search_transactions("расход")] == [2, 4]
+    assert manager.search_transactions() == []
+    assert manager.show_all() == 4
+
+    report = balance.current_balance()
+    assert (report.income, report.expense, report.balance) == (700.0, 560.0, 140.0)
+    assert [period.period for period in balance.period_report("year", "2024-01-01")] == [
+        "2024"
+    ]
+    assert capsys.readouterr().out == ""
+
+
+def test_json_lines_renderer(ledger_path):
+    stream = io.StringIO()
+    manager = TransactionManager(
+        ledger_path, renderer=JsonLinesRenderer(BulkWriter(stream))
+    )
+    manager.search_transactions("доход")
+    manager.delete_transaction(999)
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line.get("id") for line in lines] == [1, 3, 999]
+    assert lines[-1] == {"event": "not_found", "id": 999}
+
+
+def test_table_renderer(ledger_path):
+    stream = io.StringIO()
+    manager = TransactionManager(ledger_path, renderer=TableRenderer(BulkWriter(stream)))
+    manager.show_all()
+
+    lines = stream.getvalue().splitlines()
+    assert lines[0].split() == ["ID", "Дата", "Категория", "Сумма", "Описание"]
+    assert lines[2].split() == ["2", "2020-05-05", "расход", "500.0", "сухой", "шампунь"]
+    assert len(lines) == 4
+
+
+def test_bulk_writer_batches_writes():
+    writes = []
+
+    class Stream:
+        def write(self, text):
+            writes.append(text)
+
+    writer = BulkWriter(Stream(), buffer_lines=3)
+    writer.lines(str(index) for index in range(7))
+    writer.flush()
+
+    assert writes == ["0\n1\n2\n", "3\n4\n5\n", "6\n"]
@@ -0,0 +1,147 @@
+import os
+
+import pytest
+
+from src.balance.balance_manager import BalanceManager
+from src.transactions.sharded_store import ShardedTransactionStore
+from src.transactions.transaction import Transaction
+from src.transactions.transaction_manager import TransactionManager
+from src.utils.file_manager import FileManager
+from src.utils.instrumentation import stats
+from src.utils.sharded_manager import ShardedFileManager
+from src.utils.storage import get_file_manager
+
+
+test_db_path = "data/test_database.json"
+
+
+@pytest.fixture
+def shards_path(tmp_path):
+    path = str(tmp_path / "ledger.shards")
+    get_file_manager(path).write_to_file(FileManager(test_db_path).read_from_file())
+    return path
+
+
+def test_round_trip(shards_path):
+    manager = ShardedFileManager(shards_path)
+
+    assert manager.read_from_file() == FileManager(test_db_path).read_from_file()
+    assert manager.segments() == ["2020-05", "2024-05"]
+    assert manager.get(2)["description"] == "сухой шампунь"
+    assert manager.get(4) is None
+    assert manager.count() == 3
+    assert manager.last_id() == 3
+
+
+def test_cold_segments_are_compressed(shards_path):
+    names = sorted(os.listdir(shards_path))
+
+    assert names == ["2020-05.json.gz", "2024-05.json", "ids.bin", "manifest.json"]
+
+
+def test_change_rewrites_only_its_segment(shards_path):
+    manager = ShardedFileManager(shards_path)
+    cold = os.stat(manager.segment_filename("2020-05", True)).st_mtime_ns
+
+    manager.save_changes([
+        {"op": "edit", "record": {**manager.get(3), "amount": 300.0}},
+        {
+            "op": "add",
+            "record": {
+                "id": 4,
+                "date": "2024-06-01",
+                "category": "расход",
+                "amount": 50.0,
+                "description": "кофе",
+            },
+        },
+    ])
+
+    assert os.stat(manager.segment_filename("2020-05", True)).st_mtime_ns == cold
+    assert manager.segments() == ["2020-05", "2024-05", "2024-06"]
+    assert ShardedFileManager(shards_path).get(3)["amount"] == 300.0
+    assert manager.category_totals() == {"доход": 900.0, "расход": 550.0}
+
+
+def test_missing_id_index_is_rebuilt(shards_path):
+    os.remove(os.path.join(shards_path, "ids.bin"))
+    manager = ShardedFileManager(shards_path)
+
+    assert manager.get(2)["date"] == "2020-05-05"
+    manager.save_changes([{"op": "delete", "id": 3}])
+
+    assert ShardedFileManager(shards_path).get(1)["id"] == 1
+    assert ShardedFileManager(shards_path).get(3) is None
+
+
+def test_record_moves_between_segments(shards_path):
+    manager = ShardedFileManager(shards_path)
+
+    manager.save_changes([
+        {"op": "edit", "record": {**manager.get(2), "date": "2024-05-10"}},
+        {"op": "delete", "id": 1},
+    ])
+
+    assert manager.segments() == ["2024-05"]
+    assert not os.path.exists(manager.segment_filename("2020-05", True))
+    assert [record["id"] for record in ShardedFileManager(shards_path).read_from_file()] == [
+        2,
+        3,
+    ]
+
+
+def test_date_search_reads_only_its_segments(shards_path):
+    manager = ShardedFileManager(shards_path)
+    stats.reset()
+    stats.enable()
+    try:
+        records = manager.search(date_from="2024-01-01", amount_min=100)
+        counters = stats.snapshot()["counters"]
+    finally:
+        stats.disable()
+        stats.reset()
+
+    assert [record["id"] for record in records] == [1, 3]
+    assert counters["shards.segments_read"] == 1
+    assert [record["id"] for record in manager.search(description="ШАМПУНЬ")] == [2]
+
+
+def test_managers_on_shards(shards_path, capsys):
+    manager = TransactionManager(shards_path)
+    assert isinstance(manager.store, ShardedTransactionStore)
+    balance = BalanceManager(shards_path, store=manager.store)
+
+    manager.add_transaction("2024-06-06", "расход", 50.0, "кофе")
+    manager.delete_transaction(2)
+    capsys.readouterr()
+
+    assert manager.check_transactions(4) is True
+    assert manager.check_transactions(2) is False
+    balance.current_balance()
+    manager.search_transactions(category="расход")
+    output = capsys.readouterr().out
+    assert "Текущий баланс: 650.0" in output
+    assert "Описание: кофе" in output
+    assert balance.verify_totals() is True
+    assert [period.period for period in balance.period_report()] == ["2024-05", "2024-06"]
+
+    with pytest.raises(RuntimeError):
+        with manager.batch():
+            manager.store.delete(4)
+            assert manager.store.next_id() == 4
+            raise RuntimeError
+
+    other = TransactionManager(shards_path)
+    assert [record.id for record in other.store] == [1, 3, 4]
+
+
+def test_iteration_is_in_id_order(tmp_path):
+    store = ShardedTransactionStore(ShardedFileManager(str(tmp_path / "ledger.shards")))
+    for day in ("2024-02-10", "2024-01-15", "2024-02-20", "2024-04-01"):
+        store.transact(lambda store: store.add(
+            Transaction(store.next_id(), day, "расход", 1, "")
+        ))
+
+    assert [record.id for record in store] == [1, 2, 3, 4]
+    assert [record.id for record in store.find()] == [1, 2, 3, 4]
+    assert [record["id"] for record in store.file_manager.iter_records()] == [1, 2, 3, 4]
@@ -0,0 +1,71 @@
+import os
+
+import pytest
+
+from src.transactions import snapshot_cache
+from src.transactions.transaction import Transaction
+from src.transactions.transaction_store import TransactionStore
+from src.utils.file_manager import FileManager
+from src.utils.journal_manager import JournalFileManager
+
+
+class NoReadFileManager(FileManager):
+    def read_from_file(self):
+        raise AssertionError("файл транзакций не должен читаться")
+
+
+@pytest.fixture(autouse=True)
+def small_cache(monkeypatch):
+    monkeypatch.setattr(snapshot_cache, "MIN_CACHE_RECORDS", 1)
+
+
+@pytest.fixture
+def ledger_path(tmp_path):
+    path = str(tmp_path / "ledger.json")
+    FileManager(path).write_to_file(FileManager("data/test_database.json").read_from_file())
+    return path
+
+
+def test_cache_replaces_parsing(ledger_path):
+    store = TransactionStore(FileManager(ledger_path))
+    assert os.path.exists(f"{ledger_path}.cache")
+
+    cached = TransactionStore(NoReadFileManager(ledger_path))
+    assert list(cached) == list(store)
+    assert cached._by_date == store._by_date
+    assert cached._by_amount == store._by_amount
+    assert [record.id for record in cached.by_category("доход")] == [1, 3]
+    assert cached.next_id() == 4
+
+
+def test_cache_is_rebuilt_after_change(ledger_path):
+    TransactionStore(FileManager(ledger_path))
+    writer = TransactionStore(FileManager(ledger_path))
+    writer.add(Transaction(4, "2024-06-01", "расход", 1.0, "кофе"))
+
+    store = TransactionStore(FileManager(ledger_path))
+    assert store.get(4).description == "кофе"
+    assert list(TransactionStore(NoReadFileManager(ledger_path))) == list(store)
+
+
+def test_corrupt_cache_is_ignored(ledger_path):
+    with open(f"{ledger_path}.cache", "wb") as file:
+        file.write(b"\x00garbage")
+
+    assert len(TransactionStore(FileManager(ledger_path))) == 3
+
+
+def test_small_ledger_is_not_cached(ledger_path, monkeypatch):
+    monkeypatch.setattr(snapshot_cache, "MIN_CACHE_RECORDS", 10)
+    TransactionStore(FileManager(ledger_path))
+
+    assert not os.path.exists(f"{ledger_path}.cache")
+
+
+def test_journal_cache(tmp_path):
+    path = str(tmp_path / "ledger.journal")
+    store = TransactionStore(JournalFileManager(path))
+    store.add(Transaction(1, "2024-06-01", "доход", 10.0, "зарплата"))
+
+    assert list(TransactionStore(JournalFileManager(path))) == list(store)
+    assert os.path.exists(f"{path}.cache")
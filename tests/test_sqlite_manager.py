@@ -0,0 +1,129 @@
+import pytest
+
+from src.balance.balance_manager import BalanceManager
+from src.transactions.sqlite_store import SQLiteTransactionStore
+from src.transactions.transaction_manager import TransactionManager
+from src.utils.file_manager import FileManager
+from src.utils.renderers import Renderer
+from src.utils.sqlite_manager import SQLiteFileManager, migrate_json_to_sqlite
+
+
+test_db_path = "data/test_database.json"
+
+
+@pytest.fixture
+def sqlite_path(tmp_path):
+    path = str(tmp_path / "wallet.sqlite")
+    migrate_json_to_sqlite(test_db_path, path)
+    return path
+
+
+def test_migration(sqlite_path):
+    manager = SQLiteFileManager(sqlite_path)
+    expected = FileManager(test_db_path).read_from_file()
+
+    assert manager.read_from_file() == expected
+    assert manager.connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+
+def test_search_and_totals_in_sql(sqlite_path):
+    manager = SQLiteFileManager(sqlite_path)
+
+    assert [record["id"] for record in manager.search(category="доход")] == [1, 3]
+    assert [
+        record["id"] for record in manager.search(date_from="2024-01-01", amount=100)
+    ] == [3]
+    assert manager.category_totals() == {"доход": 700.0, "расход": 500.0}
+    assert [
+        record["id"]
+        for record in manager.search(
+            amount_min=100, amount_max=500, description="ШАМПУНЬ"
+        )
+    ] == [2]
+
+
+def test_amount_filters_compare_kopecks(sqlite_path):
+    manager = SQLiteFileManager(sqlite_path)
+    manager.save_changes([
+        {"op": "add", "record": {"id": 4, "date": "2024-05-06", "category": "расход",
+                                 "amount": 0.1 + 0.2, "description": "сдача"}},
+        {"op": "add", "record": {"id": 5, "date": "2024-05-06", "category": "расход",
+                                 "amount": "", "description": "без суммы"}},
+    ])
+
+    assert [record["id"] for record in manager.search(amount=0.3)] == [4]
+    assert [record["id"] for record in manager.search(amount_max=0.3)] == [4]
+    assert manager.search(amount=0) == []
+    assert manager.search(amount=100.004) == []
+    plan = manager.connection.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM transactions"
+        " WHERE CAST(ROUND(amount * 100) AS INTEGER) >= 1"
+    ).fetchall()
+    assert "transactions_amount_minor" in str(plan)
+
+
+def test_save_changes_bumps_version(sqlite_path):
+    manager = SQLiteFileManager(sqlite_path)
+    version = manager.fingerprint()
+    manager.save_changes([
+        {"op": "delete", "id": 2},
+        {"op": "edit", "record": {**manager.get(3), "amount": 300.0}},
+    ])
+
+    assert manager.fingerprint() != version
+    assert manager.category_totals() == {"доход": 900.0}
+
+
+def test_batch_is_one_sql_transaction(sqlite_path):
+    manager = TransactionManager(sqlite_path)
+    version = manager.file_manager.fingerprint()
+
+    with pytest.raises(RuntimeError):
+        with manager.batch():
+            manager.store.delete(1)
+            assert 1 not in manager.store
+            raise RuntimeError
+
+    assert 1 in manager.store
+    assert manager.file_manager.fingerprint() == version
+
+    with manager.batch():
+        manager.store.delete(1)
+        manager.store.update(3, amount=300.0)
+
+    assert manager.file_manager.fingerprint() == [version[0] + 1]
+    assert manager.store.category_totals() == {"доход": 300.0, "расход": 500.0}
+
+
+def test_write_behind_is_rejected(sqlite_path):
+    with pytest.raises(ValueError):
+        SQLiteTransactionStore(SQLiteFileManager(sqlite_path), write_behind=True)
+
+
+def test_balance_sees_other_manager(sqlite_path):
+    balance = BalanceManager(sqlite_path, renderer=Renderer())
+    assert balance.current_balance().income == 700.0
+    TransactionManager(sqlite_path, renderer=Renderer()).add_transaction(
+        "2024-06-01", "доход", 100.0, "премия"
+    )
+
+    assert balance.current_balance().income == 800.0
+    assert balance.period_report()[-1].period == "2024-06"
+    assert balance.verify_totals() is True
+
+
+def test_managers_on_sqlite(sqlite_path, capsys):
+    manager = TransactionManager(sqlite_path)
+    balance = BalanceManager(sqlite_path, store=manager.store)
+    assert isinstance(manager.store, SQLiteTransactionStore)
+
+    manager.add_transaction("2024-05-06", "расход", 50.0, "кофе")
+    manager.delete_transaction(2)
+    capsys.readouterr()
+
+    balance.current_balance()
+    manager.search_transactions(category="расход")
+    output = capsys.readouterr().out
+    assert "Текущий баланс: 650.0" in output
+    assert "Описание: кофе" in output
+    assert balance.verify_totals() is True
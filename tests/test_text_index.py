@@ -0,0 +1,54 @@
+import pytest
+
+from src.transactions.text_index import DescriptionIndex, tokenize
+from src.transactions.transaction import Transaction
+from src.transactions.transaction_manager import TransactionManager
+from src.utils.file_manager import FileManager
+from src.utils.renderers import Renderer
+from src.utils.storage import get_file_manager, open_store
+
+
+test_db_path = "data/test_database.json"
+
+
+@pytest.fixture(params=["json", "sqlite", "wallet"])
+def store(request, tmp_path):
+    file_manager = get_file_manager(str(tmp_path / f"store.{request.param}"))
+    file_manager.write_to_file(FileManager(test_db_path).read_from_file())
+    return open_store(file_manager)
+
+
+def test_tokenize_folds_case_and_yo():
+    assert tokenize("Ёлка, ЕЛКА и ёжик!") == ("елка", "и", "ежик")
+
+
+def test_prefix_and_all_words():
+    index = DescriptionIndex()
+    index.on_add(Transaction(1, "2024-05-01", "расход", 1.0, "Кешбек за такси"))
+    index.on_add(Transaction(2, "2024-05-02", "расход", 1.0, "такси в аэропорт"))
+
+    assert index.search("такс") == {1, 2}
+    assert index.search("КЕШ такси") == {1}
+    assert index.search("кеш аэро") == set()
+    assert index.search("  ") == set()
+
+
+def test_index_follows_changes(store):
+    assert [record.id for record in store.find(text="шамп")] == [2]
+
+    store.update(2, description="кешбек за шампунь")
+    store.add(Transaction(store.next_id(), "2024-05-06", "доход", 5.0, "Кешбек"))
+    store.delete(3)
+
+    assert [record.id for record in store.find(text="кешбек")] == [2, 4]
+    assert [record.id for record in store.find(text="кешбек", category="доход")] == [4]
+    assert list(store.find(text="кешбек", date_to="2020-12-31")) == [store.get(2)]
+    assert store.text_index().search("шампунь") == {2}
+
+
+def test_search_transactions_by_text(tmp_path):
+    path = str(tmp_path / "wallet.json")
+    FileManager(path).write_to_file(FileManager(test_db_path).read_from_file())
+    manager = TransactionManager(path, renderer=Renderer())
+
+    assert [record.id for record in manager.search_transactions(text="ЗАРП")] == [1]
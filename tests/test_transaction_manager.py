@@ -16,8 +16,10 @@ def setup_test_database():
     # делаем копию базы
     shutil.copy(test_db_path, copy_test_db_path)
     yield # тесты
-    # удаляем временную копию
-    os.remove(copy_test_db_path) 
+    # удаляем временную копию и ее файл блокировки
+    os.remove(copy_test_db_path)
+    if os.path.exists(f"{copy_test_db_path}.lock"):
+        os.remove(f"{copy_test_db_path}.lock")
 
 
 @pytest.fixture
@@ -0,0 +1,160 @@
+import pytest
+
+from src.transactions.transaction import Transaction
+from src.transactions.transaction_store import TransactionStore
+from src.utils.file_manager import FileManager
+
+
+test_db_path = "data/test_database.json"
+
+
+@pytest.fixture
+def store(tmp_path):
+    file_manager = FileManager(str(tmp_path / "store.json"))
+    file_manager.write_to_file(FileManager(test_db_path).read_from_file())
+    return TransactionStore(file_manager)
+
+
+def test_get_by_id(store):
+    assert store.get(2).description == "сухой шампунь"
+    assert store.get(10) is None
+    assert 3 in store
+    assert len(store) == 3
+
+
+def test_date_range(store):
+    ids = [record.id for record in store.date_range("2024-01-01", "2024-12-31")]
+    assert ids == [1, 3]
+
+    ids = [record.id for record in store.date_range(end="2024-05-01")]
+    assert ids == [2, 1]
+
+
+def test_by_category(store):
+    assert [record.id for record in store.by_category("доход")] == [1, 3]
+    assert list(store.by_category("перевод")) == []
+
+
+def test_mutations_update_indexes_and_file(store):
+    store.add(Transaction(
+        id=store.next_id(),
+        date="2024-06-01",
+        category="расход",
+        amount=50.0,
+        description="кофе",
+    ))
+    store.update(3, category="расход", date="2019-01-01")
+    store.delete(2)
+
+    assert [record.id for record in store.by_category("расход")] == [4, 3]
+    assert [record.id for record in store.date_range()] == [3, 1, 4]
+    assert [record.id for record in store.find(category="расход")] == [3, 4]
+
+    reloaded = TransactionStore(FileManager(store.file_manager.filename))
+    assert reloaded.records() == store.records()
+
+
+def test_find_combines_criteria(store):
+    assert [record.id for record in store.find("доход", amount=100.0)] == [3]
+    assert [record.id for record in store.find(date="2020-05-05")] == [2]
+    assert list(store.find("доход", date="2020-05-05")) == []
+
+
+def test_amount_range(store):
+    assert [record.id for record in store.amount_range(100, 500)] == [3, 2]
+    assert [record.id for record in store.amount_range(minimum=550)] == [1]
+
+
+def test_find_by_ranges_and_description(store):
+    assert [
+        record.id for record in store.find(date_from="2020-01-01", amount_max=500)
+    ] == [2, 3]
+    assert [
+        record.id for record in store.find(amount_min=100, description="ШАМПУНЬ")
+    ] == [2]
+    assert [record.id for record in store.find(description="шампунь")] == [2]
+
+    store.delete(2)
+    assert [record.id for record in store.amount_range(400, 600)] == [1]
+
+
+class CountingFileManager(FileManager):
+    saves = 0
+
+    def save_changes(self, events, snapshot):
+        self.saves += 1
+        super().save_changes(events, snapshot)
+
+
+def test_batch_saves_once(tmp_path):
+    file_manager = CountingFileManager(str(tmp_path / "store.json"))
+    store = TransactionStore(file_manager)
+
+    with store.batch():
+        for _ in range(100):
+            store.add(Transaction(
+                id=store.next_id(),
+                date="2024-06-01",
+                category="расход",
+                amount=1.0,
+                description="кофе",
+            ))
+        store.update(1, amount=2.0)
+        assert len(store) == 100
+        assert file_manager.saves == 0
+
+    assert file_manager.saves == 1
+    assert len(TransactionStore(FileManager(file_manager.filename))) == 100
+
+
+def test_batch_rolls_back_on_error(store):
+    with pytest.raises(RuntimeError):
+        with store.batch():
+            store.delete(1)
+            store.update(2, amount=1.0)
+            raise RuntimeError
+
+    assert store.get(1) is not None
+    assert store.get(2).amount == 500.0
+    assert [record.id for record in store.amount_range(maximum=1.0)] == []
+
+
+def test_update_keeps_record_order(store):
+    store.update(1, category="расход", amount=50.0)
+
+    assert [record.id for record in store] == [1, 2, 3]
+    assert store.next_id() == 4
+    assert [record.id for record in store.by_category("расход")] == [2, 1]
+
+
+class RecordingListener:
+    def __init__(self):
+        self.added = []
+        self.commits = 0
+        self.fingerprints = []
+
+    def rebuild(self, store):
+        self.added = []
+
+    def on_add(self, record):
+        self.added.append(record.id)
+
+    def on_delete(self, record):
+        pass
+
+    def on_commit(self, fingerprint):
+        self.commits += 1
+        self.fingerprints.append(fingerprint)
+
+
+def test_batch_notifies_changes_before_commit(store):
+    listener = RecordingListener()
+    store.subscribe(listener)
+
+    with store.batch():
+        store.add(Transaction(4, "2024-06-01", "расход", 1.0, "кофе"))
+        assert listener.added == [4]
+        assert listener.commits == 0
+
+    assert listener.commits == 1
+    assert listener.fingerprints == [store.file_manager.fingerprint()] == [store.fingerprint]